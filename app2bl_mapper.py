@@ -1,7 +1,5 @@
-import pandas as pd
-import numpy as np
 import pickle
-import matplotlib.pyplot as plt
+from map_storage import MapStorage
 
 class App2BaselineMapper():
     """
@@ -9,10 +7,16 @@ class App2BaselineMapper():
     their corresponding UFS Application-to-Physics Suite combination. 
     
     """
-    def __init__(self, appsphys2test_dir, baseline_df_dir, input_df_dir):
+    def __init__(self, appsphys2test_dir, baseline_df_dir, input_df_dir, profiler=None):
         self.appsphys2test_dir = appsphys2test_dir
         self.baseline_df_dir = baseline_df_dir
         self.input_df_dir = input_df_dir
+        
+        # Optional StageProfiler recording each public method's wall & CPU time, Bytes read & 
+        # peak RSS. Methods are left uninstrumented if None.
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self)
 
     
     def save2pickle(self, data2save, fn):
@@ -46,6 +50,38 @@ class App2BaselineMapper():
             
         return data
     
+    def save2columnar(self, data2save, fn, fmt='parquet'):
+        """
+        Save table to a columnar (Parquet/Feather) file. Falls back to a pickle 
+        file if pyarrow is not installed.
+        
+        Args:
+            data2save (pd.DataFrame): Table to save.
+            fn (str): Filename excluding the file's extension.
+            fmt (str): Storage format. Options: 'parquet', 'feather', 'pickle'.
+        
+        Return (str): Path of the saved file.
+        
+        """
+        return MapStorage(fmt).save(data2save, fn)
+    
+    def read_columnar(self, fn, columns=None, filters=None, fmt='parquet'):
+        """
+        Read requested columns & rows of a table saved via 'save2columnar()' or 'save2pickle()'.
+        
+        Args:
+            fn (str): Filename excluding the file's extension.
+            columns (list): Columns to read (e.g. ['Filename', 'Size (GB)']). Default reads
+                            all columns.
+            filters (list): Row filters as (column, operator, value) tuples 
+                            (e.g. [('Date', '==', '20220329')]).
+            fmt (str): Preferred storage format if saved in several formats.
+        
+        Return (pd.DataFrame): Table w/ the requested columns & rows.
+        
+        """
+        return MapStorage(fmt).read(fn, columns=columns, filters=filters)
+    
     def write_pickle(self, fn):
         """
         Write data to pickle file.
@@ -61,19 +97,105 @@ class App2BaselineMapper():
             
         return data
     
-    def get_bl_storage_size(self, merged_bl2test):
+    def get_query(self, merged_bl2test):
         """
-        Get storage size by UFS application.
+        Build indexed lookups over the merged UFS application-to-baseline data map.
         
         Args:
             merged_bl2test (pd.DataFrame): Merged dataframes of the UFS application information derived from rt.conf to 
             the latest baseline data files found w/in RDHPC Orion on-prem disk.
         
-        Return: None
+        Return (App2BaselineQuery): Query object w/ precomputed inverted indexes by UFS_App, Physics_Suite,
+        Test Name, CNTL Folder & Filename.
+        
         """
+        from app2bl_query import App2BaselineQuery
+
+        return App2BaselineQuery(merged_bl2test)
+    
+    def get_size_cube(self, merged_bl2test):
+        """
+        Precompute the deduplicated storage sizes of the data files by UFS application, physics suite,
+        test type, test, CNTL folder, date & file format.
+        
+        Args:
+            merged_bl2test (pd.DataFrame): Merged dataframes of the UFS application information derived from rt.conf to 
+            the latest baseline data files found w/in RDHPC Orion on-prem disk.
+        
+        Return (StorageSizeCube): Size cube, which rolls up to any grouping of its dimensions.
+        
+        """
+        from size_cube import StorageSizeCube
+
+        return StorageSizeCube.from_map(merged_bl2test)
+    
+    def get_compact_map(self, merged_bl2test):
+        """
+        Intern the merged UFS application-to-baseline data map into tables of unique tests & files
+        w/ a CSR adjacency of each test to its file IDs.
+        
+        Args:
+            merged_bl2test (pd.DataFrame): Merged dataframes of the UFS application information derived from rt.conf to 
+            the latest baseline data files found w/in RDHPC Orion on-prem disk.
         
+        Return (CompactMap): Compact map, which restores the dataframe via 'to_dataframe()'.
+        
+        """
+        from compact_map import CompactMap
+
+        return CompactMap.from_dataframe(merged_bl2test)
+    
+    def get_overlap(self, merged_bl2test):
+        """
+        Build the sparse consumer-to-file incidence matrices for shared-data analysis (e.g. pairwise
+        intersections, Jaccard matrices & unique files between UFS applications, physics suites or tests).
+        
+        Args:
+            merged_bl2test (pd.DataFrame): Merged dataframes of the UFS application information derived from rt.conf to 
+            the latest baseline data files found w/in RDHPC Orion on-prem disk.
+        
+        Return (DataOverlap): Overlap object over the compact map.
+        
+        """
+        from data_overlap import DataOverlap
+
+        return DataOverlap(self.get_compact_map(merged_bl2test))
+    
+    def get_bl_storage_size(self, merged_bl2test, plot=False):
+        """
+        Get storage size by UFS application.
+        
+        Args:
+            merged_bl2test (pd.DataFrame, StorageSizeCube): Merged dataframes of the UFS application information derived 
+            from rt.conf to the latest baseline data files found w/in RDHPC Orion on-prem disk, or its size cube.
+            plot (bool): If True, also plot the storage size by UFS application.
+        
+        Return (pd.DataFrame): Storage size (GB) by UFS application. Each baseline data file is counted 
+        once per UFS application, regardless of the number of tests referencing it.
+        
+        """
+        
+        from size_cube import StorageSizeCube
+
         # Extract data storage size reserved by each UFS component.
-        baseline_sz_perapp2phys = pd.DataFrame(merged_bl2test.groupby(['UFS_App'])['Size (GB)'].sum())
+        size_cube = merged_bl2test if isinstance(merged_bl2test, StorageSizeCube) else self.get_size_cube(merged_bl2test)
+        baseline_sz_perapp2phys = size_cube.rollup('UFS_App')[['Size (GB)']]
+        if plot:
+            self.plot_bl_storage_size(baseline_sz_perapp2phys)
+        
+        return baseline_sz_perapp2phys
+
+    def plot_bl_storage_size(self, baseline_sz_perapp2phys):
+        """
+        Plot storage size by UFS application.
+        
+        Args:
+            baseline_sz_perapp2phys (pd.DataFrame): Storage size (GB) by UFS application 
+                                                    (i.e. 'get_bl_storage_size()' output).
+        
+        Return: None
+        """
+        import matplotlib.pyplot as plt
 
         # Variation in storage size per input dataset per component.
         fig, ax = plt.subplots(figsize=(15,15))
@@ -86,6 +208,5 @@ class App2BaselineMapper():
         ax.set_ylabel(f'UFS Application\n', fontsize=16, fontweight='black', color='#333F4B')
         plt.tight_layout()
         
-        return baseline_sz_perapp2phys
+        return
 
-    
\ No newline at end of file
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# Columns of the app-to-test-to-data map w/ precomputed inverted indexes.
+INDEXED_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Name', 'CNTL Folder', 'Filename']
+
+
+class App2BaselineQuery():
+    """
+    Indexed lookups over the merged UFS application-to-regression test-to-baseline data map
+    (e.g. ufs_app2test2data_df), w/o scanning the whole map per lookup.
+
+    """
+    def __init__(self, app2baseline_df, indexed_columns=INDEXED_COLUMNS):
+
+        # Merged dataframes of the UFS application information derived from rt.conf & the
+        # baseline data files.
+        self.app2baseline_df = app2baseline_df.reset_index(drop=True)
+
+        # Inverted indexes of each column's values to their row positions.
+        self.indexes = {col: self.app2baseline_df.groupby(col, sort=False, observed=True).indices
+                        for col in indexed_columns if col in self.app2baseline_df.columns}
+
+        # Per-row values referenced by the lookups. Files are identified by their relative
+        # directory & filename, so a file referenced by several tests is counted once.
+        self.filenames = self.app2baseline_df['Filename'].to_numpy(dtype=object)
+        self.rel_paths = (self.app2baseline_df['Relative Directory'].astype(str) + '/'
+                          + self.app2baseline_df['Filename'].astype(str)).to_numpy(dtype=object)
+        self.file_ids, self.unique_rel_paths = pd.factorize(self.rel_paths)
+        self.test_names = self.app2baseline_df['Test Name'].to_numpy(dtype=object)
+        self.apps = self.app2baseline_df['UFS_App'].to_numpy(dtype=object)
+        self.cntl_folders = self.app2baseline_df['CNTL Folder'].to_numpy(dtype=object)
+        self.sizes = self.app2baseline_df['Size (Bytes)'].to_numpy(dtype=np.int64)
+        self.file_sizes = np.zeros(len(self.unique_rel_paths), dtype=np.int64)
+        self.file_sizes[self.file_ids] = self.sizes
+
+    def get_rows(self, **criteria):
+        """
+        Locate the rows matching all criteria.
+
+        Args:
+            criteria (dict): Indexed column (w/ spaces replaced by underscores, e.g. Test_Name,
+                             CNTL_Folder) to the value to match or a list of values to match.
+
+        Return (np.ndarray): Sorted row positions.
+
+        """
+        rows = None
+        for key, vals in criteria.items():
+            col = key.replace('_', ' ') if key.replace('_', ' ') in self.indexes else key
+            index = self.indexes[col]
+            vals = [vals] if isinstance(vals, str) or not hasattr(vals, '__iter__') else vals
+            matched = [index[v] for v in vals if v in index]
+            if len(matched) == 1:
+                matched = matched[0]
+            else:
+                matched = np.unique(np.concatenate(matched)) if matched else np.empty(0, dtype=np.int64)
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+
+        return np.arange(len(self.app2baseline_df)) if rows is None else rows
+
+    def query(self, columns=None, **criteria):
+        """
+        Extract the rows matching all criteria.
+
+        Args:
+            columns (list): Columns to extract. Default extracts all columns.
+            criteria (dict): Indexed column to the value(s) to match (e.g. UFS_App='ATM').
+
+        Return (pd.DataFrame): Matching rows of the map.
+
+        """
+        df = self.app2baseline_df.iloc[self.get_rows(**criteria)]
+
+        return df if columns is None else df[columns]
+
+    def files_for_test(self, test_name, rel_path=False):
+        """
+        Baseline data files required by a regression test.
+
+        Args:
+            test_name (str): Name of the regression test.
+            rel_path (bool): If True, return the files' relative paths instead of filenames.
+
+        Return (list): Sorted unique filenames (or relative paths).
+
+        """
+        rows = self.get_rows(Test_Name=test_name)
+        values = self.rel_paths[rows] if rel_path else self.filenames[rows]
+
+        return sorted(set(values))
+
+    def tests_for_file(self, filename):
+        """
+        Regression tests requiring a baseline data file.
+
+        Args:
+            filename (str): Filename of the data file.
+
+        Return (list): Sorted unique regression test names.
+
+        """
+        return sorted(set(self.test_names[self.get_rows(Filename=filename)]))
+
+    def apps_for_cntl_folder(self, cntl_folder):
+        """
+        UFS applications whose regression tests compare against a baseline CNTL folder.
+
+        Args:
+            cntl_folder (str): Name of the baseline CNTL folder.
+
+        Return (list): Sorted unique UFS applications.
+
+        """
+        return sorted(set(self.apps[self.get_rows(CNTL_Folder=cntl_folder)]))
+
+    def cntl_folders_for_app(self, app):
+        """
+        Baseline CNTL folders compared against by a UFS application's regression tests.
+
+        Args:
+            app (str): UFS application (e.g. 'ATM').
+
+        Return (list): Sorted unique CNTL folders.
+
+        """
+        return sorted(set(self.cntl_folders[self.get_rows(UFS_App=app)]))
+
+    def bytes_for_rows(self, rows):
+        """
+        Total size of the unique data files within rows of the map.
+
+        Args:
+            rows (np.ndarray): Row positions.
+
+        Return (int): Total size (Bytes), counting each file once.
+
+        """
+        is_required = np.zeros(len(self.file_sizes), dtype=bool)
+        is_required[self.file_ids[rows]] = True
+
+        return int(self.file_sizes[is_required].sum())
+
+    def bytes_for_app(self, app):
+        """
+        Total size of the unique baseline data files required by a UFS application.
+
+        Args:
+            app (str): UFS application (e.g. 'ATM').
+
+        Return (int): Total size (Bytes), counting each file once.
+
+        """
+        return self.bytes_for_rows(self.get_rows(UFS_App=app))
+
+    def bytes_for_test(self, test_name):
+        """
+        Total size of the unique baseline data files required by a regression test.
+
+        Args:
+            test_name (str): Name of the regression test.
+
+        Return (int): Total size (Bytes), counting each file once.
+
+        """
+        return self.bytes_for_rows(self.get_rows(Test_Name=test_name))
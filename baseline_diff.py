@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+# Columns identifying the UFS application-to-physics suite build's regression test of a CNTL folder.
+TEST_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Type', 'Test Name']
+
+
+class BaselineDiff():
+    """
+    Compares the baseline data files of two baseline dates, in linear time, by hashing each file's
+    (CNTL Folder, Relative Directory, Filename) key. The date's root folder (e.g. 'develop-20220329')
+    is excluded from the relative directory, so the same file of two dates shares its key.
+
+    """
+    def __init__(self, baseline_df, appsphys2test_df=None):
+
+        # Baseline data files of all dates (e.g. baseline_df or the merged ufs_app2test2data_df).
+        self.baseline_df = baseline_df.reset_index(drop=True)
+
+        # UFS application-to-physics suite builds' regression tests per CNTL folder. Derived from
+        # the baseline data files if they are already merged w/ rt_appsphys2test_df.
+        if appsphys2test_df is None and all(col in baseline_df.columns for col in TEST_COLUMNS):
+            appsphys2test_df = baseline_df[TEST_COLUMNS + ['CNTL Folder']]
+        self.cntl2test_df = None
+        if appsphys2test_df is not None:
+            self.cntl2test_df = appsphys2test_df[TEST_COLUMNS + ['CNTL Folder']].drop_duplicates(ignore_index=True)
+
+        # Rows per baseline date & each row's key columns.
+        self.date_rows = self.baseline_df.groupby('Date', sort=False).indices
+        rel_dirs = self.baseline_df['Relative Directory'].astype(str).str.split('/', n=1).str[1].fillna('')
+        self.cntl_folders = self.baseline_df['CNTL Folder'].to_numpy(dtype=object)
+        self.rel_dirs = rel_dirs.to_numpy(dtype=object)
+        self.full_rel_dirs = self.baseline_df['Relative Directory'].to_numpy(dtype=object)
+        self.filenames = self.baseline_df['Filename'].to_numpy(dtype=object)
+        self.sizes = self.baseline_df['Size (Bytes)'].to_numpy(dtype=np.int64)
+
+    def get_snapshot(self, date):
+        """
+        Map each baseline data file of a date to its row.
+
+        Args:
+            date (str): Baseline date (e.g. '20220329').
+
+        Return (dict): (CNTL Folder, Relative Directory excluding the date's root folder, Filename)
+        to the file's row position.
+
+        """
+        rows = self.date_rows.get(date, np.empty(0, dtype=np.int64))
+
+        return {(self.cntl_folders[r], self.rel_dirs[r], self.filenames[r]): r for r in rows}
+
+    def diff(self, old_date, new_date):
+        """
+        Compare the baseline data files of two baseline dates.
+
+        Args:
+            old_date (str): Earlier baseline date (e.g. '20220315').
+            new_date (str): Later baseline date (e.g. '20220329').
+
+        Return (pd.DataFrame): Added, removed & size-changed files w/ their CNTL folder, relative
+        directory ('Relative Directory', excluding the date's root folder), filename, old & new size (Bytes), size delta
+        (Bytes) & relative directory w/in the new date's root folder.
+
+        """
+        old_snapshot = self.get_snapshot(old_date)
+        new_snapshot = self.get_snapshot(new_date)
+
+        diff_rows = []
+        for key, new_row in new_snapshot.items():
+            old_row = old_snapshot.get(key)
+            if old_row is None:
+                diff_rows.append(key + ('added', 0, self.sizes[new_row], self.full_rel_dirs[new_row]))
+            elif self.sizes[old_row] != self.sizes[new_row]:
+                diff_rows.append(key + ('changed', self.sizes[old_row], self.sizes[new_row], self.full_rel_dirs[new_row]))
+        for key, old_row in old_snapshot.items():
+            if key not in new_snapshot:
+                diff_rows.append(key + ('removed', self.sizes[old_row], 0, None))
+
+        diff_df = pd.DataFrame.from_records(diff_rows, columns=['CNTL Folder', 'Relative Directory', 'Filename', 'Status',
+                                                                'Old Size (Bytes)', 'New Size (Bytes)', 'New Relative Directory'])
+        diff_df['Status'] = pd.Categorical(diff_df['Status'], categories=['added', 'removed', 'changed'])
+        diff_df['Delta (Bytes)'] = diff_df['New Size (Bytes)'] - diff_df['Old Size (Bytes)']
+
+        return diff_df
+
+    def diff_by_test(self, old_date, new_date):
+        """
+        Compare the baseline data files of two baseline dates per regression test.
+
+        Args:
+            old_date (str): Earlier baseline date (e.g. '20220315').
+            new_date (str): Later baseline date (e.g. '20220329').
+
+        Return (pd.DataFrame): The 'diff()' files joined to the UFS application, physics suite &
+        regression tests comparing against their CNTL folder.
+
+        """
+        if self.cntl2test_df is None:
+            raise ValueError("Regression tests per CNTL folder are unknown. Provide 'appsphys2test_df'.")
+
+        return pd.merge(self.cntl2test_df, self.diff(old_date, new_date), on='CNTL Folder')
+
+    def summarize(self, old_date, new_date, by=('UFS_App', 'Physics_Suite', 'Test Name')):
+        """
+        Summarize the changes between two baseline dates per group.
+
+        Args:
+            old_date (str): Earlier baseline date (e.g. '20220315').
+            new_date (str): Later baseline date (e.g. '20220329').
+            by (tuple): Columns to group by (e.g. ['UFS_App'], ['CNTL Folder']).
+
+        Return (pd.DataFrame): Number of added, removed & changed files, net size delta (Bytes) &
+        size to sync (Bytes) -- the new size of the added & changed files -- per group. A file
+        shared by several tests of a group is counted once per group.
+
+        """
+        by = list(by)
+        diff_df = self.diff(old_date, new_date) if by == ['CNTL Folder'] else self.diff_by_test(old_date, new_date)
+        diff_df = diff_df.drop_duplicates(list(dict.fromkeys(by + ['CNTL Folder', 'Relative Directory', 'Filename'])))
+        diff_df['Sync (Bytes)'] = np.where(diff_df['Status'] == 'removed', 0, diff_df['New Size (Bytes)'])
+        groups = diff_df.groupby(by, observed=True)
+        counts_df = groups['Status'].value_counts().unstack(fill_value=0)
+        counts_df = counts_df.reindex(columns=['added', 'removed', 'changed'], fill_value=0)
+        counts_df.columns = counts_df.columns.astype(str)
+        counts_df.columns.name = None
+        sizes_df = groups[['Delta (Bytes)', 'Sync (Bytes)']].sum()
+
+        return counts_df.join(sizes_df)
+
+    def get_sync_manifest(self, old_date, new_date):
+        """
+        Relative paths of the files to sync to bring a platform's baseline from one date to the next.
+
+        Args:
+            old_date (str): Earlier baseline date (e.g. '20220315').
+            new_date (str): Later baseline date (e.g. '20220329').
+
+        Return (list): Sorted relative paths (w/in the new date's root folder) of the added &
+        changed files.
+
+        """
+        diff_df = self.diff(old_date, new_date)
+        diff_df = diff_df[diff_df['Status'] != 'removed']
+
+        return sorted(set(diff_df['New Relative Directory'] + '/' + diff_df['Filename']))
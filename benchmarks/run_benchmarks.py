@@ -0,0 +1,212 @@
+"""
+Benchmarks of each stage of the mapping pipeline over synthetic ufs-weather-model trees of
+several scales (see synthetic_tree.py).
+
+    python benchmarks/run_benchmarks.py --scales 100 1000 --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --scales 100 1000 --compare benchmarks/baseline.json
+
+Each stage reports its best wall time over the repeats, throughput (units per second, e.g.
+config. files/s, rows/s) & peak traced memory. Comparing against a saved baseline flags the
+stages slower than the threshold ratio & exits w/ status 1.
+
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from script_scraper import ScriptScraper
+from app2bl_mapper import App2BaselineMapper
+from synthetic_tree import SyntheticTreeGenerator
+
+# Minimum slowdown (seconds) of a stage flagged as a regression, ignoring timer noise of fast stages.
+MIN_REGRESSION_S = 0.005
+
+
+def get_stages(tree_root, reference_fn, baseline_df, out_dir):
+    """
+    Generate the benchmarked stages of the pipeline.
+
+    Args:
+        tree_root (str): Root folder of the synthetic tree.
+        reference_fn (str): The tree's AppSuiteCombo2Test.csv reference.
+        baseline_df (pd.DataFrame): Synthetic baseline dataset.
+        out_dir (str): Folder of the stages' output tables.
+
+    Return (list): (stage name, setup, run, unit) per stage. 'setup()' returns the args of
+    'run()' (untimed) & 'run()' returns the number of units processed.
+
+    """
+    scraper_wrapper = ScriptScraper(tree_root)
+    scraper_wrapper.main_reference = reference_fn
+    mapper = App2BaselineMapper(None, None, None)
+
+    # Outputs of the previous stages, generated once.
+    ref_txt = scraper_wrapper.read_appsphys2test()
+    input_data_dict = scraper_wrapper.read_tests_fv3_parms()
+    tests_paths = scraper_wrapper.list_config_files(scraper_wrapper.test_scripts_dir)
+    fv3_paths = scraper_wrapper.list_config_files(scraper_wrapper.fv3_conf_dir)
+    parm_paths = scraper_wrapper.list_config_files(scraper_wrapper.parm_conf_dir)
+    tests_txt = {os.path.basename(fp): scraper_wrapper.scrape_config_file('tests', fp) for fp in tests_paths}
+    fv3_txt = {os.path.basename(fp): scraper_wrapper.scrape_config_file('fv3_conf', fp) for fp in fv3_paths}
+
+    def get_app2test():
+        return scraper_wrapper.get_app2test(scraper_wrapper.convert_list2dict(ref_txt))
+
+    appsphys2test_dict = scraper_wrapper.get_appsphys2testparams(get_app2test(), input_data_dict)
+    appsphys2test_df = scraper_wrapper.convert_dict2df(appsphys2test_dict, fn=os.path.join(out_dir, 'rt_appsphys2test_df'))
+    merged_df = pd.merge(appsphys2test_df, baseline_df, on=['CNTL Folder'])
+    n_files = len(tests_paths) + len(fv3_paths) + len(parm_paths)
+
+    return [('read_appsphys2test', lambda: (), lambda: len(scraper_wrapper.read_appsphys2test()), 'rows'),
+            ('convert_list2dict+get_app2test', lambda: (), lambda: len(get_app2test()), 'builds'),
+            ('read_tests_fv3_parms', lambda: (), lambda: scraper_wrapper.read_tests_fv3_parms() and n_files, 'files'),
+            ('preprocess_tests', lambda: (), lambda: len(scraper_wrapper.preprocess_tests(tests_txt)), 'files'),
+            ('preprocess_fv3', lambda: (), lambda: len(scraper_wrapper.preprocess_fv3(fv3_txt)), 'files'),
+            ('extract_parm_txt', lambda: (), lambda: len([scraper_wrapper.scrape_config_file('parm', fp) for fp in parm_paths]), 'files'),
+            ('get_appsphys2testparams', lambda: (get_app2test(),),
+             lambda outer_dict: len(scraper_wrapper.get_appsphys2testparams(outer_dict, input_data_dict)), 'builds'),
+            ('convert_dict2df', lambda: (), lambda: len(scraper_wrapper.convert_dict2df(
+                appsphys2test_dict, fn=os.path.join(out_dir, 'rt_appsphys2test_df'))), 'rows'),
+            ('merge', lambda: (), lambda: len(pd.merge(appsphys2test_df, baseline_df, on=['CNTL Folder'])), 'rows'),
+            ('get_bl_storage_size', lambda: (), lambda: mapper.get_bl_storage_size(merged_df) is not None and len(merged_df), 'rows')]
+
+
+def run_stage(setup, run, repeats):
+    """
+    Time & trace the memory of a stage.
+
+    Args:
+        setup (func): Returns the args of 'run()'.
+        run (func): Runs the stage & returns the number of units processed.
+        repeats (int): Number of timed runs.
+
+    Return (tuple): Best wall time (s), units processed & peak traced memory (MB).
+
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        args = setup()
+        start = time.perf_counter()
+        units = run(*args)
+        best = min(best, time.perf_counter() - start)
+
+    # Memory is traced in a separate, untimed run, since tracing slows allocations.
+    args = setup()
+    tracemalloc.start()
+    run(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, units, peak / 1e6
+
+
+def run_benchmarks(scales, repeats=3, files_per_test=40, seed=0):
+    """
+    Benchmark each stage at each scale.
+
+    Args:
+        scales (list): Numbers of regression tests of the synthetic trees.
+        repeats (int): Number of timed runs per stage.
+        files_per_test (int): Baseline data files per CNTL folder.
+        seed (int): Random seed of the synthetic trees.
+
+    Return (pd.DataFrame): Wall time (s), units processed, throughput (units/s) & peak traced
+    memory (MB) per scale & stage.
+
+    """
+    results = []
+    for n_tests in scales:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generator = SyntheticTreeGenerator(os.path.join(tmp_dir, 'ufs-weather-model'), n_tests, seed=seed)
+            reference_fn = generator.generate()
+            baseline_df = generator.generate_baseline_df(files_per_test)
+            for stage, setup, run, unit in get_stages(generator.root, reference_fn, baseline_df, tmp_dir):
+                wall, units, peak_mb = run_stage(setup, run, repeats)
+                results.append({'Scale': n_tests, 'Stage': stage, 'Wall (s)': wall, 'Units': units, 'Unit': unit,
+                                'Throughput (units/s)': units / wall if wall > 0 else float('inf'),
+                                'Peak (MB)': peak_mb})
+
+    return pd.DataFrame(results)
+
+
+def compare(results_df, baseline, threshold):
+    """
+    Flag the stages slower than their baseline.
+
+    Args:
+        results_df (pd.DataFrame): Benchmark results.
+        baseline (dict): Saved baseline results (i.e. 'save_baseline()' output).
+        threshold (float): Max ratio of the current to the baseline wall time.
+
+    Return (pd.DataFrame): Results w/ their baseline wall time, ratio & regression flag.
+
+    """
+    baseline_df = pd.DataFrame(baseline['results'])[['Scale', 'Stage', 'Wall (s)']]
+    compared_df = pd.merge(results_df, baseline_df, on=['Scale', 'Stage'], how='left', suffixes=('', ' Baseline'))
+    compared_df['Ratio'] = compared_df['Wall (s)'] / compared_df['Wall (s) Baseline']
+    compared_df['Regression'] = ((compared_df['Ratio'] > threshold)
+                                 & (compared_df['Wall (s)'] - compared_df['Wall (s) Baseline'] > MIN_REGRESSION_S))
+
+    return compared_df
+
+
+def save_baseline(results_df, fn):
+    """
+    Save the benchmark results as the local baseline.
+
+    Args:
+        results_df (pd.DataFrame): Benchmark results.
+        fn (str): Baseline JSON file.
+
+    Return (dict): Saved baseline.
+
+    """
+    baseline = {'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results_df.to_dict(orient='records')}
+    with open(fn, 'w') as file:
+        json.dump(baseline, file, indent=1)
+
+    return baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the mapping pipeline over synthetic ufs-weather-model trees.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[100, 1000], help='Numbers of regression tests.')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per stage.')
+    parser.add_argument('--files-per-test', type=int, default=40, help='Baseline data files per CNTL folder.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic trees.')
+    parser.add_argument('--json', default=None, help='Write the results to a JSON file.')
+    parser.add_argument('--save-baseline', default=None, help='Save the results as the local baseline JSON file.')
+    parser.add_argument('--compare', default=None, help='Baseline JSON file to flag regressions against.')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Max wall time ratio to the baseline.')
+    args = parser.parse_args(argv)
+
+    results_df = run_benchmarks(args.scales, args.repeats, args.files_per_test, args.seed)
+    status = 0
+    if args.compare is not None:
+        with open(args.compare, 'r') as file:
+            results_df = compare(results_df, json.load(file), args.threshold)
+        status = int(results_df['Regression'].any())
+    print(results_df.to_string(index=False, float_format=lambda v: f'{v:.4g}'))
+    if args.json is not None:
+        results_df.to_json(args.json, orient='records', indent=1)
+    if args.save_baseline is not None:
+        save_baseline(results_df, args.save_baseline)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
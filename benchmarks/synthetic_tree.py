@@ -0,0 +1,282 @@
+"""
+Generator of a scaled, synthetic ufs-weather-model tree matching what ScriptScraper expects:
+
+    <root>/tests/tests/<test>              /tests files (CNTL_DIR, export_* calls & exports)
+    <root>/tests/fv3_conf/<name>_run.IN    /fv3_conf files (cp/ln/rsync/mv lines w/in if/else blocks)
+    <root>/tests/parm/<name>.nml.IN        /parm namelists (& MOM6 parameter files)
+    <root>/tests/default_vars.sh           default_vars.sh w/ the export_* methods
+    <root>/AppSuiteCombo2Test.csv          UFS application-to-physics suite-to-tests reference
+
+along w/ a synthetic baseline dataset (i.e. baseline_df) of the tests' CNTL folders.
+
+    python benchmarks/synthetic_tree.py --root /tmp/ufs-wm-synthetic --tests 1000
+
+"""
+import os
+import csv
+import random
+import argparse
+import numpy as np
+import pandas as pd
+
+# UFS applications, physics suites & /fv3_conf input folders of the synthetic tree.
+APPS = ['ATM', 'ATMW', 'S2S', 'S2SW', 'HAFS', 'HAFSW', 'NG-GODAS']
+SUITES = ['FV3_GFS_v16', 'FV3_GFS_v17_p8', 'FV3_GFS_v16_coupled_p8', 'FV3_HRRR', 'FV3_RAP', 'FV3_GFS_v15_thompson_mynn']
+INPUT_FOLDERS = ['FV3_input_data', 'FV3_input_data48', 'FV3_input_data192', 'FV3_fix_tiled/C96', 'MOM6_FIX/100',
+                 'CICE_FIX/100', 'CPL_FIX/aC96o100', 'GOCART/p8', 'FV3_input_frac/C96_L127']
+DATA_EXTS = ['nc', 'grb', 'grib2', 'dat', 'txt', 'f77']
+
+DEFAULT_VARS = """###############################################################################
+#
+# Export variables to the default values
+#
+###############################################################################
+
+if [[ $MACHINE_ID = hera.* ]]; then
+  TPN=40
+  INPES_dflt=3
+elif [[ $MACHINE_ID = orion.* ]]; then
+  TPN=40
+  INPES_dflt=3
+fi
+
+WLCLK_dflt=30
+
+export_fv3 ()
+{
+export FV3=true
+export S2S=false
+export THRD=1
+export FV3_IC="@[INPUTDATA_ROOT]/FV3_input_data/INPUT"
+export FILEDIR=${INPUTDATA_ROOT}/FV3_input_data
+export INPUT_NML=global_control.nml.IN
+export FV3_RUN=fv3_run.IN
+export ATMRES='C96'
+}
+
+export_cpl ()
+{
+export FV3=true
+export S2S=true
+export OCNRES='100'
+export MOM_IC="${INPUTDATA_ROOT}/MOM6_IC/${OCNRES}"   # MOM6 ICs
+export ICE_IC=@[INPUTDATA_ROOT]/CICE_IC/${OCNRES:-025}
+export FV3_RUN=cpld_control_run.IN
+}
+"""
+
+
+class SyntheticTreeGenerator():
+    """
+    Writes a synthetic ufs-weather-model tree of N regression tests, sharing M /fv3_conf & M
+    /parm files, w/ realistic data transfer lines & namelists.
+
+    """
+    def __init__(self, root, n_tests=100, n_config_files=None, files_per_config=20, seed=0):
+
+        # Root folder of the synthetic repo.
+        self.root = root
+
+        # Number of /tests files, of /fv3_conf (& of /parm) files & of data files per config. file.
+        self.n_tests = n_tests
+        self.n_config_files = n_config_files or max(2, n_tests // 8)
+        self.files_per_config = files_per_config
+        self.rng = random.Random(seed)
+
+        self.test_names = [f'synthetic_test_{i:05d}' for i in range(n_tests)]
+        self.fv3_fns = [f'synthetic_{i:04d}_run.IN' for i in range(self.n_config_files)]
+        self.parm_fns = [f'synthetic_{i:04d}.nml.IN' for i in range(self.n_config_files)]
+
+    def get_data_path(self):
+        """
+        Random input data file path.
+
+        Args:
+            None
+
+        Return (tuple): Input data folder (e.g. 'FV3_input_data/INPUT') & filename.
+
+        """
+        folder = self.rng.choice(INPUT_FOLDERS)
+        fn = f'data_{self.rng.randrange(10000):04d}.tile{self.rng.randint(1, 6)}.{self.rng.choice(DATA_EXTS)}'
+
+        return folder, fn
+
+    def write_default_vars(self):
+        """
+        Write the default_vars.sh script, w/ the variables & methods the synthetic tests call.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        with open(os.path.join(self.root, 'tests', 'default_vars.sh'), 'w') as file:
+            file.write(DEFAULT_VARS)
+
+    def write_tests(self):
+        """
+        Write a /tests file per test, exporting its CNTL folder, /fv3_conf & /parm files
+        & a random number of test parameters.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        for idx, test_name in enumerate(self.test_names):
+            lines = ['#' * 79, '#', f'#  Synthetic regression test {idx}', '#', '#' * 79, '',
+                     f'export TEST_DESCR="Synthetic test {idx} compared against its baseline"', '',
+                     f'export CNTL_DIR={test_name}', '',
+                     'export LIST_FILES="sfcf000.nc \\',
+                     '                   atmf000.nc \\',
+                     '                   RESTART/sfc_data.tile6.nc"', '',
+                     'export_fv3']
+            if idx % 3 == 0:
+                lines.append('export_cpl')
+            for var in range(self.rng.randint(8, 20)):
+                lines.append(f'export VAR_{var}={self.rng.randrange(1000)}')
+            lines += [f"export OUTPUT_GRID=\"'gaussian_grid'\"",
+                      f'export FV3_RUN={self.fv3_fns[idx % self.n_config_files]}',
+                      f'export INPUT_NML={self.parm_fns[idx % self.n_config_files]}']
+            with open(os.path.join(self.root, 'tests', 'tests', test_name), 'w') as file:
+                file.write('\n'.join(lines) + '\n')
+
+    def write_fv3_conf(self):
+        """
+        Write the /fv3_conf files, each transferring random input data files via cp, ln,
+        rsync & mv lines.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        for fn in self.fv3_fns:
+            lines = ['rm -fr INPUT RESTART', 'mkdir INPUT RESTART', '', 'if [ $WARM_START = .F. ]; then']
+            for _ in range(self.files_per_config):
+                folder, data_fn = self.get_data_path()
+                verb = self.rng.choice(['cp', 'cp', 'cp', 'ln -sf', 'rsync -arv'])
+                dest = self.rng.choice(['.', 'INPUT/', f'INPUT/{data_fn}'])
+                lines.append(f'  {verb} @[INPUTDATA_ROOT]/{folder}/{data_fn} {dest}')
+            lines += ['else', '  cp ../${DEP_RUN}${SUFFIX}/RESTART/* ./INPUT', 'fi',
+                      'cp -r ${FV3_IC}/* INPUT/.',
+                      'ln -sf ${FILEDIR}/aerosol.dat  .',
+                      'rsync -arv @[INPUTDATA_ROOT_WW3]/mod_def.* .',
+                      'mv RESTART/coupler.res INPUT/']
+            with open(os.path.join(self.root, 'tests', 'fv3_conf', fn), 'w') as file:
+                file.write('\n'.join(lines) + '\n')
+
+    def write_parm(self):
+        """
+        Write the /parm namelists, each setting random data filenames, & a MOM6 parameter
+        file per few namelists.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        for idx, fn in enumerate(self.parm_fns):
+            lines = ['&atmos_model_nml', '  blocksize = 32', "  ccpp_suite = '@[CCPP_SUITE]'", '/',
+                     '&fv_core_nml', '  layout = @[INPNT]', '  npz = @[NPZ]', '/', '&namsfc']
+            for var in range(self.files_per_config):
+                _, data_fn = self.get_data_path()
+                sep = ',' if var % 2 else ''
+                lines.append(f"  fn_{var:02d} = '{data_fn}'{sep}  ! data file {var}")
+            lines += ['  fsmcl(2) = 99999', '/', '&nam_stochy', "  fn_list = 'aer_data.m01.nc',", "            'aer_data.m02.nc'", '/']
+            with open(os.path.join(self.root, 'tests', 'parm', fn), 'w') as file:
+                file.write('\n'.join(lines) + '\n')
+
+            # MOM6 parameter file per few namelists.
+            if idx % 4 == 0:
+                mom_lines = ['INPUTDIR = "INPUT"', 'TOPO_FILE = "ocean_topog.nc"        ! default = "topog.nc"',
+                             'SALT_RESTORE_FILE="salt_restore.nc,temp.nc"',
+                             '#override CHL_FILE = "seawifs-clim-1997-2010.1440x1080.v20180328.nc"',
+                             'KPP%', 'N_SMOOTH = 4', '%KPP']
+                with open(os.path.join(self.root, 'tests', 'parm', f'MOM_input_synthetic_{idx:04d}'), 'w') as file:
+                    file.write('\n'.join(mom_lines) + '\n')
+
+    def write_reference(self):
+        """
+        Write the AppSuiteCombo2Test.csv reference, assigning each test to 1-2 UFS
+        application-to-physics suite builds.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        combos = {}
+        for test_name in self.test_names:
+            for _ in range(self.rng.randint(1, 2)):
+                key = (self.rng.choice(APPS), self.rng.choice(SUITES), self.rng.choice(['tests', 'tests', 'debug_tests']))
+                combos.setdefault(key, []).append(test_name)
+        with open(os.path.join(self.root, 'AppSuiteCombo2Test.csv'), 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['UFS_App', 'Physics_Suite', 'Test_Type', 'Tests'])
+            for (app, suite, test_type), test_names in sorted(combos.items()):
+                writer.writerow([app, suite, test_type, ', '.join(dict.fromkeys(test_names))])
+
+    def generate(self):
+        """
+        Write the synthetic tree.
+
+        Args:
+            None
+
+        Return (str): Path of the tree's AppSuiteCombo2Test.csv reference.
+
+        """
+        for folder in ['tests', 'fv3_conf', 'parm']:
+            os.makedirs(os.path.join(self.root, 'tests', folder), exist_ok=True)
+        self.write_default_vars()
+        self.write_tests()
+        self.write_fv3_conf()
+        self.write_parm()
+        self.write_reference()
+
+        return os.path.join(self.root, 'AppSuiteCombo2Test.csv')
+
+    def generate_baseline_df(self, files_per_test=40, date='20220329'):
+        """
+        Synthesize the baseline dataset (i.e. baseline_df) of the tests' CNTL folders.
+
+        Args:
+            files_per_test (int): Baseline data files per CNTL folder.
+            date (str): Baseline dataset timestamp.
+
+        Return (pd.DataFrame): Baseline data files.
+
+        """
+        rng = np.random.default_rng(self.rng.randrange(2**32))
+        n_rows = self.n_tests * files_per_test
+        cntl_folders = np.repeat(self.test_names, files_per_test)
+        filenames = [f'{kind}f{hour:03d}.tile{tile}.nc' for kind, hour, tile in
+                     zip(rng.choice(['atm', 'sfc', 'phy'], n_rows), rng.integers(0, 48, n_rows), rng.integers(1, 7, n_rows))]
+        sizes = rng.lognormal(17, 2, n_rows).astype(np.int64)
+        baseline_df = pd.DataFrame({'CNTL Folder': cntl_folders,
+                                    'Date': date,
+                                    'Compiler': 'INTEL',
+                                    'Relative Directory': [f'develop-{date}/INTEL/{cntl}' for cntl in cntl_folders],
+                                    'Filename': filenames,
+                                    'Size (Bytes)': sizes,
+                                    'Size (GB)': (sizes / 1e9).round(1),
+                                    'DataType': 'nc'})
+
+        return baseline_df.drop_duplicates(['Relative Directory', 'Filename'], ignore_index=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic ufs-weather-model tree.')
+    parser.add_argument('--root', required=True, help='Root folder of the synthetic tree.')
+    parser.add_argument('--tests', type=int, default=100, help='Number of /tests files.')
+    parser.add_argument('--config-files', type=int, default=None, help='Number of /fv3_conf (& /parm) files. Default: tests // 8.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+    print(SyntheticTreeGenerator(args.root, args.tests, args.config_files, seed=args.seed).generate())
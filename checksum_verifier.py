@@ -0,0 +1,327 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Bytes read per chunk while hashing a file.
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Statuses of a verified file. Files of the wrong size, digest or which can't be read are corrupt.
+OK_STATUS = 'ok'
+MISSING_STATUS = 'missing'
+CORRUPT_STATUSES = ['size_mismatch', 'digest_mismatch', 'unreadable']
+
+# Columns of the verified files & of the per-test report.
+FILE_COLUMNS = ['Relative Path', 'Expected Size (Bytes)', 'Size (Bytes)', 'Digest', 'Status']
+REPORT_COLUMNS = ['Test Name', 'Relative Path', 'Status', 'Expected Size (Bytes)', 'Size (Bytes)']
+
+
+class ChecksumVerifier():
+    """
+    Verifies the input & baseline data files staged on a platform for a subset of regression
+    tests: each file's existence & size first, then its checksum.
+
+    Files are stat'ed & hashed (w/ chunked reads) across a thread pool, since hashlib releases
+    the GIL while hashing. Digests are cached by (path, size, mtime), so that reruns only hash
+    the files which changed. Digests can be compared against a reference manifest of the files
+    as staged from (e.g. the 'md5sum' style manifest of a verification run on the source platform).
+
+    """
+    def __init__(self, root, test_files_df, algorithm='md5', workers=16, chunk_size=CHUNK_SIZE, cache_fn=None):
+
+        # Parent folder of the staged datasets (e.g. '<root>/develop-20220329/...', '<root>/input-data-20211210/...').
+        self.root = os.path.abspath(root)
+
+        # Files required per test, w/ their relative paths & expected sizes (Bytes, -1 if unknown).
+        self.test_files_df = test_files_df[['Test Name', 'Relative Path', 'Size (Bytes)']].drop_duplicates(
+            ['Test Name', 'Relative Path']).reset_index(drop=True)
+        file_ids, self.file_paths = pd.factorize(self.test_files_df['Relative Path'], sort=True)
+        self.file_ids = file_ids
+        self.expected_sizes = np.full(len(self.file_paths), -1, dtype=np.int64)
+        self.expected_sizes[file_ids] = self.test_files_df['Size (Bytes)'].fillna(-1).to_numpy(dtype=np.int64)
+
+        # hashlib algorithm (e.g. 'md5', 'sha256'), number of threads & Bytes read per chunk.
+        if algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Unknown checksum algorithm '{algorithm}'. Options: {sorted(hashlib.algorithms_guaranteed)}")
+        self.algorithm = algorithm
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+        # Digest cache (excluding .npz) & its digests per path as (size, mtime, digest).
+        self.cache_fn = cache_fn
+        self.cache = self.read_cache() if cache_fn is not None else {}
+
+        # Number of files hashed & read from the cache by the last verification.
+        self.n_hashed = 0
+        self.n_cached = 0
+
+    @classmethod
+    def from_map(cls, root, app2test2data_df, tests=None, apps=None, combos=None, **kwargs):
+        """
+        Verify the baseline data files of the selected tests, per the app-to-test-to-data map.
+
+        Args:
+            root (str): Parent folder of the staged datasets.
+            app2test2data_df (pd.DataFrame): Merged map of the regression tests to their baseline
+                                             data files (e.g. ufs_app2test2data_df).
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests.
+            kwargs (dict): ChecksumVerifier options.
+
+        Return (ChecksumVerifier): The verifier. Selects all tests if none are selected.
+
+        """
+        df = app2test2data_df
+        if tests or apps or combos:
+            combo_keys = df['UFS_App'].astype(str) + ':' + df['Physics_Suite'].astype(str)
+            is_selected = (df['Test Name'].isin(tests or []) | df['UFS_App'].isin(apps or [])
+                           | combo_keys.isin([f'{app}:{suite}' for app, suite in combos or []]))
+            df = df[is_selected]
+        test_files_df = pd.DataFrame({'Test Name': df['Test Name'].astype(str).to_numpy(),
+                                      'Relative Path': (df['Relative Directory'].astype(str) + '/' + df['Filename'].astype(str)).to_numpy(),
+                                      'Size (Bytes)': df['Size (Bytes)'].to_numpy()})
+
+        return cls(root, test_files_df, **kwargs)
+
+    @classmethod
+    def from_planner(cls, root, planner, tests=None, apps=None, combos=None, **kwargs):
+        """
+        Verify the input & baseline data files of the selected tests, per a StagingPlanner.
+
+        Args:
+            root (str): Parent folder of the staged datasets.
+            planner (StagingPlanner): Planner w/ the per-test file bitmaps.
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests.
+            kwargs (dict): ChecksumVerifier options.
+
+        Return (ChecksumVerifier): The verifier. Selects all tests if none are selected.
+
+        """
+        test_names = planner.select_tests(tests, apps, combos) if (tests or apps or combos) else planner.test_names
+        names, ids = [], []
+        for test_name in test_names:
+            test_ids = np.flatnonzero(np.unpackbits(planner.test_bitmaps[planner.test_rows[test_name]],
+                                                    count=len(planner.file_paths)))
+            names += [test_name] * len(test_ids)
+            ids.append(test_ids)
+        ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        test_files_df = pd.DataFrame({'Test Name': names,
+                                      'Relative Path': planner.file_paths[ids],
+                                      'Size (Bytes)': planner.file_sizes[ids]})
+
+        return cls(root, test_files_df, **kwargs)
+
+    def read_cache(self):
+        """
+        Read the digest cache, if any. Digests of another algorithm are discarded.
+
+        Args:
+            None
+
+        Return (dict): (size, mtime, digest) per path.
+
+        """
+        if not os.path.exists(self.cache_fn + '.npz'):
+            return {}
+        with np.load(self.cache_fn + '.npz', allow_pickle=False) as data:
+            if str(data['algorithm']) != self.algorithm:
+                return {}
+            return {path: (size, mtime, digest) for path, size, mtime, digest
+                    in zip(data['paths'].tolist(), data['sizes'].tolist(), data['mtimes'].tolist(), data['digests'].tolist())}
+
+    def save_cache(self):
+        """
+        Save the digest cache.
+
+        Args:
+            None
+
+        Return (str): Path of the saved file.
+
+        """
+        paths = list(self.cache)
+        entries = list(self.cache.values())
+        np.savez_compressed(self.cache_fn, algorithm=np.array(self.algorithm),
+                            paths=np.array(paths, dtype=str),
+                            sizes=np.array([entry[0] for entry in entries], dtype=np.int64),
+                            mtimes=np.array([entry[1] for entry in entries], dtype=np.int64),
+                            digests=np.array([entry[2] for entry in entries], dtype=str))
+
+        return self.cache_fn + '.npz'
+
+    def stat_file(self, path):
+        """
+        Size & mtime of a staged file.
+
+        Args:
+            path (str): Path of the file.
+
+        Return (tuple): Size (Bytes) & mtime (ns), or None if the file is missing.
+
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def hash_file(self, path, size):
+        """
+        Checksum of a file, read in chunks into a reused buffer.
+
+        Args:
+            path (str): Path of the file.
+            size (int): Size of the file (Bytes), bounding the buffer.
+
+        Return (str): Hex digest, or None if the file can't be read.
+
+        """
+        digest = hashlib.new(self.algorithm)
+        buffer = memoryview(bytearray(max(1, min(self.chunk_size, size))))
+        try:
+            with open(path, 'rb', buffering=0) as file:
+                while True:
+                    n_read = file.readinto(buffer)
+                    if not n_read:
+                        break
+                    digest.update(buffer[:n_read])
+        except OSError:
+            return None
+
+        return digest.hexdigest()
+
+    def verify(self, reference=None):
+        """
+        Verify the staged files required by the selected tests.
+
+        Args:
+            reference (dict): Expected digest per relative path (e.g. 'read_manifest()' output).
+                              Default only checks that the files are readable.
+
+        Return (pd.DataFrame): Per unique file, its relative path, expected & staged size (Bytes),
+        digest & status (i.e. 'ok', 'missing', 'size_mismatch', 'digest_mismatch', 'unreadable').
+
+        """
+        paths = [os.path.join(self.root, rel_path) for rel_path in self.file_paths]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+            # Existence & size checks first, so that missing & truncated files are never hashed.
+            stats = list(pool.map(self.stat_file, paths))
+            sizes = np.array([stat[0] if stat else -1 for stat in stats], dtype=np.int64)
+            status = np.where(sizes < 0, MISSING_STATUS, OK_STATUS).astype(object)
+            status[(sizes >= 0) & (self.expected_sizes >= 0) & (sizes != self.expected_sizes)] = 'size_mismatch'
+
+            # Hash the uncached files, largest first so that the pool's threads finish together.
+            digests = np.full(len(paths), None, dtype=object)
+            to_hash = []
+            for idx in np.flatnonzero(status == OK_STATUS):
+                entry = self.cache.get(paths[idx])
+                if entry is not None and entry[:2] == stats[idx]:
+                    digests[idx] = entry[2]
+                else:
+                    to_hash.append(idx)
+            self.n_cached = len(np.flatnonzero(status == OK_STATUS)) - len(to_hash)
+            self.n_hashed = len(to_hash)
+            to_hash.sort(key=lambda idx: -sizes[idx])
+            for idx, digest in zip(to_hash, pool.map(lambda idx: self.hash_file(paths[idx], sizes[idx]), to_hash)):
+                digests[idx] = digest
+                if digest is None:
+                    status[idx] = 'unreadable'
+                else:
+                    self.cache[paths[idx]] = (*stats[idx], digest)
+
+        if reference is not None:
+            expected = np.array([reference.get(rel_path) for rel_path in self.file_paths], dtype=object)
+            status[(status == OK_STATUS) & pd.notna(expected) & (expected != digests)] = 'digest_mismatch'
+        if self.cache_fn is not None:
+            self.save_cache()
+
+        return pd.DataFrame({'Relative Path': np.asarray(self.file_paths, dtype=object),
+                             'Expected Size (Bytes)': self.expected_sizes,
+                             'Size (Bytes)': sizes,
+                             'Digest': digests,
+                             'Status': status}, columns=FILE_COLUMNS)
+
+    def get_report(self, files_df):
+        """
+        Missing & corrupt files per test.
+
+        Args:
+            files_df (pd.DataFrame): Verified files (i.e. 'verify()' output).
+
+        Return (pd.DataFrame): Per test, its files which are not 'ok', sorted by test & path.
+
+        """
+        report_df = files_df.iloc[self.file_ids].reset_index(drop=True)
+        report_df.insert(0, 'Test Name', self.test_files_df['Test Name'].to_numpy())
+        report_df = report_df[report_df['Status'] != OK_STATUS]
+
+        return report_df[REPORT_COLUMNS].sort_values(['Test Name', 'Relative Path'], ignore_index=True)
+
+    def summarize(self, files_df):
+        """
+        Summarize a verification.
+
+        Args:
+            files_df (pd.DataFrame): Verified files (i.e. 'verify()' output).
+
+        Return (dict): Number of tests, files & Bytes verified, files per status, files hashed &
+        read from the cache, & the missing & corrupt files per test.
+
+        """
+        report_df = self.get_report(files_df)
+        summary = {'tests': int(self.test_files_df['Test Name'].nunique()),
+                   'files': len(files_df),
+                   'bytes': int(files_df['Size (Bytes)'].clip(lower=0).sum()),
+                   'hashed': self.n_hashed,
+                   'cached': self.n_cached}
+        summary.update({status: int(count) for status, count in files_df['Status'].value_counts().items()})
+        failed = {}
+        for test_name, test_df in report_df.groupby('Test Name'):
+            is_missing = test_df['Status'] == MISSING_STATUS
+            failed[test_name] = {'missing': test_df.loc[is_missing, 'Relative Path'].tolist(),
+                                 'corrupt': test_df.loc[~is_missing, 'Relative Path'].tolist()}
+        summary['failed_tests'] = failed
+
+        return summary
+
+    def get_manifest(self, files_df):
+        """
+        Digests of the verified files, in the 'md5sum' format (i.e. '<digest>  <relative path>'),
+        as checked by 'md5sum -c' (or 'sha256sum -c' ...) & read by 'read_manifest()'.
+
+        Args:
+            files_df (pd.DataFrame): Verified files (i.e. 'verify()' output).
+
+        Return (list): Manifest lines of the files w/ a digest.
+
+        """
+        has_digest = files_df['Digest'].notna()
+
+        return [f'{digest}  {rel_path}' for digest, rel_path
+                in zip(files_df.loc[has_digest, 'Digest'], files_df.loc[has_digest, 'Relative Path'])]
+
+    @staticmethod
+    def read_manifest(fn):
+        """
+        Read a manifest of digests in the 'md5sum' format.
+
+        Args:
+            fn (str): Manifest file (e.g. 'get_manifest()' output of the source platform).
+
+        Return (dict): Digest per relative path.
+
+        """
+        reference = {}
+        with open(fn) as file:
+            for line in file:
+                digest, _, rel_path = line.rstrip('\n').partition(' ')
+                if digest and rel_path:
+                    reference[rel_path[1:] if rel_path[0] in ' *' else rel_path] = digest.lower()
+
+        return reference
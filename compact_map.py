@@ -0,0 +1,262 @@
+import json
+import numpy as np
+import pandas as pd
+
+# Columns of the app-to-test-to-data map describing a regression test of an UFS application-to-
+# physics suite build (i.e. rt_appsphys2test_df's columns). The remaining columns describe a data file.
+TEST_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Type', 'Test Name', 'Test Info', 'CNTL Folder', 'FV3 File', 'Parm File']
+
+
+class CompactMap():
+    """
+    Compact, interned form of the merged UFS application-to-regression test-to-data map
+    (e.g. ufs_app2test2data_df).
+
+    Each string column is interned into a table of its unique values & an integer code array.
+    The map's rows are split into a table of unique tests, a table of unique data files & a
+    CSR adjacency of each test to its file IDs, so a value is stored once per test or file
+    rather than once per (test, file) row.
+
+    """
+    def __init__(self, columns, tables, test_codes, file_codes, indptr, indices):
+
+        # Column order & per column: 'level' ('test', 'file'), 'kind' ('codes' for interned
+        # values, 'json' for interned nested values, 'values' for numeric values) & 'dtype'.
+        self.columns = columns
+
+        # Unique values per interned column.
+        self.tables = tables
+
+        # Per column, the code (or value) of each unique test & each unique file.
+        self.test_codes = test_codes
+        self.file_codes = file_codes
+
+        # CSR adjacency of each test to its files: the file IDs of test i are
+        # indices[indptr[i]:indptr[i + 1]].
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+    @property
+    def n_tests(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_files(self):
+        return len(next(iter(self.file_codes.values()))) if self.file_codes else int(self.indices.max(initial=-1)) + 1
+
+    @property
+    def nbytes(self):
+        """
+        Total size (Bytes) of the compact map's arrays.
+
+        """
+        arrays = list(self.tables.values()) + list(self.test_codes.values()) + list(self.file_codes.values())
+
+        return sum(arr.nbytes for arr in arrays) + self.indptr.nbytes + self.indices.nbytes
+
+    @staticmethod
+    def encode_column(values):
+        """
+        Intern a column's values.
+
+        Args:
+            values (pd.Series): Column of the map.
+
+        Return (tuple): Kind of encoding ('codes', 'json', 'values'), table of unique values
+        (None for numeric columns) & the int32 codes (-1 for missing values) or numeric values.
+
+        """
+        if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+            return 'values', None, values.to_numpy()
+        kind = 'codes'
+        non_null = values.dropna()
+        if len(non_null) and isinstance(non_null.iloc[0], (dict, list, tuple)):
+            kind = 'json'
+            values = pd.Series([None if v is None or (isinstance(v, float) and v != v) else json.dumps(v) for v in values],
+                               dtype=object)
+        codes, uniques = pd.factorize(values)
+        table = np.asarray(list(uniques))
+        if table.dtype == object:
+            table = table.astype(str)
+
+        return kind, table, codes.astype(np.int32)
+
+    @classmethod
+    def from_dataframe(cls, df, test_columns=TEST_COLUMNS):
+        """
+        Build the compact map from the map's dataframe.
+
+        Args:
+            df (pd.DataFrame): Merged map (e.g. ufs_app2test2data_df).
+            test_columns (list): Columns describing a regression test. Columns absent from the map
+                                 are skipped. The remaining columns describe a data file.
+
+        Return (CompactMap): The compact map.
+
+        """
+        df = df.reset_index(drop=True)
+        columns = []
+        tables = {}
+        row_codes = {}
+        for col in df.columns:
+            kind, table, codes = cls.encode_column(df[col])
+            columns.append({'name': col,
+                            'level': 'test' if col in test_columns else 'file',
+                            'kind': kind,
+                            'dtype': str(df[col].dtype)})
+            if table is not None:
+                tables[col] = table
+            row_codes[col] = codes
+
+        # Identify each row's unique test & unique file by its test & file columns, in order of
+        # first occurrence.
+        test_cols = [c['name'] for c in columns if c['level'] == 'test']
+        file_cols = [c['name'] for c in columns if c['level'] == 'file']
+        codes_df = pd.DataFrame(row_codes)
+        test_ids = codes_df.groupby(test_cols, sort=False, dropna=False).ngroup().to_numpy() if test_cols else np.zeros(len(df), dtype=np.int64)
+        file_ids = codes_df.groupby(file_cols, sort=False, dropna=False).ngroup().to_numpy() if file_cols else np.zeros(len(df), dtype=np.int64)
+        first_test_rows = np.unique(test_ids, return_index=True)[1]
+        first_file_rows = np.unique(file_ids, return_index=True)[1]
+        test_codes = {col: row_codes[col][first_test_rows] for col in test_cols}
+        file_codes = {col: row_codes[col][first_file_rows] for col in file_cols}
+
+        # CSR adjacency of each test to its files, keeping the rows' order w/in each test.
+        order = np.argsort(test_ids, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(test_ids, minlength=len(first_test_rows)))])
+
+        return cls(columns, tables, test_codes, file_codes, indptr, file_ids[order])
+
+    def decode_column(self, column, codes):
+        """
+        Restore a column's values from its codes.
+
+        Args:
+            column (dict): Column's name, level, kind & dtype.
+            codes (np.array): Codes (or numeric values) of the column.
+
+        Return (np.array, pd.Categorical): Column values. Missing values are restored as NaN.
+
+        """
+        if column['kind'] == 'values':
+            return codes
+        table = self.tables[column['name']]
+        if column['kind'] == 'json':
+            table = [json.loads(v) for v in table]
+        uniques = np.empty(len(table) + 1, dtype=object)
+        uniques[:-1] = list(table)
+        uniques[-1] = np.nan
+        if column['dtype'] == 'category':
+            return pd.Categorical.from_codes(codes, categories=uniques[:-1])
+
+        return uniques[codes]
+
+    def to_dataframe(self, columns=None):
+        """
+        Restore the map's dataframe, one row per (test, file) pair.
+
+        Args:
+            columns (list): Columns to restore. Default restores all columns.
+
+        Return (pd.DataFrame): Merged map, w/ each test's rows grouped together.
+
+        """
+        row_tests = np.repeat(np.arange(self.n_tests), np.diff(self.indptr))
+        data = {}
+        for column in self.columns:
+            col = column['name']
+            if columns is not None and col not in columns:
+                continue
+            if column['level'] == 'test':
+                data[col] = self.decode_column(column, self.test_codes[col][row_tests])
+            else:
+                data[col] = self.decode_column(column, self.file_codes[col][self.indices])
+
+        return pd.DataFrame(data, columns=[c['name'] for c in self.columns if columns is None or c['name'] in columns])
+
+    def get_table(self, level):
+        """
+        Decode the table of unique tests or unique files.
+
+        Args:
+            level (str): 'test' or 'file'.
+
+        Return (pd.DataFrame): One row per unique test (or file), indexed by its ID.
+
+        """
+        codes = self.test_codes if level == 'test' else self.file_codes
+
+        return pd.DataFrame({c['name']: self.decode_column(c, codes[c['name']]) for c in self.columns if c['level'] == level})
+
+    def get_ids(self, col, value):
+        """
+        Locate the tests (or files) whose column holds a value.
+
+        Args:
+            col (str): Column of the map (e.g. 'UFS_App', 'Filename').
+            value (str, float): Value to locate (e.g. 'ATM').
+
+        Return (np.array): IDs of the matching tests (for test columns) or files (for file columns).
+
+        """
+        column = next(c for c in self.columns if c['name'] == col)
+        codes = self.test_codes[col] if column['level'] == 'test' else self.file_codes[col]
+        if column['kind'] == 'values':
+            return np.flatnonzero(codes == value)
+        matches = np.flatnonzero(self.tables[col] == value)
+
+        return np.flatnonzero(codes == matches[0]) if len(matches) else np.empty(0, dtype=np.int64)
+
+    def get_file_ids(self, test_ids):
+        """
+        Unique files of a set of tests.
+
+        Args:
+            test_ids (list, np.array): IDs of the tests.
+
+        Return (np.array): Sorted unique file IDs.
+
+        """
+        return np.unique(np.concatenate([self.indices[self.indptr[t]:self.indptr[t + 1]] for t in test_ids] or [np.empty(0, dtype=np.int32)]))
+
+    def save(self, fn):
+        """
+        Save the compact map as a compressed NumPy archive, which loads w/o unpickling.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (str): Path of the saved file.
+
+        """
+        arrays = {'columns': np.array(json.dumps(self.columns)), 'indptr': self.indptr, 'indices': self.indices}
+        arrays.update({f'table/{col}': table for col, table in self.tables.items()})
+        arrays.update({f'test/{col}': codes for col, codes in self.test_codes.items()})
+        arrays.update({f'file/{col}': codes for col, codes in self.file_codes.items()})
+        np.savez_compressed(fn, **arrays)
+
+        return fn + '.npz'
+
+    @classmethod
+    def read(cls, fn):
+        """
+        Read a compact map saved via 'save()'.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (CompactMap): The compact map.
+
+        """
+        tables, test_codes, file_codes = {}, {}, {}
+        with np.load(fn + '.npz', allow_pickle=False) as data:
+            columns = json.loads(str(data['columns']))
+            for key in data.files:
+                prefix, _, col = key.partition('/')
+                if prefix == 'table':
+                    tables[col] = data[key]
+                elif prefix == 'test':
+                    test_codes[col] = data[key]
+                elif prefix == 'file':
+                    file_codes[col] = data[key]
+
+            return cls(columns, tables, test_codes, file_codes, data['indptr'], data['indices'])
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Pairwise statistics of two consumers' (e.g. UFS applications') file sets.
+PAIRWISE_STATS = ['Intersection Files', 'Intersection (Bytes)', 'Union Files', 'Union (Bytes)', 'Jaccard', 'Jaccard (Bytes)']
+
+
+class DataOverlap():
+    """
+    Vectorized set algebra over the data files shared by UFS applications, physics suites,
+    test types, tests or CNTL folders (i.e. the consumers of the files).
+
+    Each grouping's consumers are rows of a sparse boolean consumer-to-file incidence matrix, so
+    all pairwise intersections are a single sparse matrix product.
+
+    """
+    def __init__(self, compact_map):
+
+        # Compact app-to-test-to-data map.
+        self.compact_map = compact_map
+
+        # Files are identified by their relative directory & filename.
+        file_df = compact_map.get_table('file')
+        rel_paths = file_df['Relative Directory'].astype(str) + '/' + file_df['Filename'].astype(str)
+        file_ids, self.rel_paths = pd.factorize(rel_paths)
+        self.file_sizes = np.zeros(len(self.rel_paths), dtype=np.int64)
+        self.file_sizes[file_ids] = file_df['Size (Bytes)'].to_numpy(dtype=np.int64)
+
+        # Sparse test-to-file incidence matrix.
+        n_tests = compact_map.n_tests
+        data = np.ones(len(compact_map.indices), dtype=np.int8)
+        self.test2file = sparse.csr_matrix((data, file_ids[compact_map.indices], compact_map.indptr),
+                                           shape=(n_tests, len(self.rel_paths)))
+        self.test2file.sum_duplicates()
+        self.test2file.data[:] = 1
+
+        # Memoized consumer labels & consumer-to-file incidence matrices per grouping.
+        self.incidences = {}
+
+    def get_incidence(self, by):
+        """
+        Generate the consumer-to-file incidence matrix of a grouping.
+
+        Args:
+            by (str): Test column grouping the files' consumers (e.g. 'UFS_App', 'Physics_Suite', 'Test Name').
+
+        Return (tuple): Consumer labels & sparse boolean (as int8) consumer-to-file incidence matrix.
+
+        """
+        if by not in self.incidences:
+            column = next(c for c in self.compact_map.columns if c['name'] == by)
+            codes = self.compact_map.test_codes[by]
+            labels = self.compact_map.tables[by]
+            if column['kind'] == 'values':
+                codes, labels = pd.factorize(codes)
+                labels = np.asarray(labels)
+
+            # Tests w/o a value (code -1) belong to no consumer.
+            tests = np.flatnonzero(codes >= 0)
+            test2consumer = sparse.csr_matrix((np.ones(len(tests), dtype=np.int8), (codes[tests], tests)),
+                                              shape=(len(labels), self.compact_map.n_tests))
+            incidence = (test2consumer @ self.test2file).tocsr()
+            incidence.data = np.ones(len(incidence.data), dtype=np.int8)
+            self.incidences[by] = (pd.Index(labels, name=by), incidence)
+
+        return self.incidences[by]
+
+    def pairwise(self, by):
+        """
+        Compare the file sets of each pair of consumers.
+
+        Args:
+            by (str): Test column grouping the files' consumers (e.g. 'UFS_App').
+
+        Return (pd.DataFrame): Number of files & total size (Bytes) of the intersection & union
+        of each pair's file sets, & their Jaccard indexes by files & by bytes, indexed by the pair.
+
+        """
+        labels, incidence = self.get_incidence(by)
+        counts = incidence.astype(np.int64)
+        inter_files = (counts @ counts.T).toarray()
+        inter_bytes = (counts.multiply(self.file_sizes[np.newaxis, :]).tocsr() @ counts.T).toarray()
+        files = np.diag(inter_files)
+        sizes = np.diag(inter_bytes)
+        union_files = files[:, np.newaxis] + files[np.newaxis, :] - inter_files
+        union_bytes = sizes[:, np.newaxis] + sizes[np.newaxis, :] - inter_bytes
+        with np.errstate(divide='ignore', invalid='ignore'):
+            jaccard = np.where(union_files > 0, inter_files / union_files, 0.0)
+            jaccard_bytes = np.where(union_bytes > 0, inter_bytes / union_bytes, 0.0)
+
+        index = pd.MultiIndex.from_product([labels, labels], names=[f'{by} A', f'{by} B'])
+        stats = [inter_files, inter_bytes, union_files, union_bytes, jaccard, jaccard_bytes]
+
+        return pd.DataFrame({stat: arr.ravel() for stat, arr in zip(PAIRWISE_STATS, stats)}, index=index)
+
+    def matrix(self, by, stat='Jaccard'):
+        """
+        Pairwise statistic of the consumers as a square matrix.
+
+        Args:
+            by (str): Test column grouping the files' consumers (e.g. 'UFS_App').
+            stat (str): One of PAIRWISE_STATS.
+
+        Return (pd.DataFrame): Consumers by consumers.
+
+        """
+        return self.pairwise(by)[stat].unstack()
+
+    def unique_files(self, by):
+        """
+        Files used by one consumer only.
+
+        Args:
+            by (str): Test column grouping the files' consumers (e.g. 'UFS_App').
+
+        Return (pd.DataFrame): Per consumer, its number of files & total size (Bytes), & the
+        number & total size (Bytes) of the files no other consumer uses.
+
+        """
+        labels, incidence = self.get_incidence(by)
+        counts = incidence.astype(np.int64)
+        is_unique = (np.asarray(counts.sum(axis=0)).ravel() == 1).astype(np.int64)
+
+        return pd.DataFrame({'Files': np.asarray(counts.sum(axis=1)).ravel(),
+                             'Size (Bytes)': counts @ self.file_sizes,
+                             'Unique Files': counts @ is_unique,
+                             'Unique (Bytes)': counts @ (is_unique * self.file_sizes)}, index=labels)
+
+    def get_files(self, by, consumers, mode='shared'):
+        """
+        Files shared by (or unique to) a set of consumers.
+
+        Args:
+            by (str): Test column grouping the files' consumers (e.g. 'UFS_App').
+            consumers (list): Consumers (e.g. ['ATM', 'S2S']).
+            mode (str): 'shared' for the files used by all of the consumers, 'any' for the files
+                        used by any of them & 'unique' for the files used by them but no other consumer.
+
+        Return (pd.DataFrame): Relative path & size (Bytes) of the files, sorted by relative path.
+
+        """
+        labels, incidence = self.get_incidence(by)
+        rows = labels.get_indexer(consumers)
+        if (rows < 0).any():
+            raise KeyError(f'Unknown {by}: {[c for c, r in zip(consumers, rows) if r < 0]}')
+        selected = np.asarray(incidence[rows].sum(axis=0)).ravel()
+        if mode == 'shared':
+            mask = selected == len(rows)
+        elif mode == 'any':
+            mask = selected > 0
+        else:
+            mask = (selected > 0) & (selected == np.asarray(incidence.sum(axis=0)).ravel())
+        ids = np.flatnonzero(mask)
+        files_df = pd.DataFrame({'Relative Path': np.asarray(self.rel_paths)[ids], 'Size (Bytes)': self.file_sizes[ids]})
+
+        return files_df.sort_values('Relative Path', ignore_index=True)
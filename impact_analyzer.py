@@ -0,0 +1,198 @@
+import os
+import fnmatch
+import numpy as np
+import pandas as pd
+from var_expander import VAR_PATTERN
+
+# Columns of the impacted tests' rows.
+IMPACT_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Type', 'Test Name', 'CNTL Folder']
+
+# Folders of the ufs-weather-model repo's RT framework referencing config. files by name.
+CONFIG_FOLDERS = frozenset(['fv3_conf', 'parm'])
+
+# Changed paths impacting no regression test (e.g. documentation).
+IGNORED_PATTERNS = ['*.md', '*.rst', 'doc/*', 'docs/*', 'LICENSE*', '.github/*', '.gitignore', 'tests/logs/*', 'tests/RegressionTests_*.log']
+
+# Variable values which are not filenames.
+NON_FILE_VALUES = frozenset(['', '.true.', '.false.', 'true', 'false'])
+
+
+class ImpactAnalyzer():
+    """
+    Reverse index of the ufs-weather-model repo's RT framework files (i.e. /tests, /fv3_conf &
+    /parm files) & data files to the regression tests depending on them, to determine the
+    tests impacted by a set of changed paths (e.g. 'git diff --name-only').
+
+    Each test depends on its /tests file, its 'FV3 File' & 'Parm File', & the config. files
+    named by its variables (e.g. 'DIAG_TABLE', 'MOM_INPUT'). Changed paths which can't be
+    resolved to specific tests (e.g. rt.sh, default_vars.sh, the model's source code or an
+    unreferenced /parm file) impact all tests.
+
+    """
+    def __init__(self, appsphys2test_df, var_expander=None, planner=None):
+
+        # Rows of each app-to-physics suite build's regression tests (i.e. rt_appsphys2test_df).
+        self.appsphys2test_df = appsphys2test_df.reset_index(drop=True)
+        self.test_ids, self.test_names = pd.factorize(self.appsphys2test_df['Test Name'])
+        self.test_rows = self.appsphys2test_df.groupby(self.test_ids, sort=True).indices
+
+        # Optional VarExpander, layering the 'default_vars.sh' variables under each test's own
+        # variables, & optional StagingPlanner, indexing the input & baseline data files per test.
+        self.var_expander = var_expander
+        self.planner = planner
+
+        # Test IDs per /tests filename & per config. filename (or filename pattern of the
+        # variables which remain unresolved, e.g. 'MOM_input_template_*').
+        self.test_index = {test_name: np.array([test_id]) for test_id, test_name in enumerate(self.test_names)}
+        config_index = {}
+        first_rows = self.appsphys2test_df.drop_duplicates('Test Name')
+        for test_id, (_, row) in enumerate(first_rows.iterrows()):
+            for fn in self.get_config_fns(row):
+                config_index.setdefault(fn, set()).add(test_id)
+        self.config_index = {fn: np.array(sorted(test_ids)) for fn, test_ids in config_index.items() if '*' not in fn}
+        self.config_patterns = {fn: np.array(sorted(test_ids)) for fn, test_ids in config_index.items() if '*' in fn}
+
+        # Column of the planner's test bitmaps per data file, if any.
+        self.planner_files = {}
+        self.planner_tests = np.empty(0, dtype=np.int64)
+        if planner is not None:
+            self.planner_files = {path: idx for idx, path in enumerate(planner.file_paths)}
+            self.planner_tests = self.test_names.get_indexer(planner.test_names)
+
+    def get_config_fns(self, row):
+        """
+        Config. filenames referenced by a regression test.
+
+        Args:
+            row (pd.Series): A row of the test (w/ its 'Test Info', 'FV3 File' & 'Parm File').
+
+        Return (set): Config. filenames, w/ unresolved variables replaced by '*'.
+
+        """
+        test_params = row['Test Info'] if isinstance(row['Test Info'], dict) else {}
+        if self.var_expander is not None:
+            env = self.var_expander.get_test_env(row['Test Name'], test_params)
+            values = [self.var_expander.resolve_var(row['Test Name'], var) for var in env]
+        else:
+            values = [val for var, val in test_params.items() if var != 'Test Info' and isinstance(val, str)]
+        values += [row['FV3 File'], row['Parm File']]
+
+        config_fns = set()
+        for val in values:
+            if not isinstance(val, str):
+                continue
+            val = val.strip().strip('"\'')
+            if val in NON_FILE_VALUES or any(char in val for char in ' `()'):
+                continue
+            if self.var_expander is not None:
+                unresolved = self.var_expander.get_unresolved_vars(val)
+            else:
+                unresolved = {val} if '$' in val or '@[' in val else set()
+            if unresolved:
+                # Patterns w/o a literal leading part (e.g. '${SUFFIX}.nc') would match unrelated files.
+                val = VAR_PATTERN.sub('*', val)
+                if os.path.basename(val).startswith('*'):
+                    continue
+            config_fns.add(os.path.basename(val))
+
+        return config_fns
+
+    def get_planner_tests(self, path):
+        """
+        Regression tests requiring a data file, per the staging planner's bitmaps.
+
+        Args:
+            path (str): Relative path of the data file (e.g. 'input-data-20211210/FV3_input_data/INPUT/oro_data.tile1.nc').
+
+        Return (np.ndarray): Test IDs, or None if the file is not indexed.
+
+        """
+        if path not in self.planner_files:
+            return None
+        idx = self.planner_files[path]
+        bits = (self.planner.test_bitmaps[:, idx >> 3] >> (7 - (idx & 7))) & 1
+        test_ids = self.planner_tests[np.flatnonzero(bits)]
+
+        return test_ids[test_ids >= 0]
+
+    def resolve_path(self, path):
+        """
+        Resolve a changed path to the regression tests it impacts.
+
+        Args:
+            path (str): Path relative to the repo (e.g. 'tests/parm/control.nml.IN'), or to the
+                        data roots (e.g. 'input-data-20211210/...') if a planner is given.
+
+        Return (tuple): Test IDs (None for all tests) & the reason (i.e. 'ignored', 'test',
+        'config', 'data', 'unreferenced' or 'global').
+
+        """
+        path = path.strip()
+        while path.startswith('./'):
+            path = path[2:]
+        path = path.lstrip('/')
+        parts = path.split('/')
+        fn = parts[-1]
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            return np.empty(0, dtype=np.int64), 'ignored'
+
+        # New /tests files impact no test until listed in rt.conf, which is then changed too.
+        if len(parts) == 3 and parts[:2] == ['tests', 'tests']:
+            return (self.test_index[fn], 'test') if fn in self.test_index else (np.empty(0, dtype=np.int64), 'unreferenced')
+        if len(parts) >= 3 and parts[0] == 'tests' and parts[1] in CONFIG_FOLDERS:
+            matched = [self.config_index[fn]] if fn in self.config_index else []
+            matched += [test_ids for pattern, test_ids in self.config_patterns.items() if fnmatch.fnmatchcase(fn, pattern)]
+            if matched:
+                return np.unique(np.concatenate(matched)), 'config'
+            return None, 'unreferenced'
+        planner_tests = self.get_planner_tests(path) if self.planner is not None else None
+        if planner_tests is not None:
+            return planner_tests, 'data'
+
+        return None, 'global'
+
+    def get_impacted_rows(self, changed_paths):
+        """
+        Rows of the regression tests impacted by a set of changed paths.
+
+        Args:
+            changed_paths (list): Changed paths (e.g. 'git diff --name-only' output).
+
+        Return (tuple): Impacted tests' rows (pd.DataFrame) & the number of tests impacted by
+        & the reason per changed path (dict).
+
+        """
+        matched, per_path = [], {}
+        n_tests = len(self.test_names)
+        for path in changed_paths:
+            if not path.strip():
+                continue
+            test_ids, reason = self.resolve_path(path)
+            test_ids = np.arange(n_tests) if test_ids is None else test_ids
+            matched.append(test_ids)
+            per_path[path.strip()] = {'Tests': len(test_ids), 'Reason': reason}
+        test_ids = np.unique(np.concatenate(matched)) if matched else np.empty(0, dtype=np.int64)
+        rows = np.sort(np.concatenate([self.test_rows[test_id] for test_id in test_ids])) if len(test_ids) else test_ids
+
+        return self.appsphys2test_df.iloc[rows][IMPACT_COLUMNS].reset_index(drop=True), per_path
+
+    def analyze(self, changed_paths):
+        """
+        Regression tests, app-to-physics suite builds & baseline CNTL folders impacted by a set
+        of changed paths.
+
+        Args:
+            changed_paths (list): Changed paths (e.g. 'git diff --name-only' output).
+
+        Return (dict): Sorted unique impacted tests ('tests'), app/physics suite builds as
+        'APP:SUITE' ('combos'), CNTL folders ('cntl_folders') & the number of tests impacted by
+        & the reason per changed path ('paths').
+
+        """
+        impacted_df, per_path = self.get_impacted_rows(changed_paths)
+        combos = impacted_df['UFS_App'].astype(str) + ':' + impacted_df['Physics_Suite'].astype(str)
+
+        return {'tests': sorted(impacted_df['Test Name'].unique()),
+                'combos': sorted(combos.unique()),
+                'cntl_folders': sorted(impacted_df['CNTL Folder'].dropna().unique()),
+                'paths': per_path}
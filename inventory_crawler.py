@@ -0,0 +1,290 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from map_storage import MapStorage, FORMAT_EXT
+
+# Dated folder of a baseline or input data root (e.g. 'develop-20220329', 'input-data-20211210').
+DATE_FOLDER_PATTERN = re.compile(r'(?:^|-)(\d{8})$')
+
+# Number of folder levels (i.e. Node0, Node1, ...) of the relative directories.
+MAX_NODES = 8
+NODE_COLUMNS = [f'Node{idx}' for idx in range(MAX_NODES)]
+
+# Columns of the inventory per kind of data root.
+INVENTORY_COLUMNS = {'baseline': ['CNTL Folder', 'Date', 'Compiler', 'Relative Directory', 'Filename', 'Size (Bytes)',
+                                  'Size (GB)', 'DataType', 'Nodes Relative to Main'] + NODE_COLUMNS,
+                     'input': ['Date', 'UFS Component', 'input_or_restart', 'Root Folder', 'Relative Directory', 'Filename',
+                               'Size (Bytes)', 'Size (GB)', 'DataType', 'Nodes Relative to Main'] + NODE_COLUMNS}
+
+# Data type per file extension, where the ufs-data-analytics-tool's label differs from the extension.
+DATA_TYPES = {'grb': 'grib',
+              'a': '32-bit IEEE data',
+              'b': 'plain text metadata',
+              'BIN': 'binary',
+              'sh': 'shell',
+              'TBL': 'table'}
+
+
+class InventoryCrawler():
+    """
+    Crawls a baseline or input data root (e.g. a local or mounted copy of the RT baselines or
+    INPUTDATA_ROOT) into its file inventory (i.e. baseline_df, input_df).
+
+    Directories are scanned w/ os.scandir across a thread pool, so the many stat calls of a
+    parallel filesystem overlap & the crawl is bound by the filesystem's latency. Rows are
+    assembled per directory & streamed in batches.
+
+    """
+    def __init__(self, root, kind='baseline', workers=32, max_depth=None, dates=None, batch_size=100000, components=None):
+
+        # Data root & its kind. Options: 'baseline' (i.e. <root>/develop-<date>/<compiler>/<CNTL folder>/...),
+        # 'input' (i.e. <root>/input-data-<date>/<root folder>/...). The root may also be a dated folder itself.
+        if kind not in INVENTORY_COLUMNS:
+            raise ValueError(f"Unknown inventory kind '{kind}'. Options: {list(INVENTORY_COLUMNS)}")
+        self.root = os.path.abspath(root)
+        self.kind = kind
+
+        # Relative directories start at the dated folder, so a dated root prefixes its own name.
+        root_name = os.path.basename(self.root)
+        self.prefix = root_name if DATE_FOLDER_PATTERN.search(root_name) else ''
+
+        # Number of threads scanning directories.
+        self.workers = workers
+
+        # Max depth of the scanned directories below the root (None for no limit) & the dates
+        # (e.g. ['20220329']) of the dated folders to crawl (None for all folders).
+        self.max_depth = max_depth
+        self.dates = set(dates) if dates is not None else None
+
+        # Rows per streamed batch.
+        self.batch_size = batch_size
+
+        # UFS component per input root folder (e.g. {'FV3_input_data': 'FV3'}). Root folders w/o
+        # a component default to their uppercased prefix (e.g. 'MOM6_IC' -> 'MOM6').
+        self.components = components or {}
+
+        # Number of directories & files crawled, & the directories which could not be scanned.
+        self.n_dirs = 0
+        self.n_files = 0
+        self.errors = []
+
+    def get_date(self, folder):
+        """
+        Date of a dated folder.
+
+        Args:
+            folder (str): Folder name (e.g. 'develop-20220329').
+
+        Return (str): Date (e.g. '20220329'), or None if the folder is not dated.
+
+        """
+        match = DATE_FOLDER_PATTERN.search(folder)
+
+        return match.group(1) if match else None
+
+    def is_selected(self, rel_dir, depth):
+        """
+        Whether a directory is crawled, per the depth & date filters.
+
+        Args:
+            rel_dir (str): Directory relative to the data root's parent (e.g. 'develop-20220329/INTEL').
+            depth (int): Depth below the root.
+
+        Return (bool): Whether the directory is crawled.
+
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if self.dates is not None and '/' not in rel_dir:
+            return self.get_date(rel_dir) in self.dates
+
+        return True
+
+    def scan_dir(self, path, rel_dir, depth):
+        """
+        Scan a directory's files & subdirectories. Symlinked files are listed at their target's
+        size, while symlinked directories are not followed.
+
+        Args:
+            path (str): Directory path.
+            rel_dir (str): Directory relative to the data root's parent.
+            depth (int): Depth below the root.
+
+        Return (tuple): Path, relative directory, depth, filenames, sizes (Bytes) & subdirectories.
+
+        """
+        names, sizes, subdirs = [], [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            sizes.append(entry.stat().st_size)
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as err:
+            self.errors.append((path, str(err)))
+
+        return path, rel_dir, depth, names, sizes, subdirs
+
+    def get_dir_rows(self, rel_dirs):
+        """
+        Generate the columns shared by the files of each directory.
+
+        Args:
+            rel_dirs (list): Directories relative to the data root's parent.
+
+        Return (pd.DataFrame): Per directory, its date, nodes & the kind's folder columns.
+
+        """
+        rows = []
+        for rel_dir in rel_dirs:
+            nodes = rel_dir.split('/') if rel_dir else []
+            row = dict(zip(NODE_COLUMNS, nodes))
+            row['Relative Directory'] = rel_dir
+            row['Nodes Relative to Main'] = len(nodes)
+            row['Date'] = self.get_date(nodes[0]) if nodes else None
+            if self.kind == 'baseline':
+                row['Compiler'] = nodes[1] if len(nodes) > 1 else None
+                row['CNTL Folder'] = nodes[2] if len(nodes) > 2 else None
+            else:
+                root_folder = nodes[1] if len(nodes) > 1 else None
+                row['Root Folder'] = root_folder
+                row['UFS Component'] = (self.components.get(root_folder, root_folder.split('_')[0].upper())
+                                        if root_folder else None)
+                row['input_or_restart'] = 'restart' if 'RESTART' in nodes else 'input'
+            rows.append(row)
+
+        return pd.DataFrame(rows, columns=[col for col in INVENTORY_COLUMNS[self.kind]
+                                           if col not in ('Filename', 'Size (Bytes)', 'Size (GB)', 'DataType')])
+
+    def to_batch(self, rel_dirs, counts, names, sizes):
+        """
+        Assemble a batch of rows, repeating each directory's columns over its files.
+
+        Args:
+            rel_dirs (list): Directories relative to the data root's parent.
+            counts (list): Number of files per directory.
+            names (list): Filenames.
+            sizes (list): File sizes (Bytes).
+
+        Return (pd.DataFrame): Inventory rows.
+
+        """
+        dir_df = self.get_dir_rows(rel_dirs)
+        batch_df = dir_df.iloc[np.repeat(np.arange(len(rel_dirs)), counts)].reset_index(drop=True)
+        batch_df['Filename'] = pd.Series(names, dtype=str)
+        batch_df['Size (Bytes)'] = np.asarray(sizes, dtype=np.int64)
+        batch_df['Size (GB)'] = (batch_df['Size (Bytes)'] / 1e9).round(1)
+        exts = batch_df['Filename'].str.extract(r'\.([^.]+)$', expand=False)
+        batch_df['DataType'] = exts.replace(DATA_TYPES)
+
+        return batch_df[INVENTORY_COLUMNS[self.kind]]
+
+    def crawl(self):
+        """
+        Crawl the data root.
+
+        Args:
+            None
+
+        Return (generator): Inventory rows in batches of ~'batch_size' rows (pd.DataFrame). Batches
+        are in the order the directories are scanned.
+
+        """
+        self.n_dirs, self.n_files, self.errors = 0, 0, []
+        if self.prefix and not self.is_selected(self.prefix, 0):
+            return
+        rel_dirs, counts, names, sizes = [], [], [], []
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            pending = {pool.submit(self.scan_dir, self.root, self.prefix, 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, rel_dir, depth, dir_names, dir_sizes, subdirs = future.result()
+                    self.n_dirs += 1
+                    for subdir in subdirs:
+                        sub_rel_dir = f'{rel_dir}/{subdir}' if rel_dir else subdir
+                        if self.is_selected(sub_rel_dir, depth + 1):
+                            pending.add(pool.submit(self.scan_dir, os.path.join(path, subdir), sub_rel_dir, depth + 1))
+
+                    # Files outside of a dated folder are skipped if filtering by date.
+                    if not dir_names or (self.dates is not None and not rel_dir):
+                        continue
+                    rel_dirs.append(rel_dir)
+                    counts.append(len(dir_names))
+                    names += dir_names
+                    sizes += dir_sizes
+                    if len(names) >= self.batch_size:
+                        self.n_files += len(names)
+                        yield self.to_batch(rel_dirs, counts, names, sizes)
+                        rel_dirs, counts, names, sizes = [], [], [], []
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if names:
+            self.n_files += len(names)
+            yield self.to_batch(rel_dirs, counts, names, sizes)
+
+    def get_inventory(self):
+        """
+        Crawl the data root into a single table.
+
+        Args:
+            None
+
+        Return (pd.DataFrame): Inventory sorted by relative directory & filename.
+
+        """
+        batches = list(self.crawl())
+        if not batches:
+            return self.to_batch([], [], [], [])
+        inventory_df = pd.concat(batches, ignore_index=True)
+
+        return inventory_df.sort_values(['Relative Directory', 'Filename'], ignore_index=True)
+
+    def get_schema(self):
+        """
+        Arrow schema of the inventory, fixed across batches.
+
+        """
+        import pyarrow as pa
+
+        types = {'Size (Bytes)': pa.int64(), 'Size (GB)': pa.float64(), 'Nodes Relative to Main': pa.int64()}
+
+        return pa.schema([(col, types.get(col, pa.string())) for col in INVENTORY_COLUMNS[self.kind]])
+
+    def save(self, fn, storage=None):
+        """
+        Crawl the data root into the columnar map format, streaming each batch to a Parquet
+        row group so that the inventory is never held in memory in full.
+
+        Args:
+            fn (str): Filename excluding the format's extension.
+            storage (MapStorage): Storage of the inventory. Default saves as Parquet. Formats
+                                  other than Parquet, & Parquet w/o pyarrow installed (i.e. the
+                                  storage's pickle fallback), are saved from the full inventory.
+
+        Return (str): Path of the saved file.
+
+        """
+        storage = storage or MapStorage()
+        if storage.fmt != 'parquet' or not storage.has_arrow:
+            return storage.save(self.get_inventory(), fn)
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self.get_schema()
+        path = fn + FORMAT_EXT['parquet']
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch_df in self.crawl():
+                writer.write_table(pa.Table.from_pandas(batch_df, schema=schema, preserve_index=False),
+                                   row_group_size=storage.row_group_size)
+
+        return path
@@ -0,0 +1,232 @@
+import math
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+
+# Columns of the batch plan.
+BATCH_COLUMNS = ['Node', 'Position', 'Batch', 'Tests', 'Test Count', 'Files', 'Batch (Bytes)', 'Staged (Bytes)', 'Reused (Bytes)']
+
+
+class LocalityScheduler():
+    """
+    Schedules regression tests across nodes so that tests sharing input & baseline data files
+    run back to back on the same node, reusing the files already staged to its local disk.
+
+    Tests are grouped into batches whose files fit w/in a node's cache, by greedily adding the
+    test sharing the largest fraction of its bytes w/ the batch. Batches are then assigned to
+    the node whose previous batch they share the most bytes w/, while balancing the number of
+    tests per node. Bytes staged are simulated w/ an LRU cache per node, for both the plan &
+    the tests' original (e.g. rt.conf) order.
+
+    """
+    def __init__(self, planner, n_nodes=1, capacity=None):
+
+        # StagingPlanner w/ the per-test file bitmaps over the input & baseline data files.
+        self.planner = planner
+
+        # Number of nodes & Bytes each node's local cache holds (None for unlimited).
+        self.n_nodes = n_nodes
+        self.capacity = capacity
+
+        # Sizes (Bytes) of the files, counting files of unknown size as empty.
+        self.file_sizes = np.maximum(planner.file_sizes, 0)
+
+    def get_test_files(self, test_names):
+        """
+        CSR adjacency of the tests to their file IDs.
+
+        Args:
+            test_names (list): Regression test names.
+
+        Return (tuple): Row pointers & file IDs (np.ndarray).
+
+        """
+        n_files = len(self.planner.file_paths)
+        rows = [np.flatnonzero(np.unpackbits(self.planner.test_bitmaps[self.planner.test_rows[test_name]], count=n_files))
+                for test_name in test_names]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+
+        return indptr, np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+    def get_batches(self, test_names):
+        """
+        Group the tests into batches of tests sharing data files, w/ each batch's unique files
+        fitting w/in the cache capacity (unless a test alone exceeds it).
+
+        Args:
+            test_names (list): Regression test names.
+
+        Return (list): Positions w/in test_names of each batch's tests, starting w/ the batch
+        of the largest test.
+
+        """
+        indptr, file_ids = self.get_test_files(test_names)
+        n_tests = len(test_names)
+        # Tests w/o any files (e.g. whose sources are all unmatched) have no bytes.
+        test_ids = np.repeat(np.arange(n_tests), np.diff(indptr))
+        test_bytes = np.bincount(test_ids, weights=self.file_sizes[file_ids], minlength=n_tests)
+
+        # Inverted index of the files to the tests requiring them, to update each test's shared
+        # bytes w/ the batch as files are added.
+        order = np.argsort(file_ids, kind='stable')
+        file_tests = test_ids[order]
+        file_indptr = np.searchsorted(file_ids[order], np.arange(len(self.file_sizes) + 1))
+
+        capacity = np.inf if self.capacity is None else self.capacity
+        is_unassigned = np.ones(n_tests, dtype=bool)
+        batches = []
+        while is_unassigned.any():
+            in_batch = np.zeros(len(self.file_sizes), dtype=bool)
+            shared = np.zeros(n_tests)
+            batch, batch_bytes = [], 0
+            pick = int(np.argmax(np.where(is_unassigned, test_bytes, -1)))
+            while True:
+                batch.append(pick)
+                is_unassigned[pick] = False
+                new_ids = file_ids[indptr[pick]:indptr[pick + 1]]
+                new_ids = new_ids[~in_batch[new_ids]]
+                in_batch[new_ids] = True
+                batch_bytes += self.file_sizes[new_ids].sum()
+                starts, ends = file_indptr[new_ids], file_indptr[new_ids + 1]
+                counts = ends - starts
+                if counts.sum():
+                    positions = np.repeat(ends - counts.cumsum(), counts) + np.arange(counts.sum())
+                    np.add.at(shared, file_tests[positions], np.repeat(self.file_sizes[new_ids], counts))
+
+                # Next, the test sharing the largest fraction of its bytes w/ the batch which still fits.
+                is_candidate = is_unassigned & (shared > 0) & (batch_bytes + test_bytes - shared <= capacity)
+                if not is_candidate.any():
+                    break
+                score = np.where(is_candidate, shared / np.maximum(test_bytes, 1), -1)
+                pick = int(np.argmax(score))
+            batches.append(batch)
+
+        return batches
+
+    def simulate(self, node_tests, test_names):
+        """
+        Simulate the bytes staged to each node's LRU cache as it runs its tests in order.
+
+        Args:
+            node_tests (list): Positions w/in test_names of the tests run by each node, in order.
+            test_names (list): Regression test names.
+
+        Return (list): Per node, the Bytes staged for each of its tests.
+
+        """
+        indptr, file_ids = self.get_test_files(test_names)
+        capacity = np.inf if self.capacity is None else self.capacity
+        staged = []
+        for tests in node_tests:
+            cache, used, node_staged = OrderedDict(), 0, []
+            for test in tests:
+                test_staged = 0
+                for file_id, size in zip(file_ids[indptr[test]:indptr[test + 1]].tolist(),
+                                         self.file_sizes[file_ids[indptr[test]:indptr[test + 1]]].tolist()):
+                    if file_id in cache:
+                        cache.move_to_end(file_id)
+                    else:
+                        cache[file_id] = size
+                        used += size
+                        test_staged += size
+                while used > capacity and cache:
+                    used -= cache.popitem(last=False)[1]
+                node_staged.append(test_staged)
+            staged.append(node_staged)
+
+        return staged
+
+    def schedule(self, test_names):
+        """
+        Batch the tests & assign the batches to the nodes.
+
+        Args:
+            test_names (list): Regression test names.
+
+        Return (pd.DataFrame): Batch plan: per batch, its node, position on the node, tests,
+        number of files, unique Bytes & Bytes staged & reused from the node's cache.
+
+        """
+        test_names = list(dict.fromkeys(test_names))
+        indptr, file_ids = self.get_test_files(test_names)
+        batches = self.get_batches(test_names)
+
+        # Assign each batch to the node w/ the most bytes in common w/ its previous batch, among
+        # the nodes w/ room for the batch under an even split of the tests.
+        target = math.ceil(len(test_names) / self.n_nodes)
+        node_masks = np.zeros((self.n_nodes, len(self.file_sizes)), dtype=bool)
+        node_loads = np.zeros(self.n_nodes, dtype=np.int64)
+        node_batches = [[] for _ in range(self.n_nodes)]
+        for batch_idx, batch in enumerate(batches):
+            ids = np.unique(np.concatenate([file_ids[indptr[test]:indptr[test + 1]] for test in batch]))
+            has_room = node_loads + len(batch) <= target
+            eligible = np.flatnonzero(has_room) if has_room.any() else np.flatnonzero(node_loads == node_loads.min())
+            shared = (node_masks[eligible][:, ids] * self.file_sizes[ids]).sum(axis=1)
+            node = eligible[np.lexsort((node_loads[eligible], -shared))[0]]
+            node_batches[node].append(batch_idx)
+            node_loads[node] += len(batch)
+            node_masks[node] = False
+            node_masks[node, ids] = True
+
+        staged = self.simulate([[test for batch_idx in batch_idxs for test in batches[batch_idx]]
+                                for batch_idxs in node_batches], test_names)
+        rows = []
+        for node, batch_idxs in enumerate(node_batches):
+            node_staged = iter(staged[node])
+            for position, batch_idx in enumerate(batch_idxs):
+                batch = batches[batch_idx]
+                ids = np.unique(np.concatenate([file_ids[indptr[test]:indptr[test + 1]] for test in batch]))
+                batch_bytes = int(self.file_sizes[ids].sum())
+                batch_staged = int(sum(next(node_staged) for _ in batch))
+                rows.append({'Node': node, 'Position': position, 'Batch': batch_idx,
+                             'Tests': [test_names[test] for test in batch], 'Test Count': len(batch),
+                             'Files': len(ids), 'Batch (Bytes)': batch_bytes, 'Staged (Bytes)': batch_staged,
+                             'Reused (Bytes)': batch_bytes - batch_staged})
+
+        return pd.DataFrame(rows, columns=BATCH_COLUMNS)
+
+    def get_baseline_staged(self, test_names):
+        """
+        Bytes staged running the tests in their original order, each assigned to the next node
+        in turn (i.e. as rt.sh hands out the tests of rt.conf).
+
+        Args:
+            test_names (list): Regression test names, in their original order.
+
+        Return (int): Total Bytes staged across the nodes.
+
+        """
+        test_names = list(dict.fromkeys(test_names))
+        node_tests = [list(range(node, len(test_names), self.n_nodes)) for node in range(self.n_nodes)]
+
+        return int(sum(sum(node_staged) for node_staged in self.simulate(node_tests, test_names)))
+
+    def summarize(self, plan_df, baseline_order=None):
+        """
+        Summarize a batch plan.
+
+        Args:
+            plan_df (pd.DataFrame): Batch plan (i.e. 'schedule()' output).
+            baseline_order (list): Tests in their original (e.g. rt.conf) order, to compare the
+                                   Bytes staged against.
+
+        Return (dict): Number of nodes, cache capacity (Bytes), tests & batches, Bytes staged
+        per node & in total, & the Bytes staged in the original order & the reduction.
+
+        """
+        staged = int(plan_df['Staged (Bytes)'].sum())
+        per_node = plan_df.groupby('Node')[['Staged (Bytes)', 'Test Count']].sum().reindex(range(self.n_nodes), fill_value=0).astype(int)
+        summary = {'nodes': self.n_nodes,
+                   'capacity': self.capacity,
+                   'tests': int(plan_df['Test Count'].sum()),
+                   'batches': len(plan_df),
+                   'staged_bytes': staged,
+                   'node_staged_bytes': per_node['Staged (Bytes)'].tolist(),
+                   'node_tests': per_node['Test Count'].tolist()}
+        if baseline_order is not None:
+            baseline = self.get_baseline_staged(baseline_order)
+            summary['baseline_staged_bytes'] = baseline
+            summary['reduction'] = round(1 - staged / baseline, 4) if baseline else 0.0
+
+        return summary
@@ -0,0 +1,439 @@
+import json
+import numpy as np
+import pandas as pd
+from inventory_crawler import DATE_FOLDER_PATTERN
+
+# Key of a row of the app-to-test-to-data map across commits. Data files are keyed by their dataset
+# (i.e. the dated root folder w/o its date, e.g. 'develop', 'input-data') & their path w/in it, so
+# a file is tracked across baseline dates.
+KEY_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Name', 'Dataset', 'Relative Path']
+
+# Attributes tracked per key. A change of any of them is recorded as a delta.
+VALUE_COLUMNS = ['Test Type', 'CNTL Folder', 'Size (Bytes)']
+
+# Commits between full snapshots of the state, bounding the deltas replayed per query.
+CHECKPOINT_INTERVAL = 64
+
+
+class MapHistory():
+    """
+    Versioned history of the UFS application-to-regression test-to-data map (e.g. ufs_app2test2data_df)
+    across ufs-weather-model commits.
+
+    The first commit is stored as a base snapshot & each later commit as the delta of its added,
+    removed & changed keys, w/ a full snapshot every 'checkpoint_interval' commits. Keys & values
+    are interned into integer IDs, so the state at a commit is the replay of the deltas since the
+    nearest snapshot onto an integer array & no commit's map is materialized unless requested.
+
+    """
+    def __init__(self, checkpoint_interval=CHECKPOINT_INTERVAL):
+
+        # Commit IDs (e.g. ufs-weather-model hashes) in ingestion order & per commit, its dated
+        # root folder per dataset (e.g. {'develop': 'develop-20220329'}) & user metadata.
+        self.commits = []
+        self.commit_info = []
+
+        # Unique values per interned key & value column, & per column, the code of each value.
+        self.tables = {col: [] for col in KEY_COLUMNS + VALUE_COLUMNS[:2]}
+        self.lookups = {col: {} for col in self.tables}
+
+        # Per key ID, its code per key column, & per value ID, its codes & size (Bytes).
+        self.key_codes = np.empty((0, len(KEY_COLUMNS)), dtype=np.int32)
+        self.value_codes = np.empty((0, len(VALUE_COLUMNS)), dtype=np.int64)
+        self.key_ids = {}
+        self.value_ids = {}
+
+        # Deltas of each commit: the deltas of commit i are rows delta_indptr[i]:delta_indptr[i + 1]
+        # of the (key ID, value ID) arrays. Removed keys have value ID -1.
+        self.delta_indptr = np.zeros(1, dtype=np.int64)
+        self.delta_keys = np.empty(0, dtype=np.int32)
+        self.delta_values = np.empty(0, dtype=np.int32)
+
+        # Full state (value ID per key ID, -1 if absent) per checkpointed commit index.
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}
+        self.head_state = np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.commits)
+
+    def intern(self, col, values):
+        """
+        Intern a column's values, appending new values to the column's table.
+
+        Args:
+            col (str): Interned column.
+            values (pd.Series): Values of the column.
+
+        Return (np.ndarray): Code per value.
+
+        """
+        local_codes, uniques = pd.factorize(values.astype(str))
+        table, lookup = self.tables[col], self.lookups[col]
+        global_codes = []
+        for value in uniques:
+            if value not in lookup:
+                lookup[value] = len(table)
+                table.append(value)
+            global_codes.append(lookup[value])
+
+        return np.asarray(global_codes, dtype=np.int64)[local_codes]
+
+    def get_commit_idx(self, commit):
+        """
+        Index of a commit.
+
+        Args:
+            commit (str, int): Commit ID, or index (negative indexes count from the latest commit).
+
+        Return (int): Commit index.
+
+        """
+        if isinstance(commit, (int, np.integer)):
+            return range(len(self.commits))[commit]
+        if commit not in self.commits:
+            raise KeyError(f'Unknown commit: {commit}')
+
+        return self.commits.index(commit)
+
+    def split_paths(self, map_df):
+        """
+        Split the map's data file paths into their dataset, dated root folder & path w/in the dataset.
+
+        Args:
+            map_df (pd.DataFrame): App-to-test-to-data map w/ 'Relative Directory' & 'Filename'.
+
+        Return (tuple): Dataset (pd.Series), relative path (pd.Series) & the dated root folder
+        per dataset (dict).
+
+        """
+        parts = map_df['Relative Directory'].astype(str).str.split('/', n=1)
+        roots = parts.str[0]
+        sub_dirs = parts.str[1].fillna('')
+        filenames = map_df['Filename'].astype(str)
+        rel_paths = (sub_dirs + '/' + filenames).where(sub_dirs != '', filenames)
+        datasets = pd.Series([root[:match.start()] if match else root
+                              for root, match in ((root, DATE_FOLDER_PATTERN.search(root)) for root in roots)],
+                             index=map_df.index)
+        root_sets = roots.groupby(datasets).unique()
+        for dataset, dataset_roots in root_sets.items():
+            if len(dataset_roots) > 1:
+                raise ValueError(f"Dataset '{dataset}' spans several dated folders {sorted(dataset_roots)}. Filter the map by date.")
+
+        return datasets, rel_paths, {dataset: dataset_roots[0] for dataset, dataset_roots in root_sets.items()}
+
+    def ingest(self, commit, map_df, **info):
+        """
+        Record the map of a commit.
+
+        Args:
+            commit (str): Commit ID (e.g. a ufs-weather-model hash).
+            map_df (pd.DataFrame): App-to-test-to-data map of the commit (e.g. ufs_app2test2data_df
+                                   of a single baseline date).
+            info (dict): Metadata of the commit (e.g. date='20220329').
+
+        Return (int): Number of deltas recorded (the number of rows for the base snapshot).
+
+        """
+        if commit in self.commits:
+            raise ValueError(f'Commit already ingested: {commit}')
+        datasets, rel_paths, roots = self.split_paths(map_df)
+        key_df = pd.DataFrame({'UFS_App': map_df['UFS_App'], 'Physics_Suite': map_df['Physics_Suite'],
+                               'Test Name': map_df['Test Name'], 'Dataset': datasets, 'Relative Path': rel_paths})
+        key_codes = np.column_stack([self.intern(col, key_df[col]) for col in KEY_COLUMNS])
+        value_codes = np.column_stack([self.intern(col, map_df[col] if col in map_df else pd.Series('', index=map_df.index))
+                                       for col in VALUE_COLUMNS[:2]]
+                                      + [map_df['Size (Bytes)'].to_numpy(dtype=np.int64)])
+
+        # Key & value IDs, appending new keys & values.
+        new_keys, new_values = [], []
+        key_ids = np.empty(len(map_df), dtype=np.int32)
+        value_ids = np.empty(len(map_df), dtype=np.int32)
+        for row, (key, value) in enumerate(zip(map(tuple, key_codes.tolist()), map(tuple, value_codes.tolist()))):
+            if key not in self.key_ids:
+                self.key_ids[key] = len(self.key_ids)
+                new_keys.append(key)
+            if value not in self.value_ids:
+                self.value_ids[value] = len(self.value_ids)
+                new_values.append(value)
+            key_ids[row] = self.key_ids[key]
+            value_ids[row] = self.value_ids[value]
+        if new_keys:
+            self.key_codes = np.vstack([self.key_codes, np.asarray(new_keys, dtype=np.int32)])
+        if new_values:
+            self.value_codes = np.vstack([self.value_codes, np.asarray(new_values, dtype=np.int64)])
+
+        # Delta against the previous commit's state. Duplicate keys keep their first row.
+        state = np.full(len(self.key_ids), -1, dtype=np.int32)
+        key_ids, first_rows = np.unique(key_ids, return_index=True)
+        state[key_ids] = value_ids[first_rows]
+        prev_state = np.full(len(state), -1, dtype=np.int32)
+        prev_state[:len(self.head_state)] = self.head_state
+        changed = np.flatnonzero(state != prev_state).astype(np.int32)
+        self.delta_keys = np.concatenate([self.delta_keys, changed])
+        self.delta_values = np.concatenate([self.delta_values, state[changed]])
+        self.delta_indptr = np.append(self.delta_indptr, len(self.delta_keys))
+
+        self.commits.append(commit)
+        self.commit_info.append({'roots': roots, **info})
+        self.head_state = state
+        if self.checkpoint_interval and (len(self.commits) - 1) % self.checkpoint_interval == 0:
+            self.checkpoints[len(self.commits) - 1] = state.copy()
+
+        return len(changed)
+
+    def get_state_ids(self, commit):
+        """
+        Replay the deltas onto the nearest checkpoint at or before a commit.
+
+        Args:
+            commit (str, int): Commit ID or index.
+
+        Return (np.ndarray): Value ID per key ID at the commit (-1 if absent).
+
+        """
+        idx = self.get_commit_idx(commit)
+        state = np.full(len(self.key_ids), -1, dtype=np.int32)
+        base = max((cp for cp in self.checkpoints if cp <= idx), default=None)
+        if base is not None:
+            state[:len(self.checkpoints[base])] = self.checkpoints[base]
+        start = self.delta_indptr[base + 1] if base is not None else 0
+        keys = self.delta_keys[start:self.delta_indptr[idx + 1]]
+        values = self.delta_values[start:self.delta_indptr[idx + 1]]
+
+        # Latest delta per key.
+        last = len(keys) - 1 - np.unique(keys[::-1], return_index=True)[1]
+        state[keys[last]] = values[last]
+
+        return state
+
+    def to_dataframe(self, key_ids, value_ids, commit_idx):
+        """
+        Decode keys & their values into map rows.
+
+        Args:
+            key_ids (np.ndarray): Key IDs.
+            value_ids (np.ndarray): Value ID per key.
+            commit_idx (int): Commit whose dated root folders the relative directories are set to.
+
+        Return (pd.DataFrame): Keys' UFS app, physics suite, test type, test, CNTL folder,
+        relative directory, filename & size (Bytes).
+
+        """
+        key_codes = self.key_codes[key_ids]
+        value_codes = self.value_codes[value_ids]
+        tables = {col: np.asarray(table, dtype=object) for col, table in self.tables.items()}
+        decoded = {col: tables[col][key_codes[:, idx]] for idx, col in enumerate(KEY_COLUMNS)}
+
+        # Relative directories are rooted at the commit's dated root folder of their dataset.
+        roots = self.commit_info[commit_idx]['roots']
+        rel_dirs, filenames = [], []
+        for dataset, rel_path in zip(decoded['Dataset'], decoded['Relative Path']):
+            sub_dir, _, filename = rel_path.rpartition('/')
+            root = roots.get(dataset, dataset)
+            rel_dirs.append(f'{root}/{sub_dir}' if sub_dir else root)
+            filenames.append(filename)
+        map_df = pd.DataFrame({'UFS_App': decoded['UFS_App'],
+                               'Physics_Suite': decoded['Physics_Suite'],
+                               'Test Type': tables['Test Type'][value_codes[:, 0]],
+                               'Test Name': decoded['Test Name'],
+                               'CNTL Folder': tables['CNTL Folder'][value_codes[:, 1]],
+                               'Relative Directory': rel_dirs,
+                               'Filename': filenames,
+                               'Size (Bytes)': value_codes[:, 2]})
+
+        return map_df
+
+    def get_sizes(self, value_ids):
+        """
+        Size (Bytes) per value ID, missing for absent keys (value ID -1).
+
+        """
+        sizes = pd.array(self.value_codes[np.maximum(value_ids, 0), 2] if len(self.value_codes) else np.zeros(len(value_ids)),
+                         dtype='Int64')
+        sizes[value_ids < 0] = pd.NA
+
+        return sizes
+
+    def get_state(self, commit):
+        """
+        Map at a commit.
+
+        Args:
+            commit (str, int): Commit ID or index.
+
+        Return (pd.DataFrame): Map rows of the commit, w/ the relative directories set to the
+        commit's dated root folders.
+
+        """
+        idx = self.get_commit_idx(commit)
+        state = self.get_state_ids(idx)
+        key_ids = np.flatnonzero(state >= 0)
+
+        return self.to_dataframe(key_ids, state[key_ids], idx)
+
+    def diff(self, old_commit, new_commit):
+        """
+        Added, removed & changed map rows between two commits.
+
+        Args:
+            old_commit (str, int): Earlier commit ID or index.
+            new_commit (str, int): Later commit ID or index.
+
+        Return (pd.DataFrame): Per changed key, its map row (as of the new commit, or the old
+        commit if removed), 'Status' ('added', 'removed', 'changed') & old & new size (Bytes).
+
+        Only the keys w/ deltas between the commits are compared.
+
+        """
+        old_idx, new_idx = self.get_commit_idx(old_commit), self.get_commit_idx(new_commit)
+        lo, hi = sorted([old_idx, new_idx])
+        touched = np.unique(self.delta_keys[self.delta_indptr[lo + 1]:self.delta_indptr[hi + 1]])
+        old_state, new_state = self.get_state_ids(old_idx), self.get_state_ids(new_idx)
+        old_values, new_values = old_state[touched], new_state[touched]
+        is_diff = old_values != new_values
+        touched, old_values, new_values = touched[is_diff], old_values[is_diff], new_values[is_diff]
+
+        # Removed rows are set to the old commit's dated root folders & the others to the new commit's.
+        removed = new_values < 0
+        diff_df = pd.concat([self.to_dataframe(touched[~removed], new_values[~removed], new_idx),
+                             self.to_dataframe(touched[removed], old_values[removed], old_idx)], ignore_index=True)
+        old_values = np.concatenate([old_values[~removed], old_values[removed]])
+        new_values = np.concatenate([new_values[~removed], new_values[removed]])
+        status = np.where(old_values < 0, 'added', np.where(new_values < 0, 'removed', 'changed'))
+        diff_df['Status'] = pd.Categorical(status, categories=['added', 'removed', 'changed'])
+        diff_df['Old Size (Bytes)'] = self.get_sizes(old_values)
+        diff_df['New Size (Bytes)'] = self.get_sizes(new_values)
+
+        return diff_df.sort_values(['UFS_App', 'Physics_Suite', 'Test Name', 'Relative Directory', 'Filename'], ignore_index=True)
+
+    def get_events(self, **criteria):
+        """
+        History of the keys matching all criteria: when each started or stopped being required,
+        or changed.
+
+        Args:
+            criteria (dict): Key column (w/ spaces replaced by underscores, e.g. Test_Name,
+                             Relative_Path) to the value to match (e.g. Test_Name='control_p8').
+
+        Return (pd.DataFrame): Per delta of the matching keys, its commit, 'Status' & the key's
+        UFS app, physics suite, test, dataset, relative path & size (Bytes), in commit order.
+
+        """
+        mask = np.ones(len(self.key_codes), dtype=bool)
+        for name, value in criteria.items():
+            col = name.replace('_', ' ') if name.replace('_', ' ') in KEY_COLUMNS else name
+            idx = KEY_COLUMNS.index(col)
+            code = self.lookups[col].get(value, -1)
+            mask &= self.key_codes[:, idx] == code
+        rows = np.flatnonzero(mask[self.delta_keys])
+        keys, values = self.delta_keys[rows], self.delta_values[rows]
+        commit_ids = np.searchsorted(self.delta_indptr, rows, side='right') - 1
+
+        # A delta's previous value is the key's preceding delta (-1 before its first delta).
+        order = np.lexsort((rows, keys))
+        prev_values = np.full(len(rows), -1, dtype=np.int32)
+        same_key = keys[order][1:] == keys[order][:-1]
+        prev_values[order[1:][same_key]] = values[order][:-1][same_key]
+
+        events_df = pd.DataFrame({'Commit': np.asarray(self.commits, dtype=object)[commit_ids],
+                                  'Status': np.where(prev_values < 0, 'added', np.where(values < 0, 'removed', 'changed'))})
+        for idx, col in enumerate(KEY_COLUMNS):
+            events_df[col] = np.asarray(self.tables[col], dtype=object)[self.key_codes[keys, idx]]
+        events_df['Size (Bytes)'] = self.get_sizes(values)
+
+        return events_df
+
+    def get_cntl_folder_history(self):
+        """
+        Commits from which each baseline CNTL folder was referenced by a test & from which it
+        was orphaned (i.e. no longer referenced), via running reference counts over the deltas.
+
+        Args:
+            None
+
+        Return (pd.DataFrame): Per CNTL folder (& per period of references), its 'First Commit'
+        & 'Orphaned Commit' (None if still referenced).
+
+        """
+        n_cntl = len(self.tables['CNTL Folder'])
+        counts = np.zeros(n_cntl, dtype=np.int64)
+        state = np.full(len(self.key_ids), -1, dtype=np.int32)
+        first, periods = {}, []
+        for idx, commit in enumerate(self.commits):
+            keys = self.delta_keys[self.delta_indptr[idx]:self.delta_indptr[idx + 1]]
+            values = self.delta_values[self.delta_indptr[idx]:self.delta_indptr[idx + 1]]
+            old_values = state[keys]
+            before = counts > 0
+            np.add.at(counts, self.value_codes[old_values[old_values >= 0], 1], -1)
+            np.add.at(counts, self.value_codes[values[values >= 0], 1], 1)
+            state[keys] = values
+            after = counts > 0
+            for code in np.flatnonzero(after & ~before):
+                first[code] = commit
+            for code in np.flatnonzero(before & ~after):
+                periods.append((self.tables['CNTL Folder'][code], first.pop(code), commit))
+        periods += [(self.tables['CNTL Folder'][code], commit, None) for code, commit in first.items()]
+        history_df = pd.DataFrame(periods, columns=['CNTL Folder', 'First Commit', 'Orphaned Commit'])
+
+        return history_df[history_df['CNTL Folder'] != ''].sort_values('CNTL Folder', ignore_index=True)
+
+    @property
+    def nbytes(self):
+        """
+        Total size (Bytes) of the history's arrays.
+
+        """
+        arrays = [self.key_codes, self.value_codes, self.delta_indptr, self.delta_keys, self.delta_values]
+
+        return sum(arr.nbytes for arr in arrays + list(self.checkpoints.values()))
+
+    def save(self, fn):
+        """
+        Save the history as a compressed NumPy archive, which loads w/o unpickling.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (str): Path of the saved file.
+
+        """
+        arrays = {'commits': np.array(json.dumps({'commits': self.commits, 'info': self.commit_info,
+                                                  'checkpoint_interval': self.checkpoint_interval})),
+                  'key_codes': self.key_codes, 'value_codes': self.value_codes, 'delta_indptr': self.delta_indptr,
+                  'delta_keys': self.delta_keys, 'delta_values': self.delta_values}
+        arrays.update({f'table/{col}': np.asarray(table, dtype=str) for col, table in self.tables.items()})
+        arrays.update({f'checkpoint/{idx}': state for idx, state in self.checkpoints.items()})
+        np.savez_compressed(fn, **arrays)
+
+        return fn + '.npz'
+
+    @classmethod
+    def read(cls, fn):
+        """
+        Read a history saved via 'save()'.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (MapHistory): The history.
+
+        """
+        with np.load(fn + '.npz', allow_pickle=False) as data:
+            meta = json.loads(str(data['commits']))
+            history = cls(meta['checkpoint_interval'])
+            history.commits, history.commit_info = meta['commits'], meta['info']
+            for name in ['key_codes', 'value_codes', 'delta_indptr', 'delta_keys', 'delta_values']:
+                setattr(history, name, data[name])
+            for key in data.files:
+                prefix, _, name = key.partition('/')
+                if prefix == 'table':
+                    history.tables[name] = data[key].tolist()
+                elif prefix == 'checkpoint':
+                    history.checkpoints[int(name)] = data[key]
+        history.lookups = {col: {value: code for code, value in enumerate(table)} for col, table in history.tables.items()}
+        history.key_ids = {tuple(key): idx for idx, key in enumerate(history.key_codes.tolist())}
+        history.value_ids = {tuple(value): idx for idx, value in enumerate(history.value_codes.tolist())}
+        history.head_state = history.get_state_ids(-1) if history.commits else np.empty(0, dtype=np.int32)
+
+        return history
@@ -0,0 +1,190 @@
+import os
+import json
+import pickle
+import importlib.util
+import pandas as pd
+
+# File extension per storage format.
+FORMAT_EXT = {'parquet': '.parquet',
+              'feather': '.feather',
+              'pickle': '.pkl'}
+
+# Schema metadata key listing the columns of nested dictionaries/lists stored as JSON text.
+JSON_COLUMNS_KEY = b'ufs_map_json_columns'
+
+# Comparison per row filter operator (e.g. ('Date', '==', '20220329')).
+FILTER_OPS = {'==': lambda col, val: col == val,
+              '=': lambda col, val: col == val,
+              '!=': lambda col, val: col != val,
+              '<': lambda col, val: col < val,
+              '<=': lambda col, val: col <= val,
+              '>': lambda col, val: col > val,
+              '>=': lambda col, val: col >= val,
+              'in': lambda col, val: col.isin(val),
+              'not in': lambda col, val: ~col.isin(val)}
+
+
+class MapStorage():
+    """
+    Saves & reads the mapped dataframes (e.g. rt_appsphys2test_df, input_df, ufs_app2test2data_df)
+    in a columnar Parquet/Feather format, so readers only load the columns & rows they request.
+    Falls back to pickle files if pyarrow is not installed.
+
+    """
+    def __init__(self, fmt='parquet', row_group_size=None):
+
+        # Storage format. Options: 'parquet', 'feather', 'pickle'. Columnar formats require
+        # pyarrow & fall back to 'pickle' otherwise.
+        if fmt not in FORMAT_EXT:
+            raise ValueError(f"Unknown storage format '{fmt}'. Options: {list(FORMAT_EXT)}")
+        self.has_arrow = importlib.util.find_spec('pyarrow') is not None
+        self.fmt = fmt if self.has_arrow else 'pickle'
+
+        # Max rows per Parquet row group. Smaller row groups allow finer row filters.
+        self.row_group_size = row_group_size
+
+    def get_json_columns(self, df):
+        """
+        Locate the columns comprised of nested dictionaries or lists (e.g. 'Test Info').
+
+        Args:
+            df (pd.DataFrame): Table to save.
+
+        Return (list): Names of the nested columns.
+
+        """
+        json_cols = []
+        for col in df.columns:
+            if df[col].dtype != object:
+                continue
+            non_null = df[col].dropna()
+            if len(non_null) and isinstance(non_null.iloc[0], (dict, list, tuple)):
+                json_cols.append(col)
+
+        return json_cols
+
+    def save(self, df, fn):
+        """
+        Save table to the storage format.
+
+        Args:
+            df (pd.DataFrame): Table to save.
+            fn (str): Filename excluding the format's extension.
+
+        Return (str): Path of the saved file.
+
+        Nested columns are flattened to JSON text w/in columnar formats & restored when read.
+
+        """
+        path = fn + FORMAT_EXT[self.fmt]
+        if self.fmt == 'pickle':
+            with open(path, 'wb') as file:
+                pickle.dump(df, file)
+            return path
+
+        import pyarrow as pa
+
+        # Flatten nested columns to JSON text.
+        json_cols = self.get_json_columns(df)
+        df = df.copy() if json_cols else df
+        for col in json_cols:
+            df[col] = [None if v is None or v is pd.NA or (isinstance(v, float) and v != v) else json.dumps(v)
+                       for v in df[col]]
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[JSON_COLUMNS_KEY] = json.dumps(json_cols).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, path, row_group_size=self.row_group_size)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, path)
+
+        return path
+
+    def locate(self, fn):
+        """
+        Locate the saved file of a table, preferring the storage format.
+
+        Args:
+            fn (str): Filename excluding the format's extension.
+
+        Return (tuple): Format & path of the saved file.
+
+        """
+        fmts = [self.fmt] + [fmt for fmt in FORMAT_EXT if fmt != self.fmt]
+        for fmt in fmts:
+            if fmt != 'pickle' and not self.has_arrow:
+                continue
+            if os.path.exists(fn + FORMAT_EXT[fmt]):
+                return fmt, fn + FORMAT_EXT[fmt]
+
+        raise FileNotFoundError(f"No saved table found for '{fn}' ({', '.join(FORMAT_EXT.values())})")
+
+    def apply_filters(self, df, filters):
+        """
+        Filter rows of a table.
+
+        Args:
+            df (pd.DataFrame): Table to filter.
+            filters (list): Row filters as (column, operator, value) tuples, which are all
+                            required to match (e.g. [('Date', '==', '20220329')]).
+
+        Return (pd.DataFrame): Filtered table.
+
+        """
+        if not filters:
+            return df
+        mask = pd.Series(True, index=df.index)
+        for col, op, val in filters:
+            mask &= FILTER_OPS[op](df[col], val)
+
+        return df[mask].reset_index(drop=True)
+
+    def read(self, fn, columns=None, filters=None):
+        """
+        Read table from its saved file.
+
+        Args:
+            fn (str): Filename excluding the format's extension.
+            columns (list): Columns to read. Default reads all columns.
+            filters (list): Row filters as (column, operator, value) tuples
+                            (e.g. [('Date', '==', '20220329')]).
+
+        Return (pd.DataFrame): Table w/ the requested columns & rows.
+
+        Parquet files skip the row groups which do not match the filters. Filter columns
+        need not be among the requested columns.
+
+        """
+        fmt, path = self.locate(fn)
+        if fmt == 'pickle':
+            df = pd.read_pickle(path)
+            df = self.apply_filters(df, filters)
+            return df if columns is None else df[list(columns)]
+
+        # Read requested & filtered columns only.
+        read_cols = None
+        if columns is not None:
+            read_cols = list(columns) + [f[0] for f in filters or [] if f[0] not in columns]
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            arrow_filters = [(col, '=' if op == '==' else op, val) for col, op, val in filters] if filters else None
+            table = pq.read_table(path, columns=read_cols, filters=arrow_filters)
+            filters = None
+        else:
+            import pyarrow.feather as feather
+            table = feather.read_table(path, columns=read_cols)
+        json_cols = json.loads((table.schema.metadata or {}).get(JSON_COLUMNS_KEY, b'[]'))
+        df = self.apply_filters(table.to_pandas(), filters)
+        if columns is not None:
+            df = df[list(columns)]
+
+        # Restore nested columns.
+        for col in json_cols:
+            if col in df.columns:
+                df[col] = [json.loads(v) if isinstance(v, str) else v for v in df[col]]
+
+        return df
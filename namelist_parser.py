@@ -0,0 +1,124 @@
+import re
+from collections import namedtuple
+
+# Tokens of a Fortran namelist (or MOM6 parameter file) line: trailing comments, quoted strings,
+# group start (e.g. '&fv_core_nml') & end ('/', '&end'), assignments (e.g. 'fnglac =',
+# 'layout(1) =', 'KPP%N_SMOOTH ='), separators & unquoted values.
+NML_TOKEN_PATTERN = re.compile(r"""(?P<comment>!.*)
+                                   |(?P<str>'(?:[^']|'')*'|"(?:[^"]|"")*")
+                                   |(?P<group_end>&end\b|(?<!\S)/(?!\S))
+                                   |(?P<group>&\w+)
+                                   |(?P<assign>[A-Za-z_][\w%]*(?:\([^)]*\))?(?:%\w+)*\s*=)
+                                   |(?P<sep>[\s,]+)
+                                   |(?P<val>[^\s,'"!=]+)
+                                   |(?P<other>.)""", re.VERBOSE | re.IGNORECASE)
+
+# MOM6 parameter blocks (e.g. 'KPP%' ... '%KPP').
+MOM_BLOCK_START_PATTERN = re.compile(r'^(\w+)%$')
+MOM_BLOCK_END_PATTERN = re.compile(r'^%(\w+)$')
+
+# Extensions of data files (e.g. '.nc', '.grb', '.grib2', '.dat'), optionally templated (e.g. '.nc.IN').
+DATA_FILE_EXT_PATTERN = re.compile(r'\.(?:nc4?|grib2?|grb2?|bin|dat|txt|tbl|asc|f77|gz|tar)(?:\.IN)?$', re.IGNORECASE)
+
+# Value set to a namelist variable.
+NamelistRecord = namedtuple('NamelistRecord', ['group', 'variable', 'value', 'is_file'])
+
+
+class NamelistParser():
+    """
+    Incremental tokenizer of the /parm files' Fortran namelists (e.g. '*.nml.IN') & MOM6 parameter
+    files (e.g. 'MOM_input_*'), streaming one line at a time.
+
+    """
+    def __init__(self, file_ext_pattern=DATA_FILE_EXT_PATTERN):
+
+        # Precompiled pattern matching the values which are data filenames.
+        self.file_ext_pattern = file_ext_pattern
+
+    def split_value(self, token, is_quoted):
+        """
+        Split a value token into the values it lists.
+
+        Args:
+            token (str): Value token.
+            is_quoted (bool): Whether the token is a quoted string.
+
+        Return (list): Values. Quoted strings are unquoted & split by commas, since MOM6
+        lists of files are set as a single comma delimited string.
+
+        """
+        if not is_quoted:
+            return [token]
+        quote = token[0]
+        token = token[1:-1].replace(quote * 2, quote)
+
+        return [v.strip() for v in token.split(',') if v.strip()] if ',' in token else [token]
+
+    def parse(self, lines):
+        """
+        Parse the variables & values set within a namelist file.
+
+        Args:
+            lines (iterator): Lines of a /parm file.
+
+        Return (generator): A NamelistRecord (group, variable, value, is_file) per value set. Array
+        values yield a record per element, including elements continued on subsequent lines.
+        Variables outside of a namelist group (e.g. MOM6 parameter files) have no group, unless
+        w/in a MOM6 parameter block (e.g. 'KPP%').
+
+        """
+        group = None
+        variable = None
+        for line in lines:
+            stripped = line.strip()
+
+            # MOM6 overrides are set as '#override VAR = value', whereas other '#' lines are comments.
+            if stripped.startswith('#'):
+                if not stripped.startswith('#override'):
+                    continue
+                stripped = stripped[len('#override'):]
+            block_start = MOM_BLOCK_START_PATTERN.match(stripped)
+            if block_start is not None:
+                group, variable = block_start.group(1), None
+                continue
+            if MOM_BLOCK_END_PATTERN.match(stripped) is not None:
+                group, variable = None, None
+                continue
+
+            # Values following an assignment belong to the variable until the next assignment.
+            # Outside of a group, values only continue onto the next line after a trailing comma.
+            continues = False
+            for match in NML_TOKEN_PATTERN.finditer(stripped):
+                kind = match.lastgroup
+                if kind == 'comment':
+                    break
+                if kind == 'group':
+                    group, variable = match.group()[1:], None
+                elif kind == 'group_end':
+                    group, variable = None, None
+                elif kind == 'assign':
+                    variable = match.group()[:-1].strip()
+                    continues = False
+                elif kind in ('str', 'val') and variable is not None:
+                    for value in self.split_value(match.group(), kind == 'str'):
+                        yield NamelistRecord(group, variable, value, self.file_ext_pattern.search(value) is not None)
+                    continues = False
+                elif kind == 'sep':
+                    continues = continues or ',' in match.group()
+            if group is None and not continues:
+                variable = None
+
+    def parse_file(self, file_path):
+        """
+        Parse the variables & values set within a namelist file.
+
+        Args:
+            file_path (str): Path of the /parm file.
+
+        Return (list): NamelistRecords of the file.
+
+        """
+        with open(file_path, 'r') as file:
+            records = list(self.parse(file))
+
+        return records
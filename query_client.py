@@ -0,0 +1,115 @@
+import json
+import socket
+import http.client
+from urllib.parse import urlencode, urlparse
+
+# Default address of the map query server.
+DEFAULT_ADDRESS = 'http://127.0.0.1:8765'
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix domain socket.
+
+    """
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class MapQueryClient():
+    """
+    Thin client of the map query server (see query_server.py), so that RT jobs look up the
+    app-to-test-to-data map w/o loading it. Only depends on the standard library.
+
+    """
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=30):
+
+        # Server address: 'http://<host>:<port>' or 'unix://<socket path>' (or a socket path).
+        self.address = address
+        self.timeout = timeout
+
+    def get_connection(self):
+        url = urlparse(self.address)
+        if url.scheme == 'unix' or not url.scheme:
+            return UnixHTTPConnection(url.netloc + url.path if url.scheme else self.address, timeout=self.timeout)
+
+        return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+
+    def request(self, lookup, **params):
+        """
+        Request a lookup from the server.
+
+        Args:
+            lookup (str): Lookup (e.g. 'files_for_test').
+            params (dict): Lookup's parameters. Lists are sent as comma separated values.
+
+        Return (object): Lookup's result.
+
+        Raises KeyError if the lookup or its key is unknown & ValueError if the parameters are
+        invalid.
+
+        """
+        query = urlencode({key: ','.join(val) if isinstance(val, (list, tuple)) else val
+                           for key, val in params.items() if val is not None})
+        conn = self.get_connection()
+        try:
+            conn.request('GET', f'/{lookup}?{query}')
+            response = conn.getresponse()
+            body = json.loads(response.read() or b'null')
+        finally:
+            conn.close()
+        if response.status == 404:
+            raise KeyError(body.get('error') if isinstance(body, dict) else lookup)
+        if response.status != 200:
+            raise ValueError(body.get('error') if isinstance(body, dict) else response.reason)
+
+        return body['result']
+
+    def status(self):
+        """
+        Server status: loaded map & planner files, their versions, rows & number of reloads.
+
+        """
+        return self.request('status')
+
+    def files_for_test(self, test_name, rel_path=False):
+        return self.request('files_for_test', test_name=test_name, rel_path=int(rel_path))
+
+    def tests_for_file(self, filename):
+        return self.request('tests_for_file', filename=filename)
+
+    def apps_for_cntl_folder(self, cntl_folder):
+        return self.request('apps_for_cntl_folder', cntl_folder=cntl_folder)
+
+    def cntl_folders_for_app(self, app):
+        return self.request('cntl_folders_for_app', app=app)
+
+    def bytes_for_app(self, app):
+        return self.request('bytes_for_app', app=app)
+
+    def bytes_for_test(self, test_name):
+        return self.request('bytes_for_test', test_name=test_name)
+
+    def get_manifest(self, tests=None, apps=None, combos=None):
+        """
+        Relative paths of the files to stage for the selected tests (requires the server's planner).
+
+        Args:
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): 'APP:SUITE' builds, selecting their tests.
+
+        Return (list): Sorted relative paths.
+
+        """
+        return self.request('manifest', tests=tests, apps=apps, combos=combos)
+
+    def summarize(self, tests=None, apps=None, combos=None):
+        return self.request('summarize', tests=tests, apps=apps, combos=combos)
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from map_storage import MapStorage
+from app2bl_query import App2BaselineQuery
+
+# Columns of the app-to-test-to-data map loaded by the server. The nested 'Test Info' column is
+# never deserialized.
+QUERY_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Name', 'CNTL Folder',
+                 'Relative Directory', 'Filename', 'Size (Bytes)']
+
+# Lookups of the map per endpoint & their required & optional parameters.
+MAP_LOOKUPS = {'files_for_test': (['test_name'], ['rel_path']),
+               'tests_for_file': (['filename'], []),
+               'apps_for_cntl_folder': (['cntl_folder'], []),
+               'cntl_folders_for_app': (['app'], []),
+               'bytes_for_app': (['app'], []),
+               'bytes_for_test': (['test_name'], [])}
+
+# Lookups of the staging planner per endpoint, w/ comma separated 'tests', 'apps' & 'combos' parameters.
+PLANNER_LOOKUPS = {'manifest': 'get_manifest',
+                   'summarize': 'summarize'}
+
+
+# Pending connections queued by the server, so that bursts of RT jobs are not refused.
+REQUEST_QUEUE_SIZE = 128
+
+
+class ThreadingTCPHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server on a TCP port.
+
+    """
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threaded HTTP server on a Unix domain socket.
+
+    """
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the lookups of the map query server as JSON over HTTP GET (e.g.
+    '/files_for_test?test_name=control_p8').
+
+    """
+    def address_string(self):
+
+        # Unix socket clients have no address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def send_json(self, status, body):
+        payload = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: vals[-1] for key, vals in parse_qs(url.query).items()}
+        try:
+            self.send_json(200, {'result': self.server.map_server.dispatch(url.path.strip('/'), params)})
+        except KeyError as err:
+            self.send_json(404, {'error': str(err.args[0]) if err.args else 'Not found'})
+        except (ValueError, TypeError) as err:
+            self.send_json(400, {'error': str(err)})
+
+    def log_message(self, format, *args):
+        if self.server.map_server.verbose:
+            super().log_message(format, *args)
+
+
+class MapQueryServer():
+    """
+    Long-lived, local server of the app-to-test-to-data map's indexed lookups (& of a staging
+    planner's manifests), so that concurrent RT jobs query a single in-memory copy of the map
+    rather than each unpickling it.
+
+    The map (& planner) are reloaded in the background once their files change. Lookups in
+    flight keep the indexes they started w/, since the new indexes are swapped in atomically.
+
+    """
+    def __init__(self, map_fn, planner_fn=None, poll_interval=2.0, verbose=False):
+
+        # App-to-test-to-data map (excluding ext) & optional StagingPlanner bitmaps (excluding .npz).
+        self.map_fn = map_fn
+        self.planner_fn = planner_fn
+
+        # Seconds between checks of the files for changes.
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+
+        # Loaded indexes & the (path, size, mtime) of their files, swapped as a whole on reload.
+        self.state = None
+        self.reloads = 0
+        self.reload_errors = []
+        self.load()
+
+        self.server = None
+        self.stop_event = threading.Event()
+
+    def get_file_stats(self):
+        """
+        (path, size, mtime) of the map's (& planner's) files.
+
+        """
+        paths = [MapStorage().locate(self.map_fn)[1]]
+        if self.planner_fn is not None:
+            paths.append(self.planner_fn + '.npz')
+
+        return tuple((path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in paths)
+
+    def load(self):
+        """
+        Load the map's indexes (& the planner) & swap them in.
+
+        Args:
+            None
+
+        Return (tuple): Loaded file stats.
+
+        """
+        file_stats = self.get_file_stats()
+        query = App2BaselineQuery(MapStorage().read(self.map_fn, columns=QUERY_COLUMNS))
+        planner = None
+        if self.planner_fn is not None:
+            from staging_planner import StagingPlanner
+            planner = StagingPlanner.read(self.planner_fn)
+        self.state = {'query': query, 'planner': planner, 'file_stats': file_stats, 'loaded': time.time()}
+
+        return file_stats
+
+    def reload_if_changed(self):
+        """
+        Reload the map (& planner) if their files changed since they were loaded. Files being
+        written (or failing to load) are retried at the next poll.
+
+        Args:
+            None
+
+        Return (bool): Whether the map was reloaded.
+
+        """
+        try:
+            if self.get_file_stats() == self.state['file_stats']:
+                return False
+            self.load()
+        except Exception as err:
+            # Any failure (e.g. a truncated pickle mid-write) leaves the loaded indexes in place.
+            self.reload_errors.append(f'{type(err).__name__}: {err}')
+            return False
+        self.reloads += 1
+
+        return True
+
+    def watch(self):
+        """
+        Poll the files for changes until stopped. A failed poll never ends the watcher.
+
+        Args:
+            None
+
+        Return: None
+
+        """
+        while not self.stop_event.wait(self.poll_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as err:
+                self.reload_errors.append(f'{type(err).__name__}: {err}')
+
+    def dispatch(self, lookup, params):
+        """
+        Run a lookup.
+
+        Args:
+            lookup (str): Lookup (i.e. 'status', a MAP_LOOKUPS or a PLANNER_LOOKUPS endpoint).
+            params (dict): Lookup's parameters.
+
+        Return (object): Lookup's result.
+
+        """
+        state = self.state
+        if lookup == 'status':
+            return {'map': self.map_fn, 'planner': self.planner_fn, 'rows': len(state['query'].app2baseline_df),
+                    'files': [list(stat) for stat in state['file_stats']], 'loaded': state['loaded'],
+                    'reloads': self.reloads, 'reload_errors': self.reload_errors[-5:]}
+        if lookup in MAP_LOOKUPS:
+            required, optional = MAP_LOOKUPS[lookup]
+            missing = [param for param in required if param not in params]
+            if missing:
+                raise ValueError(f'Missing parameters of {lookup}: {missing}')
+            kwargs = {param: params[param] for param in required}
+            if 'rel_path' in optional:
+                kwargs['rel_path'] = params.get('rel_path', '0') not in ('0', 'false', '')
+            return getattr(state['query'], lookup)(**kwargs)
+        if lookup in PLANNER_LOOKUPS:
+            if state['planner'] is None:
+                raise ValueError(f'{lookup} requires the server to be started w/ a staging planner.')
+            split = lambda key: [val for val in params.get(key, '').split(',') if val]
+            combos = [tuple(combo.split(':', 1)) for combo in split('combos')]
+            return getattr(state['planner'], PLANNER_LOOKUPS[lookup])(tests=split('tests'), apps=split('apps'), combos=combos)
+
+        raise KeyError(f'Unknown lookup: {lookup}')
+
+    def start(self, host='127.0.0.1', port=8765, socket_path=None):
+        """
+        Start serving in background threads, along w/ the file watcher.
+
+        Args:
+            host (str): Host to bind to. Defaults to localhost only.
+            port (int): Port to bind to (0 for any free port).
+            socket_path (str): Unix domain socket to serve on instead of host & port.
+
+        Return (str): Address of the server (e.g. 'http://127.0.0.1:8765', 'unix:///tmp/ufs_map.sock').
+
+        """
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.server = ThreadingUnixHTTPServer(socket_path, QueryRequestHandler)
+            address = f'unix://{socket_path}'
+        else:
+            self.server = ThreadingTCPHTTPServer((host, port), QueryRequestHandler)
+            address = f'http://{host}:{self.server.server_address[1]}'
+        self.server.map_server = self
+        self.stop_event.clear()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self.watch, daemon=True).start()
+
+        return address
+
+    def stop(self):
+        """
+        Stop serving & watching.
+
+        """
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            if isinstance(self.server, socketserver.UnixStreamServer) and os.path.exists(self.server.server_address):
+                os.remove(self.server.server_address)
+            self.server = None
@@ -0,0 +1,187 @@
+import copy
+from collections import namedtuple
+
+# Key of a regression test of an UFS application-to-physics suite build.
+RTKey = namedtuple('RTKey', ['app', 'physics_suite', 'test_type', 'test_name'])
+
+
+class RTTable():
+    """
+    Flat table of the regression tests per UFS application-to-physics suite build (i.e. rt.conf or
+    AppSuiteCombo2Test.csv), keyed by (app, physics suite, test type, test name) w/ precomputed
+    reverse indexes per app, physics suite, build, test type & test.
+
+    """
+    def __init__(self, keys, params=None):
+
+        # Unique keys in order of first occurrence & the test parameters (i.e. a /tests file's
+        # variables) per key, if attached via 'with_params()'.
+        first_rows = {}
+        for row, key in enumerate(keys):
+            first_rows.setdefault(RTKey(*key), row)
+        self.keys = list(first_rows)
+        self.params = [params[row] for row in first_rows.values()] if params is not None else None
+
+        # Row IDs per app, physics suite, (app, physics suite) build, test type & test name.
+        self.by_app = {}
+        self.by_suite = {}
+        self.by_combo = {}
+        self.by_test_type = {}
+        self.by_test = {}
+        for row, key in enumerate(self.keys):
+            self.by_app.setdefault(key.app, []).append(row)
+            self.by_suite.setdefault(key.physics_suite, []).append(row)
+            self.by_combo.setdefault((key.app, key.physics_suite), []).append(row)
+            self.by_test_type.setdefault(key.test_type, []).append(row)
+            self.by_test.setdefault(key.test_name, []).append(row)
+        self.rtinfo = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        """
+        Iterate over each key & its test parameters (None if not attached).
+
+        """
+        params = self.params if self.params is not None else [None] * len(self.keys)
+
+        return iter(zip(self.keys, params))
+
+    @classmethod
+    def from_ref_txt(cls, ref_txt):
+        """
+        Build the table from the reference table's rows.
+
+        Args:
+            ref_txt (list): Rows of [app, physics suite, test type, test names...]
+                            (i.e. 'ScriptScraper.read_appsphys2test()' output).
+
+        Return (RTTable): The table. As w/ 'ScriptScraper.convert_list2dict()', rows are grouped
+        per app, then per physics suite, & a repeated (app, physics suite, test type) row
+        replaces the tests of the earlier one.
+
+        """
+        nested = {}
+        for row in ref_txt:
+            nested.setdefault(row[0], {}).setdefault(row[1], {})[row[2]] = row[3:]
+
+        return cls(RTKey(app, physics_suite, test_type, test_name)
+                   for app, physics_suites in nested.items()
+                   for physics_suite, test_types in physics_suites.items()
+                   for test_type, test_names in test_types.items()
+                   for test_name in test_names)
+
+    @classmethod
+    def from_app2test(cls, app2test_dict):
+        """
+        Build the table from the nested apps-to-physics suite builds to regression tests dictionary.
+
+        Args:
+            app2test_dict (dict): {(app, physics suite): {test type: [test names]}} (i.e.
+                                  'ScriptScraper.get_app2test()' output), or w/ each test
+                                  name mapped to its parameters (i.e. 'ScriptScraper.get_appsphys2testparams()' output).
+
+        Return (RTTable): The table, w/ the test parameters attached if given.
+
+        """
+        keys, params = [], []
+        for (app, physics_suite), test_types in app2test_dict.items():
+            for test_type, test_names in test_types.items():
+                for test_name in test_names:
+                    keys.append(RTKey(app, physics_suite, test_type, test_name))
+                    params.append(test_names[test_name] if isinstance(test_names, dict) else None)
+        has_params = any(isinstance(test_names, dict) for test_types in app2test_dict.values() for test_names in test_types.values())
+
+        return cls(keys, params if has_params else None)
+
+    def with_params(self, tests_dict):
+        """
+        Attach each test's parameters.
+
+        Args:
+            tests_dict (dict): Test parameters per /tests file (i.e. 'input_data_dict['tests']').
+
+        Return (RTTable): Table w/ the parameters attached. Rows of the same test reference the
+        test's parameters; tests w/o a /tests file get their own empty parameters.
+
+        """
+        missing = {}
+        table = copy.copy(self)
+        table.params = [tests_dict[key.test_name] if key.test_name in tests_dict else missing.setdefault(key.test_name, {})
+                        for key in self.keys]
+
+        # Keys & reverse indexes are shared w/ this table.
+        return table
+
+    def select(self, app=None, physics_suite=None, test_type=None, test_name=None):
+        """
+        Locate the rows matching all of the given criteria.
+
+        Args:
+            app (str): UFS application (e.g. 'ATM').
+            physics_suite (str): Physics suite (e.g. 'FV3_GFS_v16').
+            test_type (str): Test type (e.g. 'tests', 'debug_tests').
+            test_name (str): Regression test (e.g. 'control_p8').
+
+        Return (list): Row IDs in table order.
+
+        """
+        criteria = [(self.by_app, app), (self.by_suite, physics_suite), (self.by_test_type, test_type), (self.by_test, test_name)]
+        matched = None
+        for index, value in criteria:
+            if value is None:
+                continue
+            rows = set(index.get(value, []))
+            matched = rows if matched is None else matched & rows
+
+        return list(range(len(self.keys))) if matched is None else sorted(matched)
+
+    def get_tests(self, **criteria):
+        """
+        Unique regression tests of the rows matching the criteria (see 'select()').
+
+        Return (list): Test names in table order.
+
+        """
+        return list(dict.fromkeys(self.keys[row].test_name for row in self.select(**criteria)))
+
+    def to_app2test(self):
+        """
+        Convert to the nested apps-to-physics suite builds to regression tests dictionary.
+
+        Args:
+            None
+
+        Return (dict): {(app, physics suite): {test type: [test names]}}, or w/ each test name
+        mapped to its parameters if attached.
+
+        """
+        app2test_dict = {}
+        for key, params in self:
+            test_types = app2test_dict.setdefault((key.app, key.physics_suite), {})
+            if self.params is None:
+                test_types.setdefault(key.test_type, []).append(key.test_name)
+            else:
+                test_types.setdefault(key.test_type, {})[key.test_name] = params
+
+        return app2test_dict
+
+    def get_rtinfo(self):
+        """
+        RT framework information overview, computed once.
+
+        Args:
+            None
+
+        Return (dict): Number of unique builds ('builds'), of (build, test type) categories
+        ('categories'), of tests summed over the builds ('tests') & the unique tests ('unique_tests').
+
+        """
+        if self.rtinfo is None:
+            self.rtinfo = {'builds': len(self.by_combo),
+                           'categories': len({(key.app, key.physics_suite, key.test_type) for key in self.keys}),
+                           'tests': len({(key.app, key.physics_suite, key.test_name) for key in self.keys}),
+                           'unique_tests': set(self.by_test)}
+
+        return self.rtinfo
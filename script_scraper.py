@@ -1,11 +1,83 @@
 import os
-import regex as re
-import pandas as pd
 import re
-from itertools import islice, chain
+import pandas as pd
+import numpy as np
 import csv
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from map_storage import MapStorage
+from namelist_parser import NamelistParser
+from rt_table import RTTable
+
+# Version of the scrape cache's preprocessed content. Caches of other versions are re-scraped.
+SCRAPE_CACHE_VERSION = 2
+
+# Version of the rt.conf cache's parsed content. Caches of other versions are re-parsed.
+RT_CONF_CACHE_VERSION = 1
+
+# Build options of a rt.conf COMPILE line, in either the CMake (e.g. '-DAPP=ATM -DCCPP_SUITES=FV3_GFS_v16
+# -DDEBUG=ON') or the legacy (e.g. 'APP=ATM SUITES=FV3_GFS_v16 DEBUG=Y') form.
+RT_CONF_APP_PATTERN = re.compile(r'(?:^|\s)(?:-D)?APP=(\S+)')
+RT_CONF_SUITES_PATTERN = re.compile(r'(?:^|\s)(?:-DCCPP_)?SUITES=(\S+)')
+RT_CONF_DEBUG_PATTERN = re.compile(r'(?:^|\s)(?:-D)?DEBUG=(?:ON|Y|YES|TRUE|1)(?:\s|$)', re.IGNORECASE)
+
+# rt.conf & its platform variants (e.g. rt_gnu.conf) w/in the /tests folder.
+RT_CONF_FN_PATTERN = re.compile(r'rt(?:_\w+)?\.conf')
+
+# UFS application, physics suites & test type of the tests following a rt.conf COMPILE line.
+CompileConfig = namedtuple('CompileConfig', ['app', 'physics_suites', 'test_type'])
+
+# Commands transferring data files w/in the /fv3_conf files.
+TRANSFER_VERBS = frozenset(['cp', 'ln', 'rsync', 'mv'])
+
+# Flags taking an argument per transfer command. Short flags may be combined w/ others or
+# joined w/ their argument (e.g. '-rt INPUT', '-tINPUT') & long flags may be joined by '='
+# (e.g. '--exclude=*.log'); otherwise the next token is the argument.
+TARGET_DIR_FLAGS = frozenset(['-t', '--target-directory'])
+COREUTILS_ARG_FLAGS = TARGET_DIR_FLAGS | frozenset(['-S', '--suffix'])
+TRANSFER_ARG_FLAGS = {'cp': COREUTILS_ARG_FLAGS,
+                      'ln': COREUTILS_ARG_FLAGS,
+                      'mv': COREUTILS_ARG_FLAGS,
+                      'rsync': frozenset(['-e', '--rsh', '-f', '--filter', '-B', '--block-size', '-T', '--temp-dir',
+                                          '-M', '--remote-option', '--rsync-path', '--exclude', '--include',
+                                          '--exclude-from', '--include-from', '--files-from', '--partial-dir',
+                                          '--compare-dest', '--copy-dest', '--link-dest', '--backup-dir', '--suffix',
+                                          '--chmod', '--chown', '--usermap', '--groupmap', '--bwlimit', '--max-size',
+                                          '--min-size', '--max-delete', '--modify-window', '--timeout', '--contimeout',
+                                          '--port', '--sockopts', '--log-file', '--log-file-format', '--out-format',
+                                          '--password-file', '--skip-compress', '--compress-level', '--checksum-choice',
+                                          '--write-batch', '--only-write-batch', '--read-batch', '--protocol',
+                                          '--outbuf', '--iconv'])}
+
+# Parent folders for which data files are being sourced & transferred to PTMP.
+DATA_DIR_PREFIXES = ('@[INPUTDATA_ROOT_WW3]', 
+                     '@[INPUTDATA_ROOT_BMIC]', 
+                     '@[INPUTDATA_ROOT]',
+                     '${FILEDIR}',
+                     '${PATHRT}',
+                     '${FV3_IC}',
+                     '${MOM_IC}',
+                     '${ICE_IC}',
+                     '../',
+                     '$RFILE')
+
+# Shell tokens of a command line: trailing comments, command separators (e.g. ';', '&&', '|') 
+# & words, which may be partially or fully quoted.
+TOKEN_PATTERN = re.compile(r"""(?P<comment>#.*)|(?P<sep>[;&|]+)|(?P<word>(?:"[^"]*"|'[^']*'|[^\s"';&|])+)""")
+REDIRECT_PATTERN = re.compile(r'^\d*[<>]')
+QUOTE_PATTERN = re.compile(r"""["']""")
+
+# Root variable a path is relative to (e.g. '@[INPUTDATA_ROOT]', '${FILEDIR}', '$RFILE', '../').
+ROOT_VAR_PATTERN = re.compile(r'^(?:@\[(?P<bracket>[^\]]+)\]|\$\{(?P<brace>[^}]+)\}|\$(?P<nobrace>\w+)|(?P<cwd>\.\./))')
+
+# Variables called within a config. file's text (e.g. '@[INPUTDATA_ROOT]', '${FV3_IC}').
+BRACKET_VAR_PATTERN = re.compile(r'(?<=\[).+?(?=\])')
+BRACE_VAR_PATTERN = re.compile(r'(?<=\{).+?(?=\})')
+
+# Structured data transfer command of a /fv3_conf file line.
+TransferCmd = namedtuple('TransferCmd', ['verb', 'flags', 'sources', 'dest', 'root_vars'])
 
 
 class ScriptScraper():
@@ -14,26 +86,48 @@ class ScriptScraper():
     required per unique UFS application-to-physics build per unique reqression test.
     
     """
-    def __init__(self, local_repo_folder):
+    def __init__(self, local_repo_folder, workers=1, scrape_cache=None, profiler=None):
 
         # Main reference table featuring apps-to-physics_suite builds & their associated tests. 
-        # Extracted from main script file, rt.conf, to reference.
+        # Extracted from main script file, rt.conf, to reference. Set to a rt.conf file (e.g.
+        # f'{local_repo_folder}/tests/rt.conf') to read the builds & tests from it directly.
         self.main_reference = "AppSuiteCombo2Test.csv"
         
-        #*TODO: Since NOAA's dev team makes revisions to rt.conf & remove/add /tests/tests files. Will have to
-        # read directly from the rt.conf file & set to "main_reference" for the mapping of UFS app-to-tests 
-        #self.main_reference = '101821/ufs-weather-model-develop/ufs-weather-model-develop/tests/rt.conf'
-        
         # Files comprised of info. regarding UFS apps & tests relationship to datasets.
         self.local_repo_folder = local_repo_folder
         self.ufs_tests_root_dir = '/tests'
         self.test_scripts_dir = f'{self.local_repo_folder}{self.ufs_tests_root_dir}/tests'
         self.fv3_conf_dir = f'{self.local_repo_folder}{self.ufs_tests_root_dir}/fv3_conf'
         self.parm_conf_dir = f'{self.local_repo_folder}{self.ufs_tests_root_dir}/parm'
+        self.default_vars_fn = f'{self.local_repo_folder}{self.ufs_tests_root_dir}/default_vars.sh'
+        
+        # Tokenizer of the namelists set within the /parm files.
+        self.namelist_parser = NamelistParser()
         self.input_data_dirs = [self.test_scripts_dir, 
                                 self.fv3_conf_dir, 
                                 self.parm_conf_dir]
         
+        # Number of processes scraping the config. files. Set to None to use all CPUs.
+        self.workers = workers or os.cpu_count()
+        
+        # Pickle file (excluding '.pkl' ext) caching each config. file's preprocessed content
+        # between scrapes, so that only changed, added or deleted files are re-parsed.
+        self.scrape_cache = scrape_cache
+
+        # Pickle file (excluding '.pkl' ext) caching each rt.conf file's parsed tests & the parsed
+        # COMPILE lines by hash, so that rt.conf is only re-parsed once changed. Kept alongside
+        # the scrape cache.
+        self.rt_conf_cache = f'{scrape_cache}_rt_conf' if scrape_cache is not None else None
+        self.rt_conf_files = None
+        self.compile_configs = {}
+
+        # Optional StageProfiler recording each public method's wall & CPU time, files, lines,
+        # Bytes read & peak RSS. Methods are left uninstrumented if None.
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self)
+            profiler.instrument(self.namelist_parser)
+        
     def read_appsphys2test(self):
         """
         Reads lines comprised of application-to-physics suite builds & their associated tests.
@@ -42,9 +136,11 @@ class ScriptScraper():
             None
             
         Return (list): List of raw text containing application-to-physics 
-        suite build & test names.
+        suite build & test names. Read via 'read_rt_conf()' if 'main_reference' is a rt.conf file.
             
         """
+        if self.main_reference.endswith('.conf'):
+            return self.read_rt_conf([self.main_reference])
         
         # Extract apps-to-physics_suite build & test names.
         ref_txt = []
@@ -58,19 +154,165 @@ class ScriptScraper():
 
         return ref_txt
 
-    def nested_dict(self):
+    def list_rt_conf_files(self):
         """
-        Subroutine to generate nested dictionary from nested list of texts.
+        Locate rt.conf & its platform variants (e.g. rt_gnu.conf) w/in the repo's /tests folder.
         
-        Args: 
+        Args:
+            None
+            
+        Return (list): Paths of the rt.conf files, w/ rt.conf first.
+        
+        """
+        rt_conf_dir = f'{self.local_repo_folder}{self.ufs_tests_root_dir}'
+
+        return sorted(os.path.join(rt_conf_dir, fn) for fn in os.listdir(rt_conf_dir) if RT_CONF_FN_PATTERN.fullmatch(fn))
+
+    def parse_compile_line(self, build_opts):
+        """
+        Parse the build options of a rt.conf COMPILE line, once per unique set of options.
+        
+        Args:
+            build_opts (str): Build options (e.g. '-DAPP=ATM -DCCPP_SUITES=FV3_GFS_v16,FV3_GFS_v16_flake').
+            
+        Return (CompileConfig): UFS application, physics suites & test type ('debug_tests' if 
+        built w/ DEBUG, else 'tests') of the build. Builds w/o physics suites (e.g. NG-GODAS)
+        have a single empty physics suite.
+        
+        """
+        key = hashlib.sha1(build_opts.encode()).hexdigest()
+        if key not in self.compile_configs:
+            app = RT_CONF_APP_PATTERN.search(build_opts)
+            suites = RT_CONF_SUITES_PATTERN.search(build_opts)
+            self.compile_configs[key] = CompileConfig(app.group(1) if app else '',
+                                                      tuple(suites.group(1).split(',')) if suites else ('',),
+                                                      'debug_tests' if RT_CONF_DEBUG_PATTERN.search(build_opts) else 'tests')
+
+        return self.compile_configs[key]
+
+    def is_on_platform(self, machines, platform):
+        """
+        Whether a rt.conf line runs on a platform, per its machines field (i.e. '- <machines>'
+        excludes & '+ <machines>' is limited to the listed machines).
+        
+        Args:
+            machines (str): Machines field of the line (e.g. '- wcoss_cray jet.intel').
+            platform (str): Platform (e.g. 'hera.intel', or 'hera' for all of its compilers).
+                            If None, every line runs.
+            
+        Return (bool): Whether the line runs on the platform.
+        
+        """
+        machines = machines.split()
+        if platform is None or not machines or machines[0] not in ('+', '-'):
+            return True
+        listed = any(machine == platform or machine.startswith(platform + '.') for machine in machines[1:])
+
+        return listed if machines[0] == '+' else not listed
+
+    def stream_rt_conf(self, lines, platform=None):
+        """
+        Stream the COMPILE & RUN lines of a rt.conf file into its regression tests. Each RUN line
+        belongs to the build of the preceding COMPILE line.
+        
+        Args:
+            lines (iterable): Lines of the rt.conf file.
+            platform (str): Platform to which the lines are limited (e.g. 'hera.intel'). If None,
+                            all lines are read.
+            
+        Return (generator): (app, physics suite, test type, test name) per RUN line & physics
+        suite of its build.
+        
+        """
+        config = None
+        for line in lines:
+            fields = [field.strip() for field in line.split('|')]
+            if fields[0] == 'COMPILE':
+
+                # The build options are the field setting the app, followed by the machines field.
+                opts_idx = next((idx for idx, field in enumerate(fields) if 'APP=' in field), None)
+                machines = fields[opts_idx + 1] if opts_idx is not None and opts_idx + 1 < len(fields) else ''
+                config = None
+                if opts_idx is not None and self.is_on_platform(machines, platform):
+                    config = self.parse_compile_line(fields[opts_idx])
+            elif fields[0] == 'RUN' and config is not None and len(fields) > 1 and fields[1]:
+                if self.is_on_platform(fields[2] if len(fields) > 2 else '', platform):
+                    for physics_suite in config.physics_suites:
+                        yield config.app, physics_suite, config.test_type, fields[1]
+
+    def read_rt_conf_cache(self):
+        """
+        Reads the rt.conf cache.
+        
+        Args:
             None
             
-        Return (dict): Nested dictionary. 
+        Return (dict): Map of each (rt.conf file, platform) to its (size, mtime, content hash,
+        parsed tests). Empty if no cache exists or if the cache is of a different version.
+        Restores the cached COMPILE line configs.
+        
+        """
+        if self.rt_conf_cache is None or not os.path.exists(self.rt_conf_cache + '.pkl'):
+            return {}
+        cache = self.read_pickle(self.rt_conf_cache)
+        if cache.get('version') != RT_CONF_CACHE_VERSION:
+            return {}
+        self.compile_configs.update(cache['compile_configs'])
+
+        return cache['files']
+
+    def read_rt_conf(self, rt_conf_fns=None, platform=None):
+        """
+        Reads the application-to-physics suite builds & their associated tests directly from
+        rt.conf & its platform variants.
+        
+        Args:
+            rt_conf_fns (list): rt.conf files. Default reads 'list_rt_conf_files()'.
+            platform (str): Platform to which the tests are limited (e.g. 'hera.intel'). If None,
+                            the tests of all platforms are read.
+            
+        Return (list): List of raw text containing application-to-physics suite build & test 
+        names (i.e. as 'read_appsphys2test()'), w/ the tests of each build & test type merged
+        across the files in order of first occurrence.
         
-        Note: Method is called by 'convert_ist2dict()' method.
+        Files whose size & mtime (or content hash) are unchanged since the previous read, in
+        this process or per 'rt_conf_cache', are not re-parsed.
         
         """
-        return defaultdict(self.nested_dict)
+        if rt_conf_fns is None:
+            rt_conf_fns = self.list_rt_conf_files()
+        if self.rt_conf_files is None:
+            self.rt_conf_files = self.read_rt_conf_cache()
+
+        # Re-parse only the changed & added files. Files w/ a new mtime are compared by content hash.
+        combos = {}
+        is_stale = False
+        for fn in rt_conf_fns:
+            file_key = (os.path.abspath(fn), platform)
+            stat = os.stat(fn)
+            file_stat = (stat.st_size, stat.st_mtime_ns)
+            cached = self.rt_conf_files.get(file_key)
+            digest = None
+            if cached is not None and cached[:2] != file_stat:
+                digest = self.get_file_digest(fn)
+            if cached is not None and (cached[:2] == file_stat or cached[2] == digest):
+                rt_keys = cached[3]
+                self.rt_conf_files[file_key] = file_stat + cached[2:]
+            else:
+                with open(fn, mode='r') as file:
+                    rt_keys = list(dict.fromkeys(self.stream_rt_conf(file, platform)))
+                self.rt_conf_files[file_key] = file_stat + (digest or self.get_file_digest(fn), rt_keys)
+            is_stale |= cached is None or cached[:2] != file_stat
+            for app, physics_suite, test_type, test_name in rt_keys:
+                combos.setdefault((app, physics_suite, test_type), {})[test_name] = None
+
+        # Record rt.conf cache.
+        if self.rt_conf_cache is not None and is_stale:
+            self.save2pickle({'version': RT_CONF_CACHE_VERSION, 
+                              'files': self.rt_conf_files, 
+                              'compile_configs': self.compile_configs}, self.rt_conf_cache)
+
+        return [list(combo) + list(test_names) for combo, test_names in combos.items()]
 
     def convert_list2dict(self, ref_txt):
         """
@@ -85,12 +327,26 @@ class ScriptScraper():
         """
         
         # Create nested dictionary of list of raw text.
-        nested = self.nested_dict()
+        nested = {}
         for k in ref_txt:
-            nested[k[0]][k[1]].update({k[2]: list(k[3:])})
+            nested.setdefault(k[0], {}).setdefault(k[1], {})[k[2]] = list(k[3:])
 
         return nested
 
+    def get_rt_table(self, ref_txt):
+        """
+        Build the flat table of regression tests per UFS application-to-physics suite build.
+        
+        Args:
+            ref_txt (list): List of raw text containing UFS application-to-physics 
+                            suite build & regression test names.
+
+        Return (RTTable): Table keyed by (app, physics suite, test type, test name) w/ reverse
+        indexes per app, physics suite, build, test type & test.
+
+        """
+        return RTTable.from_ref_txt(ref_txt)
+
     def get_app2test(self, nested_dict):
         """
         Restructure app2test nested dictionary.
@@ -116,32 +372,22 @@ class ScriptScraper():
             RT framework information overview.
 
         Args:
-            appsphys2test_dict (dict): Reconfigured nested dictionary of the nested
+            appsphys2test_dict (dict, RTTable): Reconfigured nested dictionary of the nested
             list of texts  ("ref_txt") consisting of the apps-to-physics_suite build to
-            their corresponding tests.
+            their corresponding tests, or the flat table of 'get_rt_table()'.
 
         Return: None
 
         """
         
-        # Initialize counters for total UFS app-to-physics suite builds & tests.
-        app2phys_counter = 0
-        cat_counter = 0
-        test_counter = 0
-        unique_tests = []
-        for k,v in appsphys2test_dict.items():
-            app2phys_counter = len(appsphys2test_dict.keys())
-            cat_counter += len(v)
-            
-            # Extract test names per UFS App-to-Physics Suite build.
-            test_names = [test for test in v.values()]
-            test_names = set(list(chain.from_iterable(test_names)))
-            unique_tests.append(test_names)
-            
-            # Total tests for all UFS App-to-Physics Suite builds.
-            test_counter += len(test_names)    
-            
-        unique_tests = set(list(chain.from_iterable(unique_tests)))
+        # Counts of the UFS app-to-physics suite builds & tests, computed in a single pass.
+        if not isinstance(appsphys2test_dict, RTTable):
+            appsphys2test_dict = RTTable.from_app2test(appsphys2test_dict)
+        rtinfo = appsphys2test_dict.get_rtinfo()
+        app2phys_counter = rtinfo['builds']
+        cat_counter = rtinfo['categories']
+        test_counter = rtinfo['tests']
+        unique_tests = rtinfo['unique_tests']
         print(f"Total unique UFS App-to-Physics Suite builds:\n {app2phys_counter}\n")
         print(f"Total number of tests (if performing tests for all UFS App-to-Physics Suite builds):\n {test_counter}\n")
         print(f"Total unique tests overall (per current rt.conf):\n {len(unique_tests)}\n")
@@ -150,6 +396,65 @@ class ScriptScraper():
         
         return
 
+    def list_config_files(self, config_folder):
+        """
+        Lists the files within a configuration folder in a deterministic order.
+        
+        Args:
+            config_folder (str): Configuration folder (e.g. /parm, /fv3_conf).
+            
+        Return (list): Sorted paths of the files within the configuration folder.
+        
+        """
+        with os.scandir(config_folder) as it:
+            file_paths = sorted(item.path for item in it if item.is_file())
+
+        return file_paths
+
+    def map_files(self, func, *iterables):
+        """
+        Applies a per-file function serially or across a pool of processes.
+        
+        Args:
+            func (callable): Per-file function (e.g. 'process_config_file()').
+            iterables (iterable): Arguments of 'func' per file.
+            
+        Return (list): Results of 'func' in the order of the given files.
+        
+        Results are returned in the order of the files regardless of which worker
+        completes first, so the merged output is identical to a serial scrape.
+        
+        """
+        iterables = [list(x) for x in iterables]
+        n_files = len(iterables[0]) if iterables else 0
+        if self.workers <= 1 or n_files <= 1:
+            return list(map(func, *iterables))
+        
+        # Partition files into chunks to amortize inter-process communication.
+        chunksize = max(1, n_files // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=min(self.workers, n_files)) as executor:
+            if self.profiler is not None:
+                # Stages run by the workers are added to the profiler's stages.
+                return self.profiler.map_in_workers(executor, func, *iterables, chunksize=chunksize)
+            results = list(executor.map(func, *iterables, chunksize=chunksize))
+
+        return results
+
+    def read_raw_file(self, file_path):
+        """
+        Reads a file & partitions its text line-by-line.
+        
+        Args:
+            file_path (str): Path of the file.
+            
+        Return (list): Lines of the file.
+        
+        """
+        with open(file_path, "r") as file:
+            raw_txt_list = [line for line in file]
+
+        return raw_txt_list
+
     def read_raw_filenames(self):
         """
         Reads raw text comprised of information regarding the data files required by each regression test.
@@ -169,36 +474,177 @@ class ScriptScraper():
         # Extract raw test from /parm, /fv3_conf, and /tests folder comprised of config. files.
         raw_data_dict = {}
         for config_folder in self.input_data_dirs:
-
-            # Clear dict for each config. folder
-            raw_txt_dict = {}
             
-            # Locate & record only files.
-            for item in os.scandir(config_folder):
-                if item.is_file(): 
-                    
-                    # Read each file and partition text line-by-line.
-                    idx = 0
-                    raw_txt_list =[]
-                    file = open(config_folder + '/' + item.name,"r")
-                    for line in file:
-                        raw_txt_list.append(line)
-                    
-                    # Raw text per files in /parm, /fv3_conf, and /tests.
-                    raw_txt_dict[item.name] = raw_txt_list
+            # Read each file and partition text line-by-line.
+            file_paths = self.list_config_files(config_folder)
+            raw_txt_lists = self.map_files(self.read_raw_file, file_paths)
             
-
             # Dictionary of all text in /parm, /fv3_conf, and /tests.
-            raw_data_dict[os.path.basename(config_folder)] = raw_txt_dict
+            raw_data_dict[os.path.basename(config_folder)] = {os.path.basename(fp): raw_txt_list 
+                                                              for fp, raw_txt_list in zip(file_paths, raw_txt_lists)}
 
         return raw_data_dict
+
+    def extract_tests_txt(self, lines):
+        """
+        Extracts the lines setting the config. params and CNTL directory from a /tests file.
+        
+        Args:
+            lines (iterator): Lines of a /tests script file.
+            
+        Return (list): Relevant text of the /tests file, as expected by 'preprocess_tests()'.
+        
+        Only the lines following the first 'export_' method call which set a variable or call
+        a 'default_vars.sh' method are kept, since they are the only lines 'preprocess_tests()'
+        maps to test parameters.
+        
+        """
+        relevant_txt = []
+        cntl_dir = ''
+        lines = iter(lines)
+        for line in lines:
+            line = line.lstrip()
+            
+            # Extract baseline dataset folder. 
+            if "CNTL_DIR" in line:
+                cntl_dir = line
+                
+            # Extract variables required for test's config files.
+            if "export_" in line:
+                default_method = line
+                remaining_txt = [x for x in lines if "=" in x or "export_" in x]
+                relevant_txt.append(cntl_dir + default_method + "".join(remaining_txt))
+                break
+
+        return relevant_txt
+
+    def extract_fv3_txt(self, lines, prefix_list):
+        """
+        Extracts the lines copying, moving, syncing, or linking data files from a /fv3_conf file.
+        
+        Args:
+            lines (iterator): Lines of a /fv3_conf file.
+            prefix_list (list): Commands transferring data files (e.g. 'cp', 'ln').
+            
+        Return (list): Lines transferring data files.
+        
+        """
+        prefix_tuple = tuple(prefix_list)
+        line_txt_list = []
+        for line in lines:
+            line = line.lstrip()
+            if line.startswith(prefix_tuple):
+                line_txt_list.append(line)
+
+        return line_txt_list
+
+    def extract_parm_txt(self, lines):
+        """
+        Extracts the data filenames set to namelist variables within a /parm file.
+        
+        Args:
+            lines (iterator): Lines of a /parm file.
+            
+        Return (list): Unique data filenames mentioned within the /parm file, in order of
+        appearance.
+        
+        Lines are tokenized once by the namelist parser, which filters out comments, handles 
+        array values continued over several lines & lists of filenames set as a single comma 
+        delimited string (e.g. MOM6 parameter files).
+        
+        """
+        files4parm = {}
+        for record in self.namelist_parser.parse(lines):
+            if record.is_file:
+                files4parm.setdefault(record.value, None)
+
+        return list(files4parm)
+
+    def scrape_config_file(self, config_type, file_path, prefix_list=['cp', 'mv', 'rsync', 'ln']):
+        """
+        Streams a single configuration file line-by-line through the extractor of its folder.
+        
+        Args:
+            config_type (str): Folder of the configuration file. Options: 'tests', 'fv3_conf', 'parm'.
+            file_path (str): Path of the configuration file.
+            prefix_list (list): Commands transferring data files within /fv3_conf files.
+            
+        Return (list): Relevant text extracted from the configuration file.
+        
+        """
+        with open(file_path, "r") as file:
+            if config_type == 'tests':
+                return self.extract_tests_txt(file)
+            if config_type == 'fv3_conf':
+                return self.extract_fv3_txt(file, prefix_list)
+            
+            return self.extract_parm_txt(file)
+
+    def process_config_file(self, config_type, file_path, prefix_list=['cp', 'mv', 'rsync', 'ln']):
+        """
+        Scrapes & preprocesses a single configuration file.
+        
+        Args:
+            config_type (str): Folder of the configuration file. Options: 'tests', 'fv3_conf', 'parm'.
+            file_path (str): Path of the configuration file.
+            prefix_list (list): Commands transferring data files within /fv3_conf files.
+            
+        Return (dict, list): Test parameters of a /tests file, source-to-destination paths of
+        data files of a /fv3_conf file, or data filenames of a /parm file.
+        
+        """
+        fn = os.path.basename(file_path)
+        config_txt = self.scrape_config_file(config_type, file_path, prefix_list)
+        if config_type == 'tests':
+            return self.preprocess_tests({fn: config_txt})[fn]
+        if config_type == 'fv3_conf':
+            return self.preprocess_fv3({fn: config_txt})[fn]
+
+        return config_txt
     
+    def get_file_digest(self, file_path):
+        """
+        Computes the content hash of a file.
+        
+        Args:
+            file_path (str): Path of the file.
+            
+        Return (str): SHA-1 hex digest of the file's content.
+        
+        """
+        digest = hashlib.sha1()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def read_scrape_cache(self, prefix_list):
+        """
+        Reads the scrape cache of preprocessed config. files.
+        
+        Args:
+            prefix_list (list): Commands transferring data files within /fv3_conf files.
+            
+        Return (dict): Map of each config. file's (folder, filename) to its (size, mtime, 
+        content hash, preprocessed content). Empty if no cache exists or if the cache was
+        generated w/ a different 'prefix_list' or cache version.
+        
+        """
+        if self.scrape_cache is None or not os.path.exists(self.scrape_cache + '.pkl'):
+            return {}
+        cache = self.read_pickle(self.scrape_cache)
+        if cache.get('version') != SCRAPE_CACHE_VERSION or cache.get('prefix_list') != list(prefix_list):
+            return {}
+
+        return cache['files']
+
     def read_tests_fv3_parms(self, prefix_list = ['cp', 'mv', 'rsync','ln']):
         """
         Reads lines comprised of data filenames in the /fv3_conf, /parm, and /tests files.
         
         Args: 
-            None
+            prefix_list (list): Commands transferring data files within /fv3_conf files.
             
         Return (dict): Dictionary for referencing sets of input data files being used per test.
         
@@ -208,127 +654,88 @@ class ScriptScraper():
         variables overwriting the "default_vars.sh" variables required for the given regression
         test's configuration files.
         
+        Each file is opened once & streamed line-by-line through the extractor of its folder,
+        so only the relevant text of a single file is held in memory at a time. If 'workers' 
+        is greater than 1, files are scraped across a pool of processes & merged in sorted
+        filename order. If 'scrape_cache' is set, files whose size & mtime (or content hash)
+        are unchanged since the previous scrape are not re-parsed.
+        
         """
-        input_data_dict = {}
-        raw_data_dict = {}
 
         # Scan each folder (e.g. /parm, /fv3_conf) comprised of configuration files.
+        file_paths, config_types = [], []
         for config_folder in self.input_data_dirs:
-
-            # Clear dict for each config. folder
-            config_file_dict = {}
-            
-            # Read each /tests script file.
-            if os.path.basename(config_folder) == 'tests':
-
-                # Locate & record only files.
-                for item in os.scandir(config_folder):
-                    if item.is_file(): 
-                        file = open(config_folder + '/' + item.name, "r+")
-                        
-                        # Append only lines setting the config. params and CNTL directory.
-                        relevant_txt = []
-                        cntl_dir = ''
-                        for idx, line in enumerate(file):
-                            line = line.lstrip()
-                            
-                            # Extract baseline dataset folder. 
-                            if "CNTL_DIR" in line:
-                                cntl_dir = line
-                                
-                            # Extract variables required for test's config files.
-                            if "export_" in line:
-                                default_method = line
-                                relevant_txt.append(cntl_dir + default_method + "".join(islice(file, None)))
-      
-                        # Set all relevant text mentioned within given /tests script file.
-                        config_file_dict[item.name] = relevant_txt 
-
-                # Dictionary of text lines copying files.
-                input_data_dict[os.path.basename(config_folder)] = self.preprocess_tests(config_file_dict)
-
-            # Read each /fv3_conf file.
-            if os.path.basename(config_folder) == 'fv3_conf':
-
-                # Locate & record only files.
-                for item in os.scandir(config_folder):
-                    if item.is_file(): 
-                        line_num_list=[]
-                        line_txt_list=[]
-                        file = open(config_folder + '/' + item.name, "r")
-
-                        # Append only lines copying data files.
-                        for idx, line in enumerate(file):
-                            line = line.lstrip()
-                            if line.startswith(tuple(prefix_list)):
-                                line_num_list.append(idx + 1)
-                                line_txt_list.append(line.lstrip())
-
-                        # Without line numbers corresponding to copied input data files.
-                        config_file_dict[item.name] = line_txt_list 
-
-                        # Lines mentioning input data files in config. file
-                        #linenum2linetxt = dict(zip(line_num_list, line_txt_list))                             
-                        #config_file_dict[item.name] = linenum2linetxt
-
-                # Preprocess fv3 dictionary of text lines copying, sync, mv, ln files.
-                input_data_dict['fv3_conf'] = self.preprocess_fv3(config_file_dict)
-                input_data_dict[os.path.basename(config_folder)] = input_data_dict['fv3_conf']
-
-            # Read each /parm file.
-            if os.path.basename(config_folder) == 'parm':
-
-                # Locate & record only files.
-                for item in os.scandir(config_folder):
-                    if item.is_file(): 
-
-                        # Read each file.
-                        line_txt_list=[]
-                        file = open(config_folder + '/' + item.name, "r")
-
-                        # Append only lines setting/stating .ext files.
-                        # Filters out comments via removal of text after comment annotation, !.
-                        files4parm = []
-                        for idx, line in enumerate(file):
-                            line = line.lstrip()
-                            
-                            # Append only non-commented txt mentioning data files.
-                            if line.startswith("!")==False and "!" in line and "=" in line:
-                                x_noncomment_idx = line.index("!")
-                                line = line[:x_noncomment_idx+1]   
-                                for x in line.split():
-                                    files4line = []
-                                    
-                                    # Create list per line as some parm files will set to list of more than one 
-                                    # filename. NOTE: MOM6 list of parm files are not delimited by spaces 
-                                    # between commas.
-                                    x = x.split(",")
-                                    for x_sep in x:
-                                        if any(r in x_sep for r in ['.nc', '.grib', '.grb']):
-                                            files4line.append(x_sep.replace("'", "").replace('"', '').replace(",", ""))
-                                            files4parm.append(files4line)
-                                
-                            elif line.startswith("!")==False and '=' in line: 
-                                for x in line.split():
-                                    files4line = []
-
-                                    # Create list per line as some parm files will set to list of more than one
-                                    # filename. NOTE: MOM6 list of parm files are not delimited by spaces between
-                                    # commas.
-                                    x = x.split(",")
-                                    for x_sep in x:
-                                        if any(r in x_sep for r in ['.nc', '.grib', '.grb']):
-                                            files4line.append(x_sep.replace("'", "").replace('"', '').replace(",", ""))
-                                            files4parm.append(files4line)
-
-                        # Set all relevant text mentioned within given /parm script file.
-                        config_file_dict[item.name] = list(map(''.join, files4parm))
-
-                # Dictionary of text lines setting namelist variables to a data filename.
-                input_data_dict[os.path.basename(config_folder)] = config_file_dict
+            folder_paths = self.list_config_files(config_folder)
+            file_paths += folder_paths
+            config_types += [os.path.basename(config_folder)] * len(folder_paths)
+
+        # Reuse cached content of files which are unchanged since the previous scrape. Files
+        # w/ a new mtime (e.g. a fresh checkout) are compared by content hash.
+        cache = self.read_scrape_cache(prefix_list)
+        file_keys, file_stats, file_digests, results = [], [], [], []
+        stale_idx = []
+        for idx, (config_type, file_path) in enumerate(zip(config_types, file_paths)):
+            file_key = (config_type, os.path.basename(file_path))
+            stat = os.stat(file_path)
+            file_stat = (stat.st_size, stat.st_mtime_ns)
+            cached = cache.get(file_key)
+            digest = None
+            if cached is not None and cached[:2] != file_stat:
+                digest = self.get_file_digest(file_path)
+            if cached is not None and (cached[:2] == file_stat or cached[2] == digest):
+                file_digests.append(cached[2])
+                results.append(cached[3])
+            else:
+                file_digests.append(digest)
+                results.append(None)
+                stale_idx.append(idx)
+            file_keys.append(file_key)
+            file_stats.append(file_stat)
+
+        # Scrape only the changed & added files.
+        stale_results = self.map_files(self.process_config_file, 
+                                       [config_types[idx] for idx in stale_idx], 
+                                       [file_paths[idx] for idx in stale_idx], 
+                                       [prefix_list] * len(stale_idx))
+        for idx, result in zip(stale_idx, stale_results):
+            results[idx] = result
+
+        # Record scrape cache, dropping deleted files.
+        if self.scrape_cache is not None:
+            for idx in stale_idx:
+                if file_digests[idx] is None:
+                    file_digests[idx] = self.get_file_digest(file_paths[idx])
+            files = {file_key: file_stat + (digest, result)
+                     for file_key, file_stat, digest, result in zip(file_keys, file_stats, file_digests, results)}
+            self.save2pickle({'version': SCRAPE_CACHE_VERSION, 'prefix_list': list(prefix_list), 'files': files}, self.scrape_cache)
+
+        # Test parameters per /tests file, source-to-destination paths of data files per /fv3_conf
+        # file & data filenames set to namelist variables per /parm file.
+        input_data_dict = {'tests': defaultdict(dict), 'fv3_conf': {}, 'parm': {}}
+        for (config_type, fn), result in zip(file_keys, results):
+            input_data_dict[config_type][fn] = result
 
         return input_data_dict
     
+    def read_parm_records(self):
+        """
+        Reads the data filenames set to namelist variables within each /parm file.
+        
+        Args:
+            None
+            
+        Return (pd.DataFrame): Table of each /parm file's namelist group, variable & data 
+        filename, for joining the /parm files' data files to the input data inventory.
+        
+        """
+        file_paths = self.list_config_files(self.parm_conf_dir)
+        records_list = self.map_files(self.namelist_parser.parse_file, file_paths)
+        parm_records = [(os.path.basename(fp), r.group, r.variable, r.value)
+                        for fp, records in zip(file_paths, records_list)
+                        for r in records if r.is_file]
+
+        return pd.DataFrame.from_records(parm_records, columns=['Parm File', 'Group', 'Variable', 'Filename'])
+
     def get_unique_vars(self, input_data_dict, filetype):
         """
         Extract uniquely defined global variables set in the 'fv3_conf' or 'parm'
@@ -360,8 +767,8 @@ class ScriptScraper():
         for v in fv3_relevant_txt:
             for txt in v:
                 global_vars = []
-                txt_bracket = re.findall(r'(?<=\[).+?(?=\])', txt)
-                txt_para = re.findall(r'(?<=\{).+?(?=\})', txt)
+                txt_bracket = BRACKET_VAR_PATTERN.findall(txt)
+                txt_para = BRACE_VAR_PATTERN.findall(txt)
                 if txt_bracket != []:
                     fv3_global_vars.append(txt_bracket)
                 if txt_para != []:
@@ -370,6 +777,103 @@ class ScriptScraper():
 
         return unique_vars
 
+    def get_root_var(self, path):
+        """
+        Extracts the root variable of a data file's path.
+        
+        Args:
+            path (str): Path of a data file (e.g. '@[INPUTDATA_ROOT]/FV3_input_data/INPUT').
+            
+        Return (str): The root variable (e.g. 'INPUTDATA_ROOT', 'FILEDIR', 'RFILE') or '../' if the
+        path is relative to the parent of the user's CWD. None if the path is not relative to a
+        root variable.
+        
+        """
+        match = ROOT_VAR_PATTERN.match(path)
+        if match is None:
+            return None
+
+        return match.group('bracket') or match.group('brace') or match.group('nobrace') or match.group('cwd')
+
+    def tokenize_transfer_cmd(self, txt):
+        """
+        Tokenizes a line copying, linking, syncing, or moving data files.
+        
+        Args:
+            txt (str): Line of a /fv3_conf file.
+            
+        Return (TransferCmd): The command's verb (e.g. 'cp'), flags & their arguments (e.g. '-sf',
+        '-e', 'ssh'), source paths, destination path & the root variable of each source path.
+        None if the line is not a 'cp', 'ln', 'rsync', or 'mv' command.
+        
+        The line is tokenized once. Quotes are removed from the paths, trailing comments, 
+        redirections & any command chained after a separator (e.g. ';', '&&', '||') are 
+        ignored. Flags may be placed anywhere prior to '--' & the arguments of the verb's
+        TRANSFER_ARG_FLAGS are never operands. The last operand is the destination & all
+        preceding operands are sources, unless a target directory is given (e.g. '-t INPUT'),
+        in which case all operands are sources. A 'ln' of a single source links into the
+        current directory.
+        
+        """
+        verb = None
+        flags, operands = [], []
+        end_of_flags = skip_next = False
+        arg_flag = target_dir = None
+        for match in TOKEN_PATTERN.finditer(txt):
+            if match.lastgroup != 'word':
+                break
+            token = match.group('word')
+            if verb is None:
+                if token not in TRANSFER_VERBS:
+                    return None
+                verb = token
+            elif skip_next:
+                skip_next = False
+            elif arg_flag is not None:
+                # Argument of the preceding flag.
+                flags.append(token)
+                if arg_flag in TARGET_DIR_FLAGS:
+                    target_dir = QUOTE_PATTERN.sub('', token)
+                arg_flag = None
+            elif REDIRECT_PATTERN.match(token):
+                skip_next = REDIRECT_PATTERN.sub('', token).strip('<>&') == ''
+            elif token == '--' and not end_of_flags:
+                end_of_flags = True
+            elif token.startswith('--') and not end_of_flags:
+                flags.append(token)
+                flag, joined, arg = token.partition('=')
+                if flag in TRANSFER_ARG_FLAGS[verb]:
+                    if not joined:
+                        arg_flag = flag
+                    elif flag in TARGET_DIR_FLAGS:
+                        target_dir = QUOTE_PATTERN.sub('', arg)
+            elif token.startswith('-') and token != '-' and not end_of_flags:
+                flags.append(token)
+                for pos in range(1, len(token)):
+                    flag = '-' + token[pos]
+                    if flag in TRANSFER_ARG_FLAGS[verb]:
+                        # The rest of the token is the argument, if any, else the next token.
+                        arg = token[pos + 1:]
+                        if not arg:
+                            arg_flag = flag
+                        elif flag in TARGET_DIR_FLAGS:
+                            target_dir = QUOTE_PATTERN.sub('', arg)
+                        break
+            else:
+                operands.append(QUOTE_PATTERN.sub('', token))
+        if verb is None or not operands:
+            return None
+
+        # Partition operands into the source & destination paths.
+        if target_dir is not None:
+            sources, dest = operands, target_dir
+        elif len(operands) == 1:
+            sources, dest = operands, ('.' if verb == 'ln' else None)
+        else:
+            sources, dest = operands[:-1], operands[-1]
+
+        return TransferCmd(verb, tuple(flags), tuple(sources), dest, tuple(map(self.get_root_var, sources)))
+
     def preprocess_fv3(self, input_data_dict):
         """
         Maps source & destination of data files being transfered from on-prem disk to
@@ -399,18 +903,6 @@ class ScriptScraper():
                   from xml-to-json' script. 
                   
         """
-        
-        # Set parent folders for which data files are being sourced & transferred to PTMP. 
-        dir_prefix = ['@[INPUTDATA_ROOT_WW3]', 
-                      '@[INPUTDATA_ROOT_BMIC]', 
-                      '@[INPUTDATA_ROOT]',
-                      '${FILEDIR}',
-                      '${PATHRT}',
-                      '${FV3_IC}',
-                      '${MOM_IC}',
-                      '${ICE_IC}',
-                       '../',
-                      '$RFILE']
 
         # [Optional] If filtering to files residing in the 2021 S3 bucket to determine 
         # files w/ ext in each /tests file.
@@ -426,125 +918,29 @@ class ScriptScraper():
         #               'field_table_rasmgshoc', 'field_table_satmedmf',
         #               'field_table_thompson', 'field_table_wsm6', 'nml', 'qr_acr_qg',
         #               'qr_acr_qs', 'diag_table_mp', 'res', '*']
-
+        
         # Extract source (excluding "RESTART" paths) & destination paths of data files being copied, 
         # linked, moved, or synced from on-prem disk to experimental PTMP directory.
         fv3_conf_dict = {}
-        unique_bracket_root_folders = []
-        unique_brace_root_folders = []
-        unique_nobrace_root_folders = []
-        unique_cw_root_folders = []
         for fn, txt_list in input_data_dict.items():
-            source_path_list = []
-            dest_path_list = []
-            for txt in txt_list:
 
-                # Determine data files being copied, linked, moved, or synced 
-                # for the given /fv_conf file.
-                q = txt.split()
-                stamp_bracket = [i for i in q if i.startswith('@[')]
-                stamp_brace = [b for b in q if b.startswith('${')]
-                stamp_misc = [b for b in q if b.startswith('../')]
-                stamp_no_brace = [b for b in q if b.startswith('$')]
-
-                if stamp_bracket != []:
-                    t = re.findall(r'(?<=\[).+?(?=\])', stamp_bracket[0])
-                    unique_bracket_root_folders.append(t[0])
-                if stamp_brace != []:
-                    t = re.findall(r'(?<=\{).+?(?=\})', stamp_brace[0])
-                    unique_brace_root_folders.append(t[0])
-                if stamp_no_brace != []:
-                    t = re.findall(r'[^a-zA-Z]+', stamp_no_brace[0])
-                    unique_nobrace_root_folders.append(t[0].replace("{", ""))
-                if stamp_misc != []:
-                    unique_cw_root_folders.append('../')
-
-                # Locate & append any data files which are linked from
-                # source to destination & overwriting the destination 
-                # files -- if exist.
-                if txt.startswith('ln'):  
-                    ln_list = []
-                    for item in txt.split():
-                        ln_list.append(item)
-                    
-                    # Append linked data file's source path.
-                    source_path_list.append(ln_list[2])
-                    
-                    # Append linked data file's "destination" path.  
-                    dest_path_list.append(txt.split()[-1])
-
-                # Locate & append any data files which are synced
-                # from source to destination -- if exist.
-                elif txt.startswith('rsync'):  
-                    rsync_list = []
-                    for item in txt.split():
-                        rsync_list.append(item)
-                    
-                    # Append synced data file's source path.  
-                    source_path_list.append(rsync_list[2])
-                    
-                    # Append synced data file's "destination" path.  
-                    dest_path_list.append(txt.split()[-1])
-
-                # Locate & append any data files which are 
-                # transferred from source to destination -- if exist.
-                elif txt.startswith('mv'):  
-                    mv_list = []
-                    for item in txt.split():
-                        mv_list.append(item)
-
-                    # Append moved data file's source path.
-                    if mv_list[1].startswith("-"):
-                        source_path_list.append(mv_list[2])
-                    else: 
-                        source_path_list.append(mv_list[1])
-                    
-                    # Append moved data file's destination path.  
-                    dest_path_list.append(txt.split()[-1])
-                    
-                # Locate & append any data files which are 
-                # copied from source to destination.     
-                elif txt.startswith('cp'):     
-                    
-                    # Locate & append data files which are copied from
-                    # source to destination.
-                    for item in txt.split():
-                        if item.startswith(tuple(dir_prefix)): #& item.endswith(tuple(datatype_ext)):
-                            
-                            # Append copied data file's source paths.  
-                            source_path_list.append(item)
-                        
-                            # [Optional] Extracts all sourced data filenames
-                            # being copied to PTMP directory per test file.
-                            #source_path_list.append(os.path.basename(item))
-                            
-                    # Append copied data file's destination paths.       
-                    dest_path_list.append(txt.split()[-1])
-                    
-                else:
-                    
-                    continue
-                    
             # Generate 2nd level map of each data file's source-to-"destination" paths.
             fv3_conf_node2 = defaultdict(list)
-            for source_path, dest_path in zip(source_path_list, dest_path_list):
-                fv3_conf_node2[source_path].append(dest_path)
+            for txt in txt_list:
+                transfer_cmd = self.tokenize_transfer_cmd(txt)
+                if transfer_cmd is None or transfer_cmd.dest is None:
+                    continue
+                
+                # Only data files copied from parent folders of on-prem disk are mapped, whereas 
+                # all data files being linked, synced or moved are mapped.
+                for source_path in transfer_cmd.sources:
+                    if transfer_cmd.verb != 'cp' or source_path.startswith(DATA_DIR_PREFIXES):
+                        fv3_conf_node2[source_path].append(transfer_cmd.dest)
             
             # Generate map of each data file's source-to-"destination" paths for each unique 
             # '/fv3_conf' file.
             fv3_conf_dict[fn] = fv3_conf_node2
 
-        # Unique chars surrounding the parent foldernames of the data files
-        # being copied, synced, moved, or linked.
-        unique_bracket_root_folders = list(set(unique_bracket_root_folders))
-        unique_brace_root_folders = list(set(unique_brace_root_folders))
-        unique_nobrace_root_folders = list(set(unique_nobrace_root_folders))
-        unique_cw_root_folders = list(set(unique_cw_root_folders))
-        #print("/nUnique cwd parent folders:/n", unique_cw_root_folders)
-        #print("/nUnique bracket parent folders:/n", unique_bracket_root_folders)
-        #print("/nUnique brace parent folders:/n", unique_brace_root_folders)
-        #print("/nUnique no brace parent folders:/n", unique_nobrace_root_folders)
-
         return fv3_conf_dict
     
     def preprocess_tests(self, input_data_dict):
@@ -596,38 +992,48 @@ class ScriptScraper():
         /tests file.
 
         Args:
-            outer_dict (dict): The reconfigured nested dictionary mapping the 
+            outer_dict (dict, RTTable): The reconfigured nested dictionary mapping the 
                                UFS application-to-physics suite build to their 
-                               set of applicable set of regression tests. 
+                               set of applicable set of regression tests, or the flat
+                               table of 'get_rt_table()'. 
                                
             input_data_dict (dict): Dictionary for referencing sets of input data files being 
                                     used per regression test.
             
-        Return (dict): Dictionary associating UFS application-to-physics suite builds to
+        Return (dict, RTTable): Dictionary associating UFS application-to-physics suite builds to
         their regression tests and mapping each test with their required input data files,
-        baseline data files, and test parameters.
+        baseline data files, and test parameters. Returns the table w/ each test's parameters
+        attached if given a table.
                 
         """
         
-        # Incorporate each UFS app's corresponding test parameters, fv3_conf filename, & parm filename.
-        joined_test_dict = {}
-        for app2phys, val in outer_dict.items():
-            for test_type, test_names in val.items():
-                outer_dict[app2phys][test_type] = dict.fromkeys(test_names, {})
-                for v in test_names:
-                     outer_dict[app2phys][test_type][v] = input_data_dict['tests'][v]    
-                        
-        return outer_dict
+        # Incorporate each UFS app's corresponding test parameters, fv3_conf filename, & parm filename,
+        # w/o modifying the given map.
+        tests_dict = input_data_dict['tests']
+        if isinstance(outer_dict, RTTable):
+            return outer_dict.with_params(tests_dict)
+
+        # Tests w/o a /tests file get their own empty parameters, rather than one shared dictionary.
+        missing = {}
+        return {app2phys: {test_type: {v: tests_dict[v] if v in tests_dict else missing.setdefault(v, {}) for v in test_names}
+                           for test_type, test_names in val.items()}
+                for app2phys, val in outer_dict.items()}
     
-    def convert_dict2df(self, appsphys2test_dict):
+    def convert_dict2df(self, appsphys2test_dict, flatten_test_info=False, fn='./ufs_repo_mapped_data/rt_appsphys2test_df'):
         """
         Convert "appsphys2test_dict" to a dataframe.
 
         Args:
-            appsphys2test_dict (dict): Dictionary associating UFS application-to-physics 
+            appsphys2test_dict (dict, RTTable): Dictionary associating UFS application-to-physics 
                                        suite builds to their regression tests and mapping 
                                        each test with their required input data files, 
-                                       baseline data files, and test parameters.
+                                       baseline data files, and test parameters (or the
+                                       table of 'get_appsphys2testparams()').
+                                       
+            flatten_test_info (bool): If True, append a column per variable exported by the
+                                      regression tests' /tests files.
+                                      
+            fn (str): Filename of the pickle file to save the table to (excluding '.pkl' ext).
 
         Return (pd.DataFrame): Table associating UFS application-to-physics suite builds 
         to their regression tests and mapping each test with their required input data 
@@ -635,32 +1041,36 @@ class ScriptScraper():
 
         """
         
-        # Generate table from nested dictionary.
-        appsphys2test_df = pd.DataFrame.from_records([(node1, node2, node3, leaf, leaf['CNTL_DIR'], leaf['FV3_RUN'])
-                                                      for node1, node2_dict in appsphys2test_dict.items()
-                                                      for node2, node3_dict in node2_dict.items()
-                                                      for node3, leaf in node3_dict.items()],
-                                                     columns=['App-to-Phys', 
-                                                              'Test Type', 
-                                                              'Test Name', 
-                                                              'Test Info', 
-                                                              'CNTL Folder', 
-                                                              'FV3 File'])
-
-        # Append /parm filename if rq'd & set by the given regression test's /test file.
-        for idx, v in appsphys2test_df['Test Info'].items():
-            if 'INPUT_NML' in v:
-                appsphys2test_df.loc[idx, 'Parm File'] = v['INPUT_NML']
+        # Flatten nested dictionary (or table) into columns in a single pass.
+        if isinstance(appsphys2test_dict, RTTable):
+            records = [key + (leaf,) for key, leaf in appsphys2test_dict]
+        else:
+            records = [(app, physics_suite, test_type, test_name, leaf)
+                       for (app, physics_suite), node2_dict in appsphys2test_dict.items()
+                       for test_type, node3_dict in node2_dict.items()
+                       for test_name, leaf in node3_dict.items()]
+        apps, physics_suites, test_types, test_names, test_infos = [list(col) for col in zip(*records)] or [[]] * 5
+
+        # Generate table w/ categorical UFS application, physics suite & test type columns. The /parm 
+        # filename is only set if rq'd by the given regression test's /test file.
+        appsphys2test_df = pd.DataFrame({'UFS_App': pd.Categorical(apps),
+                                         'Physics_Suite': pd.Categorical(physics_suites),
+                                         'Test Type': pd.Categorical(test_types),
+                                         'Test Name': test_names,
+                                         'Test Info': test_infos,
+                                         'CNTL Folder': [leaf.get('CNTL_DIR') for leaf in test_infos],
+                                         'FV3 File': [leaf.get('FV3_RUN') for leaf in test_infos],
+                                         'Parm File': [leaf.get('INPUT_NML', np.nan) for leaf in test_infos]})
         
-        # Partition UFS application & physics suite.
-        appsphys2test_df[['UFS_App', 'Physics_Suite']] = pd.DataFrame(appsphys2test_df['App-to-Phys'].to_list(), 
-                                                                      index=appsphys2test_df.index)
-        appsphys2test_df.insert(0, 'UFS_App', appsphys2test_df.pop('UFS_App'))
-        appsphys2test_df.insert(1, 'Physics_Suite', appsphys2test_df.pop('Physics_Suite'))
-        appsphys2test_df = appsphys2test_df.drop(['App-to-Phys'], axis=1)
+        # Append each of the regression test's exported variables as a column.
+        if flatten_test_info:
+            test_params_df = pd.DataFrame.from_records([{var.strip(): val for var, val in leaf.items() if var != 'Test Info'} 
+                                                        for leaf in test_infos])
+            test_params_df = test_params_df.drop(columns=[col for col in test_params_df.columns if col in appsphys2test_df.columns])
+            appsphys2test_df = pd.concat([appsphys2test_df, test_params_df], axis=1)
 
         # Save table as a pickle file.      
-        self.save2pickle(appsphys2test_df, './ufs_repo_mapped_data/rt_appsphys2test_df')
+        self.save2pickle(appsphys2test_df, fn)
 
         return appsphys2test_df
 
@@ -694,4 +1104,36 @@ class ScriptScraper():
         with open(fn + '.pkl', 'rb') as file:
             data = pickle.load(file)
             
-        return data
\ No newline at end of file
+        return data
+
+    def save2columnar(self, data2save, fn, fmt='parquet'):
+        """
+        Save table to a columnar (Parquet/Feather) file. Falls back to a pickle 
+        file if pyarrow is not installed.
+        
+        Args:
+            data2save (pd.DataFrame): Table to save.
+            fn (str): Filename excluding the file's extension.
+            fmt (str): Storage format. Options: 'parquet', 'feather', 'pickle'.
+        
+        Return (str): Path of the saved file.
+        
+        """
+        return MapStorage(fmt).save(data2save, fn)
+    
+    def read_columnar(self, fn, columns=None, filters=None, fmt='parquet'):
+        """
+        Read requested columns & rows of a table saved via 'save2columnar()' or 'save2pickle()'.
+        
+        Args:
+            fn (str): Filename excluding the file's extension.
+            columns (list): Columns to read (e.g. ['Filename', 'Size (GB)']). Default reads
+                            all columns.
+            filters (list): Row filters as (column, operator, value) tuples 
+                            (e.g. [('Date', '==', '20220329')]).
+            fmt (str): Preferred storage format if saved in several formats.
+        
+        Return (pd.DataFrame): Table w/ the requested columns & rows.
+        
+        """
+        return MapStorage(fmt).read(fn, columns=columns, filters=filters)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from map_storage import MapStorage
+
+# Dimensions of the storage size cube: UFS application, physics suite, test type, test name,
+# baseline CNTL folder, dataset date & file format.
+CUBE_DIMS = ['UFS_App', 'Physics_Suite', 'Test Type', 'Test Name', 'CNTL Folder', 'Date', 'DataType']
+
+
+class StorageSizeCube():
+    """
+    Precomputed, deduplicated storage sizes of the data files w/in the merged UFS application-to-
+    regression test-to-data map, which roll up to any grouping of the cube's dimensions.
+
+    A data file referenced by several rows of a group (e.g. by several tests of an UFS application)
+    is counted once per group.
+
+    """
+    def __init__(self, fact_df):
+
+        # Unique (dimensions, file) combinations of the map & each file's size.
+        self.fact_df = fact_df
+        self.dims = [col for col in fact_df.columns if col not in ('File ID', 'Size (Bytes)')]
+
+    @classmethod
+    def from_map(cls, merged_bl2test, dims=CUBE_DIMS):
+        """
+        Build the cube from the merged map.
+
+        Args:
+            merged_bl2test (pd.DataFrame): Merged dataframes of the UFS application information derived
+            from rt.conf to the baseline (or input) data files.
+            dims (list): Dimensions of the cube. Dimensions absent from the map are skipped.
+
+        Return (StorageSizeCube): The cube.
+
+        """
+        dims = [dim for dim in dims if dim in merged_bl2test.columns]
+
+        # Identify each file by its relative directory & filename.
+        file_ids, _ = pd.factorize(merged_bl2test['Relative Directory'].astype(str) + '/'
+                                   + merged_bl2test['Filename'].astype(str))
+        fact_df = pd.DataFrame({dim: merged_bl2test[dim].astype('category').to_numpy() for dim in dims})
+        fact_df['File ID'] = file_ids.astype(np.int64)
+        fact_df['Size (Bytes)'] = merged_bl2test['Size (Bytes)'].to_numpy(dtype=np.int64)
+        fact_df = fact_df.drop_duplicates(dims + ['File ID'], ignore_index=True)
+
+        return cls(fact_df)
+
+    @classmethod
+    def read(cls, fn):
+        """
+        Read a cube saved via 'save()'.
+
+        Args:
+            fn (str): Filename excluding the file's extension.
+
+        Return (StorageSizeCube): The cube.
+
+        """
+        fact_df = MapStorage().read(fn)
+        for dim in fact_df.columns:
+            if dim not in ('File ID', 'Size (Bytes)'):
+                fact_df[dim] = fact_df[dim].astype('category')
+
+        return cls(fact_df)
+
+    def save(self, fn):
+        """
+        Save the cube alongside the map (Parquet if pyarrow is installed, pickle otherwise).
+
+        Args:
+            fn (str): Filename excluding the file's extension.
+
+        Return (str): Path of the saved file.
+
+        """
+        return MapStorage().save(self.fact_df, fn)
+
+    def rollup(self, by, filters=None):
+        """
+        Roll up the unique files' sizes to a grouping of the cube's dimensions.
+
+        Args:
+            by (str, list): Dimension(s) to group by (e.g. 'UFS_App', ['UFS_App', 'DataType']).
+                            An empty list totals all files.
+            filters (dict): Dimension to the value (or list of values) to keep prior to the
+                            roll up (e.g. {'Date': '20220329'}).
+
+        Return (pd.DataFrame): Number of unique files, total size (Bytes) & total size (GB)
+        per group.
+
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        fact_df = self.fact_df
+        for dim, vals in (filters or {}).items():
+            vals = [vals] if isinstance(vals, str) or not hasattr(vals, '__iter__') else vals
+            fact_df = fact_df[fact_df[dim].isin(vals)]
+
+        # Count each file once per group.
+        unique_df = fact_df[by + ['File ID', 'Size (Bytes)']].drop_duplicates(by + ['File ID'])
+        if not by:
+            sizes_df = pd.DataFrame({'Files': [len(unique_df)], 'Size (Bytes)': [unique_df['Size (Bytes)'].sum()]},
+                                    index=pd.Index(['Total']))
+        else:
+            sizes_df = unique_df.groupby(by, observed=True, dropna=False).agg(**{'Files': ('File ID', 'size'),
+                                                                                 'Size (Bytes)': ('Size (Bytes)', 'sum')})
+        sizes_df['Size (GB)'] = (sizes_df['Size (Bytes)'] / 1e9).round(1)
+
+        return sizes_df
@@ -0,0 +1,437 @@
+import os
+import json
+import time
+import types
+import inspect
+import cProfile
+import contextlib
+import pandas as pd
+
+# Peak RSS is read via getrusage, which is unavailable on Windows.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Methods reading a file per call & the position of their file path argument. Each call counts
+# the file & its size (Bytes) towards the stages running.
+FILE_ARG_METHODS = {'scrape_config_file': 1,
+                    'read_raw_file': 0,
+                    'get_file_digest': 0,
+                    'parse_file': 0,
+                    'read_pickle': 0}
+
+# Methods streaming the lines of a file as their first argument. Each line consumed counts
+# once towards each stage running, incl. when the lines are passed on to a nested method.
+LINE_ARG_METHODS = frozenset(['extract_tests_txt', 'extract_fv3_txt', 'extract_parm_txt', 'parse', 'stream_rt_conf'])
+
+# Columns of the report.
+REPORT_COLUMNS = ['Calls', 'Wall (s)', 'CPU (s)', 'Files', 'Lines', 'Bytes Read', 'Peak RSS (MB)']
+
+# Counts of the stages run by worker processes, which are also added to the stages running in
+# the parent process.
+WORKER_COUNT_COLUMNS = ['Files', 'Lines', 'Bytes Read']
+
+
+def get_peak_rss():
+    """
+    Peak resident set size of the process so far.
+
+    Args:
+        None
+
+    Return (float): Peak RSS (MB), or NaN if unavailable (e.g. on Windows).
+
+    """
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in KB on Linux & in Bytes on macOS.
+    return peak / 1e6 if os.uname().sysname == 'Darwin' else peak / 1e3
+
+
+def get_cpu_time():
+    """
+    CPU time of the process & its reaped child processes (e.g. a scraping process pool).
+
+    Args:
+        None
+
+    Return (float): User & system CPU time (s), or the process's own CPU time if getrusage
+    is unavailable.
+
+    """
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+
+
+class CountingLines():
+    """
+    Iterator over the lines of a file, counting the lines consumed towards the stages running.
+    Wrapping lines which are already counted only counts them towards the additional stages.
+
+    """
+    def __init__(self, lines, records):
+
+        # Lines of the file (e.g. a file object or another CountingLines).
+        self.lines = iter(lines)
+
+        # Stages counted by the wrapped lines (by ID, as records of equal counts compare equal).
+        counted = lines.counted if isinstance(lines, CountingLines) else set()
+        self.records = list({id(record): record for record in records if id(record) not in counted}.values())
+        self.counted = counted | {id(record) for record in self.records}
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self.lines)
+        for record in self.records:
+            record['Lines'] += 1
+        return line
+
+
+class InstrumentedMethod():
+    """
+    Bound method of an instrumented object, recorded as a stage of the profiler per call.
+
+    Pickles w/ its object & a copy of the profiler's settings (e.g. when sent to a scraping
+    process pool), so worker processes run instrumented & record into their own copy (see
+    'WorkerCall'). Generator methods (e.g. 'parse') are recorded while their items are consumed
+    rather than when called, inclusive of the consumer's time between items.
+
+    """
+    def __init__(self, profiler, name, method):
+
+        # Profiler recording the calls, name of the method's stage (e.g. 'ScriptScraper.parse_file')
+        # & the original bound method, whose docstring is kept.
+        self.profiler = profiler
+        self.name = name
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    def __call__(self, *args, **kwargs):
+        """
+        Call the method as a stage of the profiler.
+
+        Args:
+            args (tuple): Positional arguments of the method.
+            kwargs (dict): Keyword arguments of the method.
+
+        Return (object): Method's result, or a generator recording the stage while consumed
+        if the method is a generator function.
+
+        """
+        if inspect.isgeneratorfunction(self.method):
+            return self.consume(args, kwargs)
+        with self.profiler.stage(self.name):
+            return self.run(args, kwargs)
+
+    def consume(self, args, kwargs):
+        """
+        Yield the items of a generator method w/in its stage, which stays open until the
+        generator is exhausted or closed.
+
+        Args:
+            args (tuple): Positional arguments of the method.
+            kwargs (dict): Keyword arguments of the method.
+
+        Return (generator): Items of the method.
+
+        """
+        with self.profiler.stage(self.name):
+            yield from self.run(args, kwargs)
+
+    def run(self, args, kwargs):
+        """
+        Run the method, counting the file it reads (per FILE_ARG_METHODS) & the lines it
+        streams (per LINE_ARG_METHODS) towards the stages running.
+
+        Args:
+            args (tuple): Positional arguments of the method.
+            kwargs (dict): Keyword arguments of the method.
+
+        Return (object): Method's result.
+
+        """
+        if self.method.__name__ in FILE_ARG_METHODS:
+            idx = FILE_ARG_METHODS[self.method.__name__]
+            path = args[idx] if len(args) > idx else None
+            if isinstance(path, str):
+                # Pickles are read by their filename excluding the '.pkl' extension.
+                path = path if os.path.exists(path) else path + '.pkl'
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                for active in self.profiler.active:
+                    active['Files'] += 1
+                    active['Bytes Read'] += size
+        if self.method.__name__ in LINE_ARG_METHODS and args:
+            args = (CountingLines(args[0], self.profiler.active),) + args[1:]
+        return self.method(*args, **kwargs)
+
+    def __reduce__(self):
+
+        # Unpickled while its object's state may still be restored (i.e. w/ its instrumented
+        # methods unset or partially set), so the method is rebound from the object's class.
+        return (restore_method, (self.profiler, self.name, self.method.__self__, self.method.__name__))
+
+
+def restore_method(profiler, name, obj, method_name):
+    """
+    Rebuild an unpickled instrumented method.
+
+    Args:
+        profiler (StageProfiler): Profiler recording the method's calls.
+        name (str): Name of the method's stage (e.g. 'ScriptScraper.process_config_file').
+        obj (object): Instrumented object.
+        method_name (str): Name of the method on the object's class.
+
+    Return (InstrumentedMethod): The instrumented method.
+
+    """
+    return InstrumentedMethod(profiler, name, types.MethodType(getattr(type(obj), method_name), obj))
+
+
+class WorkerCall():
+    """
+    Call of an instrumented method in a worker process (e.g. of a scraping process pool), which
+    returns the stages recorded by the worker along w/ the result, for the parent process to add
+    to its own stages (see 'StageProfiler.map_in_workers()').
+
+    """
+    def __init__(self, method):
+
+        # Instrumented method, sent to the workers w/ its profiler's settings only.
+        self.method = method
+
+    def __call__(self, *args):
+        """
+        Run the method w/ a fresh set of stages.
+
+        Args:
+            args (tuple): Arguments of the method.
+
+        Return (tuple): Method's result & the records of the stages it ran per stage name.
+
+        """
+        profiler = self.method.profiler
+
+        # Only the parent process dumps profiles, so workers never run cProfile.
+        profiler.cprofile = False
+        profiler.records = {}
+        result = self.method(*args)
+
+        return result, profiler.records
+
+
+class StageProfiler():
+    """
+    Optional per-stage instrumentation of the mapping pipeline (e.g. ScriptScraper, App2BaselineMapper).
+
+    Records the calls, wall time, CPU time, files & lines processed, Bytes read & peak RSS of each
+    stage, whether a block w/in 'stage()' or a public method of an object passed to 'instrument()'.
+    Stages are inclusive of their nested stages, incl. the calls run by worker processes (e.g. of
+    a scraping process pool). Peak RSS is the process-wide peak as of the end of the stage's last
+    call (incl. memory allocated by earlier stages), not the stage's own usage; for stages run by
+    workers, it's the largest peak of this process & the workers.
+    If disabled, 'instrument()' returns the object untouched & 'stage()' is a no-op, so the
+    pipeline runs w/o any overhead.
+
+    """
+    def __init__(self, enabled=True, cprofile=False):
+
+        # Whether stages are recorded.
+        self.enabled = enabled
+
+        # Whether each top-level stage also runs under cProfile, for dumping the hottest stage.
+        self.cprofile = cprofile
+
+        # Records per stage & the records of the stages running (outermost first).
+        self.records = {}
+        self.active = []
+        self.profiles = {}
+
+    def __getstate__(self):
+
+        # Profiles aren't picklable & worker processes (e.g. of a scraping process pool) record
+        # their own stages, so only the settings are sent to them.
+        return {'enabled': self.enabled, 'cprofile': self.cprofile, 'records': {}, 'active': [], 'profiles': {}}
+
+    def instrument(self, obj, methods=None):
+        """
+        Record each call of an object's public methods as a stage.
+
+        Args:
+            obj (object): Object to instrument (e.g. a ScriptScraper).
+            methods (list): Methods to instrument. Default instruments all public methods.
+
+        Return (object): The object, w/ its instrumented methods set on the instance only
+        (its class is untouched).
+
+        """
+        if not self.enabled:
+            return obj
+        if methods is None:
+            methods = [name for name in dir(type(obj))
+                       if not name.startswith('_') and callable(getattr(type(obj), name))
+                       and not isinstance(getattr(type(obj), name), (staticmethod, classmethod, type))]
+        cls_name = type(obj).__name__
+        for name in methods:
+            method = getattr(obj, name)
+            if isinstance(method, types.MethodType):
+                setattr(obj, name, InstrumentedMethod(self, f'{cls_name}.{name}', method))
+
+        return obj
+
+    def stage(self, name):
+        """
+        Record a block as a stage.
+
+            with profiler.stage('merge'):
+                ...
+
+        Args:
+            name (str): Name of the stage.
+
+        Return (context manager): Yields the stage's record (or None if disabled), whose
+        'Files', 'Lines' & 'Bytes Read' counts may be added to.
+
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+
+        return self.record_stage(name)
+
+    def map_in_workers(self, executor, func, *iterables, chunksize=1):
+        """
+        Map an instrumented method across a process pool, adding the stages its calls ran in the
+        worker processes to the recorded stages. The files, lines & Bytes read by the workers
+        are also added to the stages running (e.g. the stage mapping the files), as though the
+        calls ran in this process.
+
+        Args:
+            executor (ProcessPoolExecutor): Process pool.
+            func (callable): Per-file function (e.g. an instrumented 'process_config_file()').
+            iterables (iterable): Arguments of 'func' per file.
+            chunksize (int): Number of calls sent to a worker at once.
+
+        Return (list): Results of 'func' in the order of the given files.
+
+        """
+        if not self.enabled or not isinstance(func, InstrumentedMethod):
+            return list(executor.map(func, *iterables, chunksize=chunksize))
+        results = []
+        for result, records in executor.map(WorkerCall(func), *iterables, chunksize=chunksize):
+            self.add_worker_records(func.name, records)
+            results.append(result)
+
+        return results
+
+    def add_worker_records(self, name, records):
+        """
+        Add the stages recorded by a worker process to the recorded stages.
+
+        Args:
+            name (str): Stage of the method called by the worker.
+            records (dict): Worker's records per stage name.
+
+        Return: None
+
+        """
+        for stage_name, worker_record in records.items():
+            record = self.records.setdefault(stage_name, dict.fromkeys(REPORT_COLUMNS, 0))
+            for col in REPORT_COLUMNS[:-1]:
+                record[col] += worker_record[col]
+            record['Peak RSS (MB)'] = max(record['Peak RSS (MB)'], worker_record['Peak RSS (MB)'])
+        if name in records:
+            for active in self.active:
+                for col in WORKER_COUNT_COLUMNS:
+                    active[col] += records[name][col]
+
+    @contextlib.contextmanager
+    def record_stage(self, name):
+        """
+        Record a block as a stage, under cProfile if it's a top-level stage & cProfile is on.
+
+        Args:
+            name (str): Name of the stage.
+
+        Return (generator): Yields the stage's record, whose counts are updated once the
+        block exits.
+
+        """
+        record = self.records.setdefault(name, dict.fromkeys(REPORT_COLUMNS, 0))
+        profile = None
+        if self.cprofile and not self.active:
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        self.active.append(record)
+        wall = time.perf_counter()
+        cpu = get_cpu_time()
+        try:
+            yield record
+        finally:
+            record['Wall (s)'] += time.perf_counter() - wall
+            record['CPU (s)'] += get_cpu_time() - cpu
+            record['Calls'] += 1
+            record['Peak RSS (MB)'] = max(record['Peak RSS (MB)'], get_peak_rss())
+            # A generator's stage (e.g. of 'parse') may close after the stages its consumer opened.
+            del self.active[max(idx for idx, active in enumerate(self.active) if active is record)]
+            if profile is not None:
+                profile.disable()
+
+    def report(self):
+        """
+        Summarize the recorded stages.
+
+        Args:
+            None
+
+        Return (pd.DataFrame): Calls, wall time (s), CPU time (s), files, lines, Bytes read &
+        process-wide peak RSS (MB) as of each stage's end, per stage, sorted by wall time.
+
+        """
+        report_df = pd.DataFrame.from_dict(self.records, orient='index', columns=REPORT_COLUMNS)
+        report_df.index.name = 'Stage'
+
+        return report_df.sort_values('Wall (s)', ascending=False)
+
+    def save_report(self, fn):
+        """
+        Save the report as JSON or CSV, by the file's extension.
+
+        Args:
+            fn (str): Report file (e.g. 'profile.json', 'profile.csv').
+
+        Return (str): Path of the saved report.
+
+        """
+        report_df = self.report().reset_index()
+        if fn.endswith('.csv'):
+            report_df.to_csv(fn, index=False)
+        else:
+            with open(fn, 'w') as file:
+                json.dump(report_df.to_dict(orient='records'), file, indent=1)
+
+        return fn
+
+    def dump_profile(self, fn):
+        """
+        Dump the cProfile stats of the hottest top-level stage (e.g. for snakeviz or pstats).
+
+        Args:
+            fn (str): Stats file.
+
+        Return (str): Name of the dumped stage, or None if no stage was profiled.
+
+        """
+        if not self.profiles:
+            return None
+        hottest = max(self.profiles, key=lambda name: self.records[name]['Wall (s)'])
+        self.profiles[hottest].dump_stats(fn)
+
+        return hottest
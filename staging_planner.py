@@ -0,0 +1,275 @@
+import os
+import bisect
+import fnmatch
+import numpy as np
+import pandas as pd
+
+# Characters of a shell glob w/in a /fv3_conf source path (e.g. 'FV3_input_data/INPUT/*').
+GLOB_CHARS = ('*', '?', '[')
+
+
+class StagingPlanner():
+    """
+    Computes the minimal set of input & baseline data files to stage on a platform for a subset
+    of regression tests (or UFS application-to-physics suite builds).
+
+    Each test's required files are precomputed as a bitmap over the unique files of the input
+    & baseline datasets, so a plan is the bitwise union of the selected tests' bitmaps.
+
+    """
+    def __init__(self, file_paths, file_sizes, file_datasets, test_names, test_bitmaps, combo_tests=None, unmatched=None):
+
+        # Unique relative paths (w/in the datasets' parent folder, e.g. 'input-data-20211210/...',
+        # 'develop-20220329/...'), sizes (Bytes, -1 if unknown) & dataset ('input', 'baseline') of the files.
+        self.file_paths = np.asarray(file_paths, dtype=object)
+        self.file_sizes = np.asarray(file_sizes, dtype=np.int64)
+        self.file_datasets = np.asarray(file_datasets, dtype=object)
+
+        # Packed bitmap of the files required by each regression test.
+        self.test_names = list(test_names)
+        self.test_rows = {test_name: row for row, test_name in enumerate(self.test_names)}
+        self.test_bitmaps = np.asarray(test_bitmaps, dtype=np.uint8).reshape(len(self.test_names), -1)
+
+        # Regression tests per (UFS_App, Physics_Suite) & the /fv3_conf sources per test which
+        # are not found w/in the input dataset (e.g. sources w/ unresolved variables).
+        self.combo_tests = combo_tests or {}
+        self.unmatched = unmatched or {}
+
+    @classmethod
+    def from_maps(cls, test_paths, app2test2data_df=None, input_df=None, input_roots=None):
+        """
+        Precompute the per-test file bitmaps.
+
+        Args:
+            test_paths (dict): Expanded data file paths per regression test (i.e. 'VarExpander.expand_tests()'
+                               output), expanded relative to the input dataset's root folder
+                               (e.g. {'INPUTDATA_ROOT': 'input-data-20211210'}).
+            app2test2data_df (pd.DataFrame): Merged map of the regression tests to their baseline
+                                             data files (e.g. ufs_app2test2data_df).
+            input_df (pd.DataFrame): Input dataset's data files (e.g. input_df). W/o it, only the
+                                     /fv3_conf sources naming a file are staged, w/ unknown sizes.
+            input_roots (list): Root folders of the input dataset (e.g. ['input-data-20211210']).
+                                Sources outside of them (e.g. run directory files 'RESTART/*')
+                                are not staged. Default derives them from input_df.
+
+        Return (StagingPlanner): The planner.
+
+        """
+        file_ids = {}
+        file_paths = []
+        file_sizes = []
+        file_datasets = []
+
+        def add_file(path, size, dataset):
+            if path not in file_ids:
+                file_ids[path] = len(file_paths)
+                file_paths.append(path)
+                file_sizes.append(size)
+                file_datasets.append(dataset)
+            return file_ids[path]
+
+        # Input dataset's files, sorted for directory lookups & indexed per directory for glob lookups.
+        input_paths = []
+        dir_files = {}
+        if input_df is not None:
+            input_df = input_df.drop_duplicates(['Relative Directory', 'Filename'])
+            for rel_dir, fn, size in zip(input_df['Relative Directory'].astype(str), input_df['Filename'].astype(str),
+                                         input_df['Size (Bytes)'].to_numpy(dtype=np.int64)):
+                add_file(f'{rel_dir}/{fn}', size, 'input')
+                dir_files.setdefault(rel_dir, []).append(fn)
+            input_paths = sorted(file_paths)
+            if input_roots is None:
+                input_roots = {path.split('/', 1)[0] for path in dir_files}
+        input_roots = set(input_roots or [])
+
+        # Input files required per test, matching each /fv3_conf source as a file, a directory
+        # or a glob. Data files of the /parm file are looked up w/in the directories sourced.
+        test_files = {}
+        unmatched = {}
+        for test_name, paths in test_paths.items():
+            ids = set()
+            for source in paths['fv3_conf']:
+                source = source.rstrip('/')
+                source_dir, source_fn = os.path.split(source)
+                if source in file_ids:
+                    matched = [source]
+                elif any(c in source_fn for c in GLOB_CHARS) and not any(c in source_dir for c in GLOB_CHARS):
+                    matched = [f'{source_dir}/{fn}' for fn in fnmatch.filter(dir_files.get(source_dir, []), source_fn)]
+                else:
+                    # Files under a directory sort between 'source/' & 'source0' ('0' follows '/').
+                    lo = bisect.bisect_left(input_paths, source + '/')
+                    hi = bisect.bisect_left(input_paths, source + '0')
+                    matched = input_paths[lo:hi]
+                if not matched and input_df is None and source.split('/', 1)[0] in input_roots \
+                        and '$' not in source and '@[' not in source and not any(c in source for c in GLOB_CHARS):
+                    add_file(source, -1, 'input')
+                    matched = [source]
+                if not matched:
+                    unmatched.setdefault(test_name, set()).add(source)
+                ids.update(file_ids[path] for path in matched)
+
+            source_dirs = {os.path.dirname(file_paths[i]) for i in ids}
+            for fn in paths['parm']:
+                for source_dir in source_dirs:
+                    if f'{source_dir}/{fn}' in file_ids:
+                        ids.add(file_ids[f'{source_dir}/{fn}'])
+            test_files[test_name] = ids
+
+        # Baseline files required per test.
+        combo_tests = {}
+        if app2test2data_df is not None:
+            rel_paths = (app2test2data_df['Relative Directory'].astype(str) + '/'
+                         + app2test2data_df['Filename'].astype(str)).to_numpy(dtype=object)
+            for test_name, rel_path, size in zip(app2test2data_df['Test Name'], rel_paths,
+                                                 app2test2data_df['Size (Bytes)'].to_numpy(dtype=np.int64)):
+                test_files.setdefault(test_name, set()).add(add_file(rel_path, size, 'baseline'))
+            for (app, suite), test_names in app2test2data_df.groupby(['UFS_App', 'Physics_Suite'], observed=True)['Test Name']:
+                combo_tests[(app, suite)] = sorted(set(test_names))
+
+        # Pack each test's files into a bitmap.
+        test_names = sorted(test_files)
+        test_bitmaps = np.zeros((len(test_names), len(file_paths)), dtype=bool)
+        for row, test_name in enumerate(test_names):
+            test_bitmaps[row, list(test_files[test_name])] = True
+
+        return cls(file_paths, file_sizes, file_datasets, test_names, np.packbits(test_bitmaps, axis=1),
+                   combo_tests=combo_tests, unmatched=unmatched)
+
+    @classmethod
+    def read(cls, fn):
+        """
+        Read the precomputed bitmaps saved via 'save()'.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (StagingPlanner): The planner.
+
+        """
+        with np.load(fn + '.npz', allow_pickle=False) as data:
+            if 'combo_indptr' not in data.files:
+                raise ValueError(f"'{fn}.npz' was saved w/ pickled arrays by an earlier version. Delete it to rebuild the planner.")
+            combo_tests = {(app, suite): data['combo_test_names'][start:end].tolist() for app, suite, start, end
+                           in zip(data['combo_apps'].tolist(), data['combo_suites'].tolist(),
+                                  data['combo_indptr'][:-1].tolist(), data['combo_indptr'][1:].tolist())}
+            unmatched = {test_name: set(data['unmatched_sources'][start:end].tolist()) for test_name, start, end
+                         in zip(data['unmatched_tests'].tolist(),
+                                data['unmatched_indptr'][:-1].tolist(), data['unmatched_indptr'][1:].tolist())}
+            return cls(data['file_paths'], data['file_sizes'], data['file_datasets'], data['test_names'].tolist(),
+                       data['test_bitmaps'], combo_tests=combo_tests, unmatched=unmatched)
+
+    def save(self, fn):
+        """
+        Save the precomputed bitmaps.
+
+        Args:
+            fn (str): Filename excluding the '.npz' extension.
+
+        Return (str): Path of the saved file.
+
+        """
+        # Tests per build & unmatched sources per test are flattened, w/ the entries of build
+        # (or test) i at [indptr[i]:indptr[i + 1]], so that the file loads w/o unpickling.
+        get_indptr = lambda groups: np.concatenate([[0], np.cumsum([len(group) for group in groups], dtype=np.int64)])
+        unmatched = [sorted(sources) for sources in self.unmatched.values()]
+        np.savez_compressed(fn, file_paths=np.asarray(self.file_paths, dtype=str), file_sizes=self.file_sizes,
+                            file_datasets=np.asarray(self.file_datasets, dtype=str),
+                            test_names=np.asarray(self.test_names, dtype=str), test_bitmaps=self.test_bitmaps,
+                            combo_apps=np.asarray([app for app, _ in self.combo_tests], dtype=str),
+                            combo_suites=np.asarray([suite for _, suite in self.combo_tests], dtype=str),
+                            combo_indptr=get_indptr(self.combo_tests.values()),
+                            combo_test_names=np.asarray([test for tests in self.combo_tests.values() for test in tests], dtype=str),
+                            unmatched_tests=np.asarray(list(self.unmatched), dtype=str),
+                            unmatched_indptr=get_indptr(unmatched),
+                            unmatched_sources=np.asarray([source for sources in unmatched for source in sources], dtype=str))
+
+        return fn + '.npz'
+
+    def select_tests(self, tests=None, apps=None, combos=None):
+        """
+        Select the regression tests to stage.
+
+        Args:
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests
+                           (e.g. [('S2SW', 'FV3_GFS_v16_coupled_p8')]).
+
+        Return (list): Selected regression tests, which are known to the planner.
+
+        """
+        selected = list(tests or [])
+        for app, suite in combos or []:
+            selected += self.combo_tests.get((app, suite), [])
+        apps = set(apps or [])
+        for (app, suite), test_names in self.combo_tests.items():
+            if app in apps:
+                selected += test_names
+        unknown = [test_name for test_name in selected if test_name not in self.test_rows]
+        if unknown:
+            raise KeyError(f'Unknown regression tests: {sorted(set(unknown))}')
+
+        return list(dict.fromkeys(selected))
+
+    def plan(self, tests=None, apps=None, combos=None):
+        """
+        Compute the union of the files required by the selected regression tests.
+
+        Args:
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests.
+
+        Return (pd.DataFrame): Each unique file's relative path, size (Bytes) & dataset, sorted
+        by relative path.
+
+        """
+        rows = [self.test_rows[test_name] for test_name in self.select_tests(tests, apps, combos)]
+        bitmap = np.bitwise_or.reduce(self.test_bitmaps[rows], axis=0) if rows else np.zeros(self.test_bitmaps.shape[1], dtype=np.uint8)
+        ids = np.flatnonzero(np.unpackbits(bitmap, count=len(self.file_paths)))
+        plan_df = pd.DataFrame({'Relative Path': self.file_paths[ids],
+                                'Size (Bytes)': self.file_sizes[ids],
+                                'Dataset': self.file_datasets[ids]})
+
+        return plan_df.sort_values('Relative Path', ignore_index=True)
+
+    def summarize(self, tests=None, apps=None, combos=None):
+        """
+        Summarize the staging plan of the selected regression tests.
+
+        Args:
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests.
+
+        Return (dict): Number of tests, number of unique files & total size (Bytes) per dataset
+        & overall, number of files of unknown size & the unmatched /fv3_conf sources per test.
+
+        """
+        test_names = self.select_tests(tests, apps, combos)
+        plan_df = self.plan(tests=test_names)
+        known_df = plan_df[plan_df['Size (Bytes)'] >= 0]
+        summary = {'tests': len(test_names),
+                   'files': len(plan_df),
+                   'bytes': int(known_df['Size (Bytes)'].sum()),
+                   'unknown_size_files': int(len(plan_df) - len(known_df))}
+        for dataset, dataset_df in known_df.groupby('Dataset'):
+            summary[f'{dataset}_files'] = int((plan_df['Dataset'] == dataset).sum())
+            summary[f'{dataset}_bytes'] = int(dataset_df['Size (Bytes)'].sum())
+        summary['unmatched'] = {test_name: sorted(self.unmatched[test_name]) for test_name in test_names if test_name in self.unmatched}
+
+        return summary
+
+    def get_manifest(self, tests=None, apps=None, combos=None):
+        """
+        Relative paths of the files to stage, as read by 'rsync --files-from' or 'tar -T'.
+
+        Args:
+            tests (list): Regression test names (e.g. ['control_p8']).
+            apps (list): UFS applications, selecting all of their tests (e.g. ['ATM']).
+            combos (list): (UFS_App, Physics_Suite) builds, selecting their tests.
+
+        Return (list): Sorted relative paths.
+
+        """
+        return self.plan(tests, apps, combos)['Relative Path'].tolist()
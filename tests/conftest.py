@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The pipeline's modules live at the repo's root, which isn't an installed package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import pandas as pd
+import pytest
+from checksum_verifier import ChecksumVerifier
+
+FILES = {'develop-20220329/INTEL/control_p8/atmf000.nc': b'a' * 100,
+         'develop-20220329/INTEL/control_p8/sfcf000.nc': b'b' * 50,
+         'develop-20220329/INTEL/cpld_control_p8/ocn.nc': b'c' * 70,
+         'input-data-20211210/FV3_input_data/INPUT/oro_data.nc': b'd' * 30}
+
+
+@pytest.fixture
+def staged(tmp_path):
+    root = tmp_path / 'staged'
+    for rel_path, data in FILES.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    test_files_df = pd.DataFrame([('control_p8', rel_path) for rel_path in FILES if 'cpld' not in rel_path]
+                                 + [('cpld_control_p8', rel_path) for rel_path in FILES if 'sfcf' not in rel_path],
+                                 columns=['Test Name', 'Relative Path'])
+    test_files_df['Size (Bytes)'] = test_files_df['Relative Path'].map(lambda rel_path: len(FILES[rel_path]))
+
+    return root, test_files_df
+
+
+def test_all_ok(staged, tmp_path):
+    root, test_files_df = staged
+    verifier = ChecksumVerifier(root, test_files_df, chunk_size=16)
+    files_df = verifier.verify()
+
+    assert (files_df['Status'] == 'ok').all()
+    assert verifier.n_hashed == len(FILES)
+    digests = dict(zip(files_df['Relative Path'], files_df['Digest']))
+    assert all(digests[rel_path] == hashlib.md5(data).hexdigest() for rel_path, data in FILES.items())
+    assert verifier.summarize(files_df)['failed_tests'] == {}
+
+
+def test_missing_size_mismatch_digest_mismatch(staged, tmp_path):
+    root, test_files_df = staged
+    verifier = ChecksumVerifier(root, test_files_df)
+    manifest = tmp_path / 'source.md5'
+    manifest.write_text('\n'.join(verifier.get_manifest(verifier.verify())) + '\n')
+
+    (root / 'develop-20220329/INTEL/control_p8/sfcf000.nc').unlink()
+    (root / 'develop-20220329/INTEL/cpld_control_p8/ocn.nc').write_bytes(b'c' * 69)
+    (root / 'input-data-20211210/FV3_input_data/INPUT/oro_data.nc').write_bytes(b'e' * 30)
+    verifier = ChecksumVerifier(root, test_files_df)
+    files_df = verifier.verify(reference=ChecksumVerifier.read_manifest(manifest))
+    status = dict(zip(files_df['Relative Path'], files_df['Status']))
+
+    assert status == {'develop-20220329/INTEL/control_p8/atmf000.nc': 'ok',
+                      'develop-20220329/INTEL/control_p8/sfcf000.nc': 'missing',
+                      'develop-20220329/INTEL/cpld_control_p8/ocn.nc': 'size_mismatch',
+                      'input-data-20211210/FV3_input_data/INPUT/oro_data.nc': 'digest_mismatch'}
+
+    # Missing & truncated files are never hashed.
+    assert verifier.n_hashed == 2
+    failed = verifier.summarize(files_df)['failed_tests']
+    assert failed['control_p8'] == {'missing': ['develop-20220329/INTEL/control_p8/sfcf000.nc'],
+                                    'corrupt': ['input-data-20211210/FV3_input_data/INPUT/oro_data.nc']}
+    assert failed['cpld_control_p8']['corrupt'] == ['develop-20220329/INTEL/cpld_control_p8/ocn.nc',
+                                                    'input-data-20211210/FV3_input_data/INPUT/oro_data.nc']
+    report_df = verifier.get_report(files_df)
+    assert len(report_df) == 4 and set(report_df['Test Name']) == {'control_p8', 'cpld_control_p8'}
+
+
+def test_cache_hits(staged, tmp_path):
+    root, test_files_df = staged
+    cache_fn = str(tmp_path / 'digest_cache')
+    first = ChecksumVerifier(root, test_files_df, cache_fn=cache_fn)
+    first_df = first.verify()
+    assert os.path.exists(cache_fn + '.npz')
+
+    rerun = ChecksumVerifier(root, test_files_df, cache_fn=cache_fn)
+    rerun_df = rerun.verify()
+    assert (rerun.n_hashed, rerun.n_cached) == (0, len(FILES))
+    assert rerun_df['Digest'].tolist() == first_df['Digest'].tolist()
+
+    # A file rewritten in place (same size, new mtime) is rehashed, while the others remain cached.
+    changed = root / 'develop-20220329/INTEL/control_p8/atmf000.nc'
+    changed.write_bytes(b'z' * 100)
+    os.utime(changed, ns=(1, 1))
+    rerun = ChecksumVerifier(root, test_files_df, cache_fn=cache_fn)
+    rerun_df = rerun.verify()
+    assert (rerun.n_hashed, rerun.n_cached) == (1, len(FILES) - 1)
+    digest = rerun_df.loc[rerun_df['Relative Path'] == str(changed.relative_to(root)), 'Digest'].item()
+    assert digest == hashlib.md5(b'z' * 100).hexdigest()
+
+    # Digests of another algorithm are not reused.
+    other = ChecksumVerifier(root, test_files_df, algorithm='sha256', cache_fn=cache_fn)
+    other.verify()
+    assert other.n_cached == 0
+
+
+def test_from_map(staged):
+    root, _ = staged
+    map_df = pd.DataFrame({'UFS_App': ['ATM', 'ATM', 'S2S'],
+                           'Physics_Suite': ['FV3_GFS_v17_p8', 'FV3_GFS_v17_p8', 'FV3_GFS_v17_coupled_p8'],
+                           'Test Name': ['control_p8', 'control_p8', 'cpld_control_p8'],
+                           'Relative Directory': ['develop-20220329/INTEL/control_p8'] * 2 + ['develop-20220329/INTEL/cpld_control_p8'],
+                           'Filename': ['atmf000.nc', 'sfcf000.nc', 'ocn.nc'],
+                           'Size (Bytes)': [100, 50, 70]})
+    verifier = ChecksumVerifier.from_map(root, map_df, apps=['S2S'])
+    files_df = verifier.verify()
+
+    assert files_df['Relative Path'].tolist() == ['develop-20220329/INTEL/cpld_control_p8/ocn.nc']
+    assert files_df['Status'].tolist() == ['ok']
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+from inventory_crawler import InventoryCrawler, INVENTORY_COLUMNS
+
+
+def make_files(root, files):
+    for rel_path, size in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * size)
+
+
+@pytest.fixture
+def baseline_root(tmp_path):
+    root = tmp_path / 'RT'
+    make_files(root, {'develop-20220315/INTEL/control_p8/atmf000.nc': 10,
+                      'develop-20220315/INTEL/control_p8/sfcf000.nc': 20,
+                      'develop-20220329/INTEL/control_p8/atmf000.nc': 11,
+                      'develop-20220329/INTEL/control_p8/RESTART/fv_core.res.nc': 5,
+                      'develop-20220329/GNU/regional_control/dynf000.grb': 7,
+                      'README': 3})
+
+    return root
+
+
+def test_baseline_inventory(baseline_root):
+    inventory_df = InventoryCrawler(baseline_root, workers=4).get_inventory()
+
+    assert list(inventory_df.columns) == INVENTORY_COLUMNS['baseline']
+    assert len(inventory_df) == 6
+    row = inventory_df[inventory_df['Relative Directory'] == 'develop-20220329/GNU/regional_control'].iloc[0]
+    assert (row['Date'], row['Compiler'], row['CNTL Folder'], row['Filename']) == ('20220329', 'GNU', 'regional_control', 'dynf000.grb')
+    assert (row['Size (Bytes)'], row['DataType'], row['Nodes Relative to Main']) == (7, 'grib', 3)
+    restart = inventory_df[inventory_df['Filename'] == 'fv_core.res.nc'].iloc[0]
+    assert restart['Node3'] == 'RESTART' and restart['CNTL Folder'] == 'control_p8'
+
+
+def test_date_filter(baseline_root):
+    inventory_df = InventoryCrawler(baseline_root, dates=['20220329']).get_inventory()
+
+    # Files outside of the dated folders (e.g. README) are skipped as well.
+    assert set(inventory_df['Date']) == {'20220329'}
+    assert len(inventory_df) == 3
+
+
+def test_dated_root(baseline_root):
+    inventory_df = InventoryCrawler(baseline_root / 'develop-20220315').get_inventory()
+
+    assert inventory_df['Relative Directory'].tolist() == ['develop-20220315/INTEL/control_p8'] * 2
+    assert InventoryCrawler(baseline_root / 'develop-20220315', dates=['20220329']).get_inventory().empty
+
+
+def test_max_depth(baseline_root):
+    crawler = InventoryCrawler(baseline_root, max_depth=3)
+    inventory_df = crawler.get_inventory()
+
+    # The RESTART folder is at depth 4.
+    assert 'fv_core.res.nc' not in set(inventory_df['Filename'])
+    assert len(inventory_df) == 5
+    assert InventoryCrawler(baseline_root, max_depth=0).get_inventory()['Filename'].tolist() == ['README']
+
+
+def test_batch_boundaries(baseline_root):
+    crawler = InventoryCrawler(baseline_root, workers=1, batch_size=2)
+    batches = list(crawler.crawl())
+
+    # Batches close once they reach 'batch_size' rows, w/o splitting a directory's files.
+    assert sum(len(batch_df) for batch_df in batches) == crawler.n_files == 6
+    assert all(len(batch_df) >= 2 for batch_df in batches[:-1])
+    dir_batches = pd.concat([batch_df.assign(Batch=idx) for idx, batch_df in enumerate(batches)])
+    assert (dir_batches.groupby('Relative Directory')['Batch'].nunique() == 1).all()
+    assert crawler.n_dirs == 10
+
+
+def test_empty_root(tmp_path):
+    inventory_df = InventoryCrawler(tmp_path).get_inventory()
+
+    assert inventory_df.empty
+    assert list(inventory_df.columns) == INVENTORY_COLUMNS['baseline']
+
+
+def test_input_inventory(tmp_path):
+    root = tmp_path / 'input-data-20211210'
+    make_files(root, {'FV3_input_data/INPUT/oro_data.tile1.nc': 4,
+                      'MOM6_IC/RESTART/MOM.res.nc': 6})
+    inventory_df = InventoryCrawler(root, kind='input', components={'FV3_input_data': 'FV3'}).get_inventory()
+
+    assert list(inventory_df.columns) == INVENTORY_COLUMNS['input']
+    assert inventory_df['UFS Component'].tolist() == ['FV3', 'MOM6']
+    assert inventory_df['input_or_restart'].tolist() == ['input', 'restart']
+    assert inventory_df['Root Folder'].tolist() == ['FV3_input_data', 'MOM6_IC']
+
+
+def test_save_streams_parquet(baseline_root, tmp_path):
+    pytest.importorskip('pyarrow')
+    crawler = InventoryCrawler(baseline_root, batch_size=2)
+    path = crawler.save(str(tmp_path / 'baseline_df'))
+    saved_df = pd.read_parquet(path).sort_values(['Relative Directory', 'Filename'], ignore_index=True)
+
+    expected_df = crawler.get_inventory()
+    pd.testing.assert_frame_equal(saved_df[['Relative Directory', 'Filename', 'Size (Bytes)']],
+                                  expected_df[['Relative Directory', 'Filename', 'Size (Bytes)']])
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from staging_planner import StagingPlanner
+from locality_scheduler import LocalityScheduler
+
+TEST_FILES = {'t1': [0, 1], 't2': [0, 1, 2], 't3': [3], 't_empty': []}
+
+
+@pytest.fixture
+def planner():
+    file_paths = [f'input-data-20211210/file_{idx}.nc' for idx in range(4)]
+    rows = np.zeros((len(TEST_FILES), len(file_paths)), dtype=np.uint8)
+    for row, file_ids in enumerate(TEST_FILES.values()):
+        rows[row, file_ids] = 1
+
+    return StagingPlanner(file_paths, [100, 200, 50, 400], ['input'] * len(file_paths),
+                          list(TEST_FILES), np.packbits(rows, axis=1))
+
+
+@pytest.mark.parametrize('test_names', [['t1', 't2', 't3', 't_empty'], ['t_empty', 't1', 't2', 't3']])
+def test_schedule_w_test_wo_files(planner, test_names):
+    batch_df = LocalityScheduler(planner, n_nodes=1, capacity=350).schedule(test_names)
+
+    assert sorted(test for tests in batch_df['Tests'] for test in tests) == sorted(test_names)
+    assert batch_df['Staged (Bytes)'].sum() == 750
+
+
+def test_batches_group_shared_files(planner):
+    batches = LocalityScheduler(planner, capacity=350).get_batches(['t1', 't3', 't2'])
+
+    assert sorted(sorted(batch) for batch in batches) == [[0, 2], [1]]
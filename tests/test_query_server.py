@@ -0,0 +1,55 @@
+import os
+import threading
+import pandas as pd
+from map_storage import MapStorage
+from query_server import MapQueryServer
+
+MAP_DF = pd.DataFrame({'UFS_App': ['ATM', 'S2S'], 'Physics_Suite': ['FV3_GFS_v16', 'FV3_GFS_v17_coupled_p8'],
+                       'Test Name': ['control', 'cpld_control_p8'], 'CNTL Folder': ['control', 'cpld_control_p8'],
+                       'Relative Directory': ['develop-20220329/INTEL/control', 'develop-20220329/INTEL/cpld_control_p8'],
+                       'Filename': ['atmf000.nc', 'ocn.nc'], 'Size (Bytes)': [100, 70]})
+
+
+def save_map(fn, df, mtime_ns):
+    path = MapStorage(fmt='pickle').save(df, fn)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    return path
+
+
+def test_reload_after_corrupt_map(tmp_path):
+    fn = str(tmp_path / 'ufs_app2test2data_df')
+    path = save_map(fn, MAP_DF, 10**18)
+    server = MapQueryServer(fn, poll_interval=0.01)
+    assert server.dispatch('status', {})['rows'] == 2
+
+    # A truncated pickle (e.g. mid-write) keeps the loaded map & is retried at the next poll.
+    with open(path, 'r+b') as f:
+        f.truncate(20)
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    assert not server.reload_if_changed()
+    assert server.reload_errors and server.dispatch('status', {})['rows'] == 2
+
+    save_map(fn, MAP_DF.iloc[:1], 3 * 10**18)
+    assert server.reload_if_changed()
+    assert server.reloads == 1 and server.dispatch('status', {})['rows'] == 1
+
+
+def test_watch_survives_failed_poll(tmp_path, monkeypatch):
+    fn = str(tmp_path / 'ufs_app2test2data_df')
+    save_map(fn, MAP_DF, 10**18)
+    server = MapQueryServer(fn, poll_interval=0.01)
+    polls = []
+
+    def failing_poll():
+        polls.append(1)
+        raise RuntimeError('bad poll')
+
+    monkeypatch.setattr(server, 'reload_if_changed', failing_poll)
+    watcher = threading.Thread(target=server.watch, daemon=True)
+    watcher.start()
+    watcher.join(0.2)
+    assert watcher.is_alive() and len(polls) > 1
+    server.stop_event.set()
+    watcher.join(1)
+    assert not watcher.is_alive()
@@ -0,0 +1,37 @@
+import pytest
+from rt_table import RTTable
+from script_scraper import ScriptScraper
+
+# Reference rows w/ interleaved apps & a repeated (app, physics suite, test type) row.
+REF_TXT = [['ATM', 'FV3_GFS_v16', 'tests', 'control', 'decomp'],
+           ['S2S', 'FV3_GFS_v17_coupled_p8', 'tests', 'cpld_control_p8'],
+           ['ATM', 'FV3_GFS_v17_p8', 'tests', 'control_p8'],
+           ['ATM', 'FV3_GFS_v16', 'debug_tests', 'control_debug'],
+           ['ATM', 'FV3_GFS_v16', 'tests', 'control', 'restart']]
+TESTS = {'control': {'CNTL_DIR': 'control', 'FV3_RUN': 'control_run.IN', 'Test Info': ['export_fv3']},
+         'control_p8': {'CNTL_DIR': 'control_p8', 'FV3_RUN': 'control_run.IN', 'INPUT_NML': 'control.nml.IN'}}
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return ScriptScraper(str(tmp_path))
+
+
+def test_table_matches_nested_dict(scraper, tmp_path):
+    input_data_dict = {'tests': TESTS}
+    nested_dict = scraper.get_app2test(scraper.convert_list2dict(REF_TXT))
+    dict_df = scraper.convert_dict2df(scraper.get_appsphys2testparams(nested_dict, input_data_dict),
+                                      flatten_test_info=True, fn=str(tmp_path / 'dict_df'))
+    table_df = scraper.convert_dict2df(scraper.get_appsphys2testparams(scraper.get_rt_table(REF_TXT), input_data_dict),
+                                       flatten_test_info=True, fn=str(tmp_path / 'table_df'))
+
+    assert table_df.astype(str).equals(dict_df.astype(str))
+    assert table_df['Test Name'].tolist() == ['control', 'restart', 'control_debug', 'control_p8', 'cpld_control_p8']
+
+
+def test_select(scraper):
+    table = RTTable.from_ref_txt(REF_TXT)
+
+    assert table.get_tests(app='ATM', physics_suite='FV3_GFS_v16') == ['control', 'restart', 'control_debug']
+    assert table.get_tests(test_type='tests') == ['control', 'restart', 'control_p8', 'cpld_control_p8']
+    assert table.get_rtinfo()['builds'] == 3
@@ -0,0 +1,37 @@
+import pytest
+from script_scraper import ScriptScraper
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return ScriptScraper(str(tmp_path))
+
+
+@pytest.mark.parametrize('txt, sources, dest', [
+    ('cp @[INPUTDATA_ROOT]/a.nc INPUT/', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT/'),
+    ('cp -r @[INPUTDATA_ROOT]/a.nc @[INPUTDATA_ROOT]/b.nc INPUT  # comment', ('@[INPUTDATA_ROOT]/a.nc', '@[INPUTDATA_ROOT]/b.nc'), 'INPUT'),
+    ('cp -t INPUT @[INPUTDATA_ROOT]/a.nc', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('cp -rt INPUT @[INPUTDATA_ROOT]/a.nc @[INPUTDATA_ROOT]/b.nc', ('@[INPUTDATA_ROOT]/a.nc', '@[INPUTDATA_ROOT]/b.nc'), 'INPUT'),
+    ('cp -tINPUT @[INPUTDATA_ROOT]/a.nc', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('mv --target-directory INPUT ${FILEDIR}/a.nc', ('${FILEDIR}/a.nc',), 'INPUT'),
+    ('ln -sf --target-directory="INPUT" @[INPUTDATA_ROOT]/a.nc', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('ln -sf @[INPUTDATA_ROOT]/a.nc', ('@[INPUTDATA_ROOT]/a.nc',), '.'),
+    ('cp -S .bak @[INPUTDATA_ROOT]/a.nc INPUT', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('rsync -avt -e ssh --exclude *.log @[INPUTDATA_ROOT]/a.nc INPUT', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('rsync -ave ssh --exclude=*.log @[INPUTDATA_ROOT]/a.nc INPUT', ('@[INPUTDATA_ROOT]/a.nc',), 'INPUT'),
+    ('cp -- -a.nc INPUT 2> /dev/null && echo done', ('-a.nc',), 'INPUT'),
+])
+def test_tokenize_transfer_cmd(scraper, txt, sources, dest):
+    transfer_cmd = scraper.tokenize_transfer_cmd(txt)
+
+    assert transfer_cmd.sources == sources
+    assert transfer_cmd.dest == dest
+
+
+def test_tokenize_transfer_cmd_flags(scraper):
+    transfer_cmd = scraper.tokenize_transfer_cmd('rsync -av -e ssh @[INPUTDATA_ROOT]/a.nc INPUT')
+
+    assert transfer_cmd.verb == 'rsync'
+    assert transfer_cmd.flags == ('-av', '-e', 'ssh')
+    assert transfer_cmd.root_vars == ('INPUTDATA_ROOT',)
+    assert scraper.tokenize_transfer_cmd('echo cp a b') is None
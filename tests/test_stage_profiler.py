@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+from stage_profiler import StageProfiler
+
+
+class LineReader():
+
+    def read_raw_file(self, file_path):
+        with open(file_path) as file:
+            return sum(1 for _ in self.extract_tests_txt(file))
+
+    def extract_tests_txt(self, lines):
+        return list(lines)
+
+
+def test_worker_counts_match_serial(tmp_path):
+    file_paths = []
+    for idx in range(6):
+        path = tmp_path / f'test_{idx}'
+        path.write_text('export A=1\n' * (idx + 1))
+        file_paths.append(str(path))
+
+    serial = StageProfiler()
+    reader = serial.instrument(LineReader())
+    with serial.stage('scrape'):
+        serial_results = list(map(reader.read_raw_file, file_paths))
+
+    parallel = StageProfiler()
+    reader = parallel.instrument(LineReader())
+    with parallel.stage('scrape'), ProcessPoolExecutor(max_workers=2) as executor:
+        results = parallel.map_in_workers(executor, reader.read_raw_file, file_paths, chunksize=2)
+
+    assert results == serial_results
+    cols = ['Calls', 'Files', 'Lines', 'Bytes Read']
+    assert parallel.report()[cols].sort_index().equals(serial.report()[cols].sort_index())
+    assert parallel.report().loc['scrape', 'Lines'] == sum(range(1, 7))
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from staging_planner import StagingPlanner
+
+TEST_PATHS = {'control_p8': {'fv3_conf': {'input-data-20211210/FV3_input_data/INPUT/oro_data.nc': 'INPUT/',
+                                          'input-data-20211210/FV3_input_data/INPUT/missing_${VAR}.nc': 'INPUT/'},
+                             'parm': []},
+              'cpld_control_p8': {'fv3_conf': {'input-data-20211210/FV3_input_data/INPUT/oro_data.nc': 'INPUT/',
+                                               'input-data-20211210/MOM6_input_data': 'INPUT/'},
+                                  'parm': []}}
+
+
+def get_planner():
+    input_df = pd.DataFrame({'Relative Directory': ['input-data-20211210/FV3_input_data/INPUT', 'input-data-20211210/MOM6_input_data'],
+                             'Filename': ['oro_data.nc', 'ocean_hgrid.nc'], 'Size (Bytes)': [30, 70]})
+    app2test2data_df = pd.DataFrame({'UFS_App': ['ATM', 'S2S'], 'Physics_Suite': ['FV3_GFS_v17_p8', 'FV3_GFS_v17_coupled_p8'],
+                                     'Test Name': ['control_p8', 'cpld_control_p8'],
+                                     'Relative Directory': ['develop-20220329/INTEL/control_p8', 'develop-20220329/INTEL/cpld_control_p8'],
+                                     'Filename': ['atmf000.nc', 'ocn.nc'], 'Size (Bytes)': [100, 50]})
+
+    return StagingPlanner.from_maps(TEST_PATHS, app2test2data_df, input_df)
+
+
+def test_save_read_wo_pickles(tmp_path):
+    planner = get_planner()
+    fn = planner.save(str(tmp_path / 'planner'))[:-len('.npz')]
+
+    # The saved arrays load w/o unpickling.
+    with np.load(fn + '.npz', allow_pickle=False) as data:
+        assert all(data[key].dtype != object for key in data.files)
+
+    restored = StagingPlanner.read(fn)
+    assert restored.file_paths.tolist() == planner.file_paths.tolist()
+    assert restored.test_names == planner.test_names
+    assert restored.combo_tests == planner.combo_tests
+    assert restored.unmatched == planner.unmatched
+    assert restored.get_manifest(tests=['cpld_control_p8']) == planner.get_manifest(tests=['cpld_control_p8'])
+    assert restored.summarize(apps=['ATM']) == planner.summarize(apps=['ATM'])
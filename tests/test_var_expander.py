@@ -0,0 +1,82 @@
+import pytest
+from var_expander import VarExpander
+
+DEFAULT_VARS = """\
+#!/bin/bash
+export INPUTDATA_ROOT=/scratch/input-data-20211210
+export FV3_IC=@[INPUTDATA_ROOT]/FV3_input_data/INPUT
+export ATMRES=C96   # default resolution
+export FV3_RUN=control_run.IN
+export LOOP_A=${LOOP_B}/a
+export LOOP_B=${LOOP_A}/b
+export LOOP_C=${LOOP_B}/c
+
+export_fv3 ()
+{
+export FV3_RUN=fv3_run.IN
+export ATMRES=C192
+}
+
+export_cpl ()
+{
+export OCNRES=100
+export MOM_IC="${INPUTDATA_ROOT}/MOM6_IC/${OCNRES}"
+}
+"""
+
+
+@pytest.fixture
+def var_expander(tmp_path):
+    default_vars_fn = tmp_path / 'default_vars.sh'
+    default_vars_fn.write_text(DEFAULT_VARS)
+
+    return VarExpander(str(default_vars_fn), overrides={'INPUTDATA_ROOT': 'input-data-20211210'})
+
+
+def test_layering_order(var_expander):
+    env = var_expander.get_test_env('control', {'Test Info': ['export_fv3'], 'ATMRES': '"C384"'})
+
+    # Methods override the defaults, the test's exports override the methods & the overrides override all.
+    assert env['FV3_RUN'] == 'fv3_run.IN'
+    assert env['ATMRES'] == 'C384'
+    assert env['INPUTDATA_ROOT'] == 'input-data-20211210'
+    assert var_expander.expand_path('control', '@[FV3_IC]/${ATMRES}/grid.nc') == 'input-data-20211210/FV3_input_data/INPUT/C384/grid.nc'
+
+
+def test_default_values(var_expander):
+    var_expander.get_test_env('control', {'Test Info': ['export_fv3']})
+    var_expander.get_test_env('cpld', {'Test Info': ['export_fv3', 'export_cpl']})
+
+    assert var_expander.expand_path('control', '${MOM_IC:-MOM6_IC}/${OCNRES:-025}/ic.nc') == 'MOM6_IC/025/ic.nc'
+    assert var_expander.expand_path('cpld', '${MOM_IC:-MOM6_IC}/${OCNRES:-025}/ic.nc') == 'input-data-20211210/MOM6_IC/100/100/ic.nc'
+
+
+def test_circular_references(var_expander):
+    var_expander.get_test_env('control', {})
+
+    # The cycle is left unresolved rather than recursing.
+    assert var_expander.resolve_var('control', 'LOOP_A') == '${LOOP_A}/b/a'
+
+    # Values cut short by the cycle aren't memoized, so each variable resolves on its own.
+    assert var_expander.resolve_var('control', 'LOOP_B') == '${LOOP_B}/a/b'
+    assert var_expander.resolve_var('control', 'LOOP_C') == '${LOOP_B}/a/b/c'
+    assert 'LOOP_B' not in var_expander.resolved_vars['control']
+
+
+def test_reexpansion_after_params_change(var_expander):
+    test_params = {'Test Info': ['export_fv3'], 'ATMRES': 'C96'}
+    input_data_dict = {'tests': {'control': test_params},
+                       'fv3_conf': {'fv3_run.IN': {'@[FV3_IC]/${ATMRES}/grid.nc': ['INPUT/']},
+                                    'control_run.IN': {'@[FV3_IC]/oro.nc': ['INPUT/']}},
+                       'parm': {}}
+    assert list(var_expander.expand_tests(input_data_dict)['control']['fv3_conf']) == ['input-data-20211210/FV3_input_data/INPUT/C96/grid.nc']
+
+    # Parameters changed in place by the caller regenerate the test's env.
+    test_params['ATMRES'] = 'C768'
+    assert list(var_expander.expand_tests(input_data_dict)['control']['fv3_conf']) == ['input-data-20211210/FV3_input_data/INPUT/C768/grid.nc']
+    test_params['Test Info'].clear()
+    assert list(var_expander.expand_tests(input_data_dict)['control']['fv3_conf']) == ['input-data-20211210/FV3_input_data/INPUT/oro.nc']
+
+    # As does another input_data_dict.
+    input_data_dict['tests'] = {'control': {'Test Info': ['export_fv3'], 'ATMRES': 'C48'}}
+    assert list(var_expander.expand_tests(input_data_dict)['control']['fv3_conf']) == ['input-data-20211210/FV3_input_data/INPUT/C48/grid.nc']
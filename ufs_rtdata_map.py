@@ -0,0 +1,676 @@
+"""
+Command line interface to the UFS application-to-regression test-to-data mapping pipeline.
+
+    python ufs_rtdata_map.py scrape --repo <ufs-wm-repo>      # /tests, /fv3_conf, /parm -> rt_appsphys2test_df
+    python ufs_rtdata_map.py scrape --repo <ufs-wm-repo> --rt-conf   # builds & tests read from tests/rt*.conf
+    python ufs_rtdata_map.py merge --date 20220329            # rt_appsphys2test_df + baseline_df -> ufs_app2test2data_df
+    python ufs_rtdata_map.py query --files-for-test control_p8
+    python ufs_rtdata_map.py serve --socket /tmp/ufs_map.sock      # map kept in memory, reloaded on change
+    python ufs_rtdata_map.py query --server unix:///tmp/ufs_map.sock --bytes-for-app ATM
+    python ufs_rtdata_map.py sizes --by UFS_App DataType
+    python ufs_rtdata_map.py diff --old 20220315 --new 20220329 --by UFS_App
+    python ufs_rtdata_map.py stage --repo <ufs-wm-repo> --tests control_p8 --manifest
+    python ufs_rtdata_map.py overlap --by UFS_App --stat Jaccard
+    git diff --name-only develop | python ufs_rtdata_map.py impact --list tests
+    python ufs_rtdata_map.py history --ingest <ufs-wm-hash> --date 20220329
+    python ufs_rtdata_map.py history --diff <old-hash> <new-hash>
+    python ufs_rtdata_map.py inventory --root <baseline-root> --dates 20220329
+    python ufs_rtdata_map.py verify --root <staged-data-root> --apps ATM --reference source.md5
+    python ufs_rtdata_map.py schedule --planner <planner> --nodes 8 --capacity-gb 500 --batches
+
+Modules are imported lazily per subcommand, so that e.g. a 'query' never loads the
+scraping stack. Results are written to stdout as JSON (default), CSV or a text table.
+'--profile report.json' records the wall & CPU time, files, lines, Bytes read & peak RSS
+of each stage, & '--cprofile stats.prof' dumps the cProfile stats of the hottest stage.
+
+"""
+import argparse
+import json
+import os
+import sys
+
+# Default locations of the pipeline's tables (excluding file extensions).
+APPSPHYS2TEST_FN = './ufs_repo_mapped_data/rt_appsphys2test_df'
+BASELINE_FN = './ufs_baseline&input_dataframes/baseline_df'
+INPUT_FN = './ufs_baseline&input_dataframes/input_df'
+APP2TEST2DATA_FN = './ufs_app2files_map/ufs_app2test2data_df'
+HISTORY_FN = './ufs_app2files_map/ufs_map_history'
+DIGEST_CACHE_FN = './ufs_app2files_map/ufs_digest_cache'
+
+
+# Pairwise statistics of the 'overlap' subcommand (i.e. data_overlap.PAIRWISE_STATS).
+PAIRWISE_STATS = ['Intersection Files', 'Intersection (Bytes)', 'Union Files', 'Union (Bytes)', 'Jaccard', 'Jaccard (Bytes)']
+
+# Columns of the app-to-test-to-data map required by the indexed lookups.
+QUERY_COLUMNS = ['UFS_App', 'Physics_Suite', 'Test Name', 'CNTL Folder',
+                 'Relative Directory', 'Filename', 'Size (Bytes)']
+
+
+def emit(result, output='json'):
+    """
+    Write a result to stdout.
+
+    Args:
+        result (dict, list, pd.DataFrame): Result of a subcommand.
+        output (str): Output format. Options: 'json', 'csv', 'table'.
+
+    Return: None
+
+    """
+    if hasattr(result, 'to_json'):
+        df = result.reset_index() if result.index.name or any(result.index.names) else result
+        if output == 'csv':
+            sys.stdout.write(df.to_csv(index=False))
+        elif output == 'table':
+            sys.stdout.write(df.to_string(index=False) + '\n')
+        else:
+            sys.stdout.write(df.to_json(orient='records') + '\n')
+        return
+
+    if output == 'json':
+        sys.stdout.write(json.dumps(result, default=str) + '\n')
+        return
+    if isinstance(result, dict) and isinstance(result.get('result'), list):
+        result = result['result']
+    rows = result if isinstance(result, list) else [result]
+    for row in rows:
+        sys.stdout.write((','.join(map(str, row.values())) if isinstance(row, dict) else str(row)) + '\n')
+
+    return
+
+
+def run_scrape(args):
+    """
+    Scrape the /tests, /fv3_conf & /parm files of a ufs-weather-model repo & save rt_appsphys2test_df.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict): Summary of the generated table.
+
+    """
+    from script_scraper import ScriptScraper
+
+    scraper_wrapper = ScriptScraper(args.repo, workers=args.workers, scrape_cache=args.scrape_cache, profiler=args.profiler)
+    scraper_wrapper.main_reference = args.reference
+    if args.rt_conf is not None:
+        ref_txt = scraper_wrapper.read_rt_conf(args.rt_conf or None, platform=args.platform)
+    else:
+        ref_txt = scraper_wrapper.read_appsphys2test()
+    rt_table = scraper_wrapper.get_rt_table(ref_txt)
+    input_data_dict = scraper_wrapper.read_tests_fv3_parms()
+    rt_table = scraper_wrapper.get_appsphys2testparams(rt_table, input_data_dict)
+    appsphys2test_df = scraper_wrapper.convert_dict2df(rt_table, fn=args.out)
+
+    return {'out': args.out + '.pkl',
+            'rows': len(appsphys2test_df),
+            'apps': int(appsphys2test_df['UFS_App'].nunique()),
+            'tests': int(appsphys2test_df['Test Name'].nunique())}
+
+
+def run_merge(args):
+    """
+    Merge rt_appsphys2test_df w/ a dated baseline dataset by CNTL folder & save ufs_app2test2data_df.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict): Summary of the merged table.
+
+    """
+    import pandas as pd
+    from map_storage import MapStorage
+
+    appsphys2test_df = MapStorage().read(args.appsphys2test)
+    baseline_df = MapStorage().read(args.baseline, filters=[('Date', '==', args.date)])
+    app2test2data_df = pd.merge(appsphys2test_df, baseline_df, on=['CNTL Folder'])
+    path = MapStorage(args.fmt).save(app2test2data_df, args.out)
+
+    return {'out': path,
+            'rows': len(app2test2data_df),
+            'tests': int(app2test2data_df['Test Name'].nunique())}
+
+
+def run_query(args):
+    """
+    Look up the app-to-test-to-data map via its inverted indexes.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict): Lookup & its result.
+
+    """
+    if args.server is not None:
+        from query_client import MapQueryClient
+        query = MapQueryClient(args.server)
+    else:
+        from map_storage import MapStorage
+        from app2bl_query import App2BaselineQuery
+        query = App2BaselineQuery(MapStorage().read(args.map, columns=QUERY_COLUMNS))
+    if args.files_for_test is not None:
+        lookup, key, result = 'files_for_test', args.files_for_test, query.files_for_test(args.files_for_test, rel_path=args.rel_path)
+    elif args.tests_for_file is not None:
+        lookup, key, result = 'tests_for_file', args.tests_for_file, query.tests_for_file(args.tests_for_file)
+    elif args.apps_for_cntl_folder is not None:
+        lookup, key, result = 'apps_for_cntl_folder', args.apps_for_cntl_folder, query.apps_for_cntl_folder(args.apps_for_cntl_folder)
+    elif args.bytes_for_app is not None:
+        lookup, key, result = 'bytes_for_app', args.bytes_for_app, query.bytes_for_app(args.bytes_for_app)
+    else:
+        lookup, key, result = 'bytes_for_test', args.bytes_for_test, query.bytes_for_test(args.bytes_for_test)
+
+    return {'lookup': lookup, 'key': key, 'result': result}
+
+
+def run_serve(args):
+    """
+    Serve the indexed lookups of the app-to-test-to-data map (& the staging manifests of a
+    planner) from memory until interrupted, reloading them when their files change.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict): Address served & number of reloads.
+
+    """
+    import time
+    from query_server import MapQueryServer
+
+    server = MapQueryServer(args.map, planner_fn=args.planner, poll_interval=args.poll_interval, verbose=args.verbose)
+    address = server.start(host=args.host, port=args.port, socket_path=args.socket)
+    sys.stderr.write(f'Serving {args.map} on {address}\n')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+    return {'address': address, 'reloads': server.reloads}
+
+
+def run_sizes(args):
+    """
+    Roll up the deduplicated storage sizes of the app-to-test-to-data map.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (pd.DataFrame): Number of unique files & total size per group.
+
+    """
+    from map_storage import MapStorage, FORMAT_EXT
+    from size_cube import StorageSizeCube
+
+    # Reuse the size cube cached alongside the map, if any.
+    if args.cube is not None and any(os.path.exists(args.cube + ext) for ext in FORMAT_EXT.values()):
+        size_cube = StorageSizeCube.read(args.cube)
+    else:
+        size_cube = StorageSizeCube.from_map(MapStorage().read(args.map))
+        if args.cube is not None:
+            size_cube.save(args.cube)
+
+    filters = dict(f.split('=', 1) for f in args.filter)
+
+    return size_cube.rollup(args.by, filters=filters)
+
+
+def run_diff(args):
+    """
+    Compare the baseline data files of two baseline dates.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (pd.DataFrame, list): Added, removed & changed files per group, or the relative
+    paths of the files to sync.
+
+    """
+    from map_storage import MapStorage
+    from baseline_diff import BaselineDiff
+
+    baseline_df = MapStorage().read(args.baseline, filters=[('Date', 'in', [args.old, args.new])])
+    appsphys2test_df = MapStorage().read(args.appsphys2test) if args.by != ['CNTL Folder'] else None
+    baseline_diff = BaselineDiff(baseline_df, appsphys2test_df)
+    if args.manifest:
+        return baseline_diff.get_sync_manifest(args.old, args.new)
+
+    return baseline_diff.summarize(args.old, args.new, by=args.by)
+
+
+def run_stage(args):
+    """
+    Plan the minimal set of input & baseline data files to stage for a subset of regression tests.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict, list): Summary of the staging plan, or the relative paths of the files to stage.
+
+    """
+    from staging_planner import StagingPlanner
+
+    # Reuse the per-test bitmaps cached alongside the maps, if any.
+    if args.planner is not None and os.path.exists(args.planner + '.npz'):
+        planner = StagingPlanner.read(args.planner)
+    else:
+        from map_storage import MapStorage
+        from script_scraper import ScriptScraper
+        from var_expander import VarExpander
+
+        input_df = MapStorage().read(args.input, columns=['Relative Directory', 'Filename', 'Size (Bytes)'])
+
+        # Unless overridden, paths expand relative to the input dataset's root folder (e.g. 'input-data-20211210').
+        if args.override:
+            overrides = dict(o.split('=', 1) for o in args.override)
+        else:
+            input_roots = input_df['Relative Directory'].astype(str).str.split('/', n=1).str[0].unique()
+            if len(input_roots) != 1:
+                sys.exit(f'stage: cannot derive INPUTDATA_ROOT from the input dataset\'s root folders {sorted(input_roots)}. '
+                         'Set it via --override INPUTDATA_ROOT=<folder>.')
+            overrides = {'INPUTDATA_ROOT': input_roots[0]}
+        scraper_wrapper = ScriptScraper(args.repo, workers=args.workers, scrape_cache=args.scrape_cache, profiler=args.profiler)
+        var_expander = VarExpander(scraper_wrapper.default_vars_fn, overrides=overrides)
+        test_paths = var_expander.expand_tests(scraper_wrapper.read_tests_fv3_parms())
+        app2test2data_df = MapStorage().read(args.map, columns=['UFS_App', 'Physics_Suite', 'Test Name',
+                                                                'Relative Directory', 'Filename', 'Size (Bytes)'])
+        planner = StagingPlanner.from_maps(test_paths, app2test2data_df, input_df)
+        if args.planner is not None:
+            planner.save(args.planner)
+
+    combos = [tuple(combo.split(':', 1)) for combo in args.combos]
+    if args.manifest:
+        return planner.get_manifest(tests=args.tests, apps=args.apps, combos=combos)
+
+    return planner.summarize(tests=args.tests, apps=args.apps, combos=combos)
+
+
+def run_overlap(args):
+    """
+    Compare the data files shared by UFS applications, physics suites or tests.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (pd.DataFrame): Pairwise statistic matrix, per consumer unique files, or the files
+    shared by a set of consumers.
+
+    """
+    from map_storage import MapStorage
+    from compact_map import CompactMap
+    from data_overlap import DataOverlap
+
+    map_df = MapStorage().read(args.map, columns=[args.by, 'Relative Directory', 'Filename', 'Size (Bytes)'])
+    data_overlap = DataOverlap(CompactMap.from_dataframe(map_df, test_columns=[args.by]))
+    if args.shared:
+        return data_overlap.get_files(args.by, args.shared, mode='shared')
+    if args.unique:
+        return data_overlap.unique_files(args.by)
+
+    return data_overlap.matrix(args.by, stat=args.stat)
+
+
+def run_impact(args):
+    """
+    Determine the regression tests, app-to-physics suite builds & CNTL folders impacted by a set of changed paths.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict, list): Impacted tests, builds, CNTL folders & the tests impacted per changed
+    path, or a single one of the lists.
+
+    """
+    from map_storage import MapStorage
+    from impact_analyzer import ImpactAnalyzer
+
+    # Changed paths are read from stdin if none are given (e.g. 'git diff --name-only | ... impact').
+    changed_paths = args.paths if args.paths and args.paths != ['-'] else sys.stdin.read().splitlines()
+    var_expander = None
+    if args.repo is not None:
+        from var_expander import VarExpander
+        var_expander = VarExpander(os.path.join(args.repo, 'tests', 'default_vars.sh'))
+    planner = None
+    if args.planner is not None:
+        from staging_planner import StagingPlanner
+        planner = StagingPlanner.read(args.planner)
+    appsphys2test_df = MapStorage().read(args.appsphys2test)
+    result = ImpactAnalyzer(appsphys2test_df, var_expander=var_expander, planner=planner).analyze(changed_paths)
+
+    return result[args.list] if args.list is not None else result
+
+
+def run_history(args):
+    """
+    Record the app-to-test-to-data map of a commit in the history store, or query the store.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict, pd.DataFrame): Summary of the ingested commit, or the map at a commit, the
+    diff of two commits, the history of a test or file, or the CNTL folders' history.
+
+    """
+    from map_history import MapHistory
+
+    history = MapHistory.read(args.store) if os.path.exists(args.store + '.npz') else MapHistory()
+    if args.ingest is not None:
+        from map_storage import MapStorage
+
+        filters = [('Date', '==', args.date)] if args.date is not None else None
+        map_df = MapStorage().read(args.map, columns=['UFS_App', 'Physics_Suite', 'Test Type', 'Test Name', 'CNTL Folder',
+                                                      'Relative Directory', 'Filename', 'Size (Bytes)'], filters=filters)
+        info = {'date': args.date} if args.date is not None else {}
+        n_deltas = history.ingest(args.ingest, map_df, **info)
+        path = history.save(args.store)
+        return {'store': path, 'commits': len(history), 'deltas': n_deltas, 'size (Bytes)': os.path.getsize(path)}
+    if args.state is not None:
+        return history.get_state(args.state)
+    if args.diff is not None:
+        return history.diff(*args.diff)
+    if args.events:
+        criteria = {'Test_Name': args.test, 'Relative_Path': args.rel_path}
+        return history.get_events(**{key: val for key, val in criteria.items() if val is not None})
+
+    return history.get_cntl_folder_history()
+
+
+def run_inventory(args):
+    """
+    Crawl a baseline or input data root into its file inventory (i.e. baseline_df, input_df).
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict): Summary of the crawled inventory.
+
+    """
+    from map_storage import MapStorage
+    from inventory_crawler import InventoryCrawler
+
+    # Reuse the UFS components per root folder of an existing input inventory.
+    components = None
+    if args.components is not None:
+        input_df = MapStorage().read(args.components, columns=['Root Folder', 'UFS Component'])
+        components = dict(zip(input_df['Root Folder'], input_df['UFS Component']))
+    crawler = InventoryCrawler(args.root, kind=args.kind, workers=args.workers, max_depth=args.max_depth,
+                               dates=args.dates, batch_size=args.batch_size, components=components)
+    out = args.out or (BASELINE_FN if args.kind == 'baseline' else INPUT_FN)
+    path = crawler.save(out, MapStorage(args.fmt))
+
+    return {'out': path, 'dirs': crawler.n_dirs, 'files': crawler.n_files, 'errors': crawler.errors}
+
+
+def run_verify(args):
+    """
+    Verify the existence, size & checksum of the data files staged for a subset of regression tests.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict, pd.DataFrame, list): Summary of the verification, the missing & corrupt files
+    per test, or the manifest of the files' digests.
+
+    """
+    from checksum_verifier import ChecksumVerifier
+
+    kwargs = {'algorithm': args.algorithm, 'workers': args.workers, 'cache_fn': args.cache}
+    combos = [tuple(combo.split(':', 1)) for combo in args.combos]
+    if args.planner is not None:
+        from staging_planner import StagingPlanner
+        verifier = ChecksumVerifier.from_planner(args.root, StagingPlanner.read(args.planner),
+                                                 tests=args.tests, apps=args.apps, combos=combos, **kwargs)
+    else:
+        from map_storage import MapStorage
+        app2test2data_df = MapStorage().read(args.map, columns=['UFS_App', 'Physics_Suite', 'Test Name',
+                                                                'Relative Directory', 'Filename', 'Size (Bytes)'])
+        verifier = ChecksumVerifier.from_map(args.root, app2test2data_df, tests=args.tests, apps=args.apps, combos=combos, **kwargs)
+    reference = ChecksumVerifier.read_manifest(args.reference) if args.reference is not None else None
+    files_df = verifier.verify(reference=reference)
+    if args.manifest:
+        return verifier.get_manifest(files_df)
+    if args.report:
+        return verifier.get_report(files_df)
+
+    return verifier.summarize(files_df)
+
+
+def run_schedule(args):
+    """
+    Batch & order regression tests across nodes to reuse the data files staged to their local disks.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Return (dict, pd.DataFrame): Summary of the batch plan vs. rt.conf order, or the batch plan.
+
+    """
+    from map_storage import MapStorage, FORMAT_EXT
+    from staging_planner import StagingPlanner
+    from locality_scheduler import LocalityScheduler
+
+    if args.planner is not None:
+        planner = StagingPlanner.read(args.planner)
+    else:
+        planner = StagingPlanner.from_maps({}, MapStorage().read(args.map, columns=['UFS_App', 'Physics_Suite', 'Test Name',
+                                                                                   'Relative Directory', 'Filename', 'Size (Bytes)']))
+    combos = [tuple(combo.split(':', 1)) for combo in args.combos]
+    test_names = planner.select_tests(args.tests, args.apps, combos) if (args.tests or args.apps or combos) else planner.test_names
+
+    # Tests in rt.conf order (i.e. rt_appsphys2test_df's row order), if known.
+    baseline_order = list(test_names)
+    if any(os.path.exists(args.appsphys2test + ext) for ext in FORMAT_EXT.values()):
+        rt_order = MapStorage().read(args.appsphys2test, columns=['Test Name'])['Test Name'].drop_duplicates()
+        selected = set(test_names)
+        baseline_order = [test_name for test_name in rt_order if test_name in selected]
+        ordered = set(baseline_order)
+        baseline_order += [test_name for test_name in test_names if test_name not in ordered]
+    scheduler = LocalityScheduler(planner, n_nodes=args.nodes, capacity=int(args.capacity_gb * 1e9))
+    plan_df = scheduler.schedule(baseline_order)
+    if args.batches:
+        return plan_df
+
+    return scheduler.summarize(plan_df, baseline_order=baseline_order)
+
+
+def get_parser():
+    """
+    Generate the command line parser.
+
+    Args:
+        None
+
+    Return (argparse.ArgumentParser): Parser w/ the 'scrape', 'merge', 'query', 'serve', 'sizes', 'diff', 'stage', 'overlap', 'impact', 'history', 'inventory', 'verify' & 'schedule' subcommands.
+
+    """
+    parser = argparse.ArgumentParser(prog='ufs-rtdata-map',
+                                     description='Map UFS applications & regression tests to their input & baseline data files.')
+    parser.add_argument('--output', choices=['json', 'csv', 'table'], default='json', help='Output format.')
+    parser.add_argument('--profile', default=None, help='Write a per-stage timing & memory report (.json or .csv).')
+    parser.add_argument('--cprofile', default=None, help='Dump the cProfile stats of the hottest stage.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scrape = subparsers.add_parser('scrape', help='Scrape a ufs-weather-model repo into rt_appsphys2test_df.')
+    scrape.add_argument('--repo', required=True, help='Local ufs-weather-model repo folder.')
+    scrape.add_argument('--reference', default='AppSuiteCombo2Test.csv', help='App-to-physics suite-to-test reference table.')
+    scrape.add_argument('--rt-conf', nargs='*', default=None,
+                        help="Read the builds & tests from rt.conf files instead of --reference. Default: the repo's tests/rt*.conf.")
+    scrape.add_argument('--platform', default=None, help='Limit the rt.conf tests to a platform (e.g. hera.intel).')
+    scrape.add_argument('--workers', type=int, default=1, help='Processes scraping the config. files (0 for all CPUs).')
+    scrape.add_argument('--scrape-cache', default=None, help='Scrape cache pickle file (excluding .pkl) for incremental re-scrapes.')
+    scrape.add_argument('--out', default=APPSPHYS2TEST_FN, help='Output table (excluding .pkl).')
+    scrape.set_defaults(func=run_scrape)
+
+    merge = subparsers.add_parser('merge', help='Merge rt_appsphys2test_df w/ the baseline dataset of a date.')
+    merge.add_argument('--appsphys2test', default=APPSPHYS2TEST_FN, help='rt_appsphys2test_df table (excluding ext).')
+    merge.add_argument('--baseline', default=BASELINE_FN, help='Baseline dataset table (excluding ext).')
+    merge.add_argument('--date', required=True, help='Baseline dataset timestamp (e.g. 20220329).')
+    merge.add_argument('--fmt', choices=['pickle', 'parquet', 'feather'], default='pickle', help='Output storage format.')
+    merge.add_argument('--out', default=APP2TEST2DATA_FN, help='Output table (excluding ext).')
+    merge.set_defaults(func=run_merge)
+
+    query = subparsers.add_parser('query', help='Indexed lookups over the app-to-test-to-data map.')
+    query.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext).')
+    lookup = query.add_mutually_exclusive_group(required=True)
+    lookup.add_argument('--files-for-test', help='Baseline files required by a test.')
+    lookup.add_argument('--tests-for-file', help='Tests requiring a baseline filename.')
+    lookup.add_argument('--apps-for-cntl-folder', help='UFS apps whose tests compare against a CNTL folder.')
+    lookup.add_argument('--bytes-for-app', help='Total size (Bytes) of the unique files of a UFS app.')
+    lookup.add_argument('--bytes-for-test', help='Total size (Bytes) of the unique files of a test.')
+    query.add_argument('--rel-path', action='store_true', help='Return relative paths instead of filenames.')
+    query.add_argument('--server', default=None, help="Address of a running 'serve' subcommand (e.g. unix:///tmp/ufs_map.sock) to query instead of --map.")
+    query.set_defaults(func=run_query)
+
+    serve = subparsers.add_parser('serve', help='Serve the lookups of the map from memory over localhost HTTP or a Unix socket.')
+    serve.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext).')
+    serve.add_argument('--planner', default=None, help='Per-test bitmaps of the stage subcommand (excluding .npz), to serve staging manifests.')
+    serve.add_argument('--host', default='127.0.0.1', help='Host to bind to.')
+    serve.add_argument('--port', type=int, default=8765, help='Port to bind to.')
+    serve.add_argument('--socket', default=None, help='Unix domain socket to serve on instead of --host & --port.')
+    serve.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between checks of the map (& planner) for changes.')
+    serve.add_argument('--verbose', action='store_true', help='Log each request to stderr.')
+    serve.set_defaults(func=run_serve)
+
+    sizes = subparsers.add_parser('sizes', help='Deduplicated storage sizes rolled up by dimension(s).')
+    sizes.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext).')
+    sizes.add_argument('--by', nargs='*', default=['UFS_App'], help='Dimensions to group by (e.g. UFS_App DataType).')
+    sizes.add_argument('--filter', action='append', default=[], help='Dimension filter as DIM=VALUE (e.g. Date=20220329).')
+    sizes.add_argument('--cube', default=None, help='Size cube cached alongside the map (excluding ext).')
+    sizes.set_defaults(func=run_sizes)
+
+    diff = subparsers.add_parser('diff', help='Added, removed & changed baseline files between two baseline dates.')
+    diff.add_argument('--baseline', default=BASELINE_FN, help='Baseline dataset table (excluding ext).')
+    diff.add_argument('--appsphys2test', default=APPSPHYS2TEST_FN, help='rt_appsphys2test_df table (excluding ext).')
+    diff.add_argument('--old', required=True, help='Earlier baseline dataset timestamp (e.g. 20220315).')
+    diff.add_argument('--new', required=True, help='Later baseline dataset timestamp (e.g. 20220329).')
+    diff.add_argument('--by', nargs='*', default=['UFS_App', 'Physics_Suite', 'Test Name'], help='Columns to group by (e.g. UFS_App, CNTL Folder).')
+    diff.add_argument('--manifest', action='store_true', help='List the relative paths of the files to sync instead.')
+    diff.set_defaults(func=run_diff)
+
+    stage = subparsers.add_parser('stage', help='Minimal input & baseline files to stage for a subset of tests.')
+    stage.add_argument('--repo', help='Local ufs-weather-model repo folder (unless the planner is cached).')
+    stage.add_argument('--workers', type=int, default=1, help='Processes scraping the config. files (0 for all CPUs).')
+    stage.add_argument('--scrape-cache', default=None, help='Scrape cache pickle file (excluding .pkl) for incremental re-scrapes.')
+    stage.add_argument('--override', action='append', default=None,
+                       help="default_vars.sh variable override as VAR=VALUE. Default sets INPUTDATA_ROOT to the --input dataset's root folder.")
+    stage.add_argument('--input', default=INPUT_FN, help='Input dataset table (excluding ext).')
+    stage.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext).')
+    stage.add_argument('--planner', default=None, help='Per-test bitmaps cached alongside the maps (excluding .npz).')
+    stage.add_argument('--tests', nargs='*', default=[], help='Regression tests to stage (e.g. control_p8).')
+    stage.add_argument('--apps', nargs='*', default=[], help='UFS apps whose tests to stage (e.g. ATM).')
+    stage.add_argument('--combos', nargs='*', default=[], help='App/physics suite builds as APP:SUITE whose tests to stage.')
+    stage.add_argument('--manifest', action='store_true', help='List the relative paths of the files to stage instead.')
+    stage.set_defaults(func=run_stage)
+
+    overlap = subparsers.add_parser('overlap', help='Data files shared by UFS apps, physics suites or tests.')
+    overlap.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext).')
+    overlap.add_argument('--by', default='UFS_App', help='Consumers of the files (e.g. UFS_App, Physics_Suite, Test Name).')
+    overlap.add_argument('--stat', default='Jaccard', choices=PAIRWISE_STATS, help='Pairwise statistic of the matrix.')
+    overlap_mode = overlap.add_mutually_exclusive_group()
+    overlap_mode.add_argument('--unique', action='store_true', help='Files & bytes unique to each consumer instead.')
+    overlap_mode.add_argument('--shared', nargs='+', help='Files shared by all of the listed consumers instead.')
+    overlap.set_defaults(func=run_overlap)
+
+    impact = subparsers.add_parser('impact', help='Regression tests impacted by a set of changed paths.')
+    impact.add_argument('paths', nargs='*', help="Changed paths relative to the repo (default reads stdin, e.g. 'git diff --name-only').")
+    impact.add_argument('--appsphys2test', default=APPSPHYS2TEST_FN, help='rt_appsphys2test_df table (excluding ext).')
+    impact.add_argument('--repo', default=None, help="Local ufs-weather-model repo folder, to resolve the tests' default_vars.sh variables.")
+    impact.add_argument('--planner', default=None, help='Per-test bitmaps of the stage subcommand (excluding .npz), to resolve changed data files.')
+    impact.add_argument('--list', choices=['tests', 'combos', 'cntl_folders'], default=None, help='List only the impacted tests, builds or CNTL folders.')
+    impact.set_defaults(func=run_impact)
+
+    history = subparsers.add_parser('history', help='Versioned history of the app-to-test-to-data map across commits.')
+    history.add_argument('--store', default=HISTORY_FN, help='History store (excluding .npz).')
+    history_mode = history.add_mutually_exclusive_group(required=True)
+    history_mode.add_argument('--ingest', metavar='COMMIT', help='Record the map as of a commit (e.g. a ufs-weather-model hash).')
+    history_mode.add_argument('--state', metavar='COMMIT', help='Map as of a commit.')
+    history_mode.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'), help='Added, removed & changed rows between two commits.')
+    history_mode.add_argument('--events', action='store_true', help='History of the rows of a --test and/or --rel-path.')
+    history_mode.add_argument('--cntl-history', action='store_true', help='Commits from which each CNTL folder was referenced & orphaned.')
+    history.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map to ingest (excluding ext).')
+    history.add_argument('--date', default=None, help='Baseline dataset timestamp of the ingested rows (e.g. 20220329).')
+    history.add_argument('--test', default=None, help='Regression test of the --events.')
+    history.add_argument('--rel-path', default=None, help='Path w/in the dataset of the --events (e.g. INTEL/control_p8/atmf000.nc).')
+    history.set_defaults(func=run_history)
+
+    inventory = subparsers.add_parser('inventory', help='Crawl a baseline or input data root into baseline_df or input_df.')
+    inventory.add_argument('--root', required=True, help='Data root (e.g. a mounted INPUTDATA_ROOT or a develop-<date> baseline folder).')
+    inventory.add_argument('--kind', choices=['baseline', 'input'], default='baseline', help='Kind of the data root.')
+    inventory.add_argument('--workers', type=int, default=32, help='Threads scanning directories (0 for the default pool size).')
+    inventory.add_argument('--max-depth', type=int, default=None, help='Max depth of the scanned directories below the root.')
+    inventory.add_argument('--dates', nargs='*', default=None, help='Dates of the dated folders to crawl (e.g. 20220329).')
+    inventory.add_argument('--batch-size', type=int, default=100000, help='Rows per streamed batch.')
+    inventory.add_argument('--components', default=None, help='Existing input dataset table (excluding ext) to reuse the UFS components of.')
+    inventory.add_argument('--fmt', choices=['pickle', 'parquet', 'feather'], default='parquet', help='Output storage format.')
+    inventory.add_argument('--out', default=None, help='Output table (excluding ext). Default: the baseline or input dataset table.')
+    inventory.set_defaults(func=run_inventory)
+
+    verify = subparsers.add_parser('verify', help='Verify the existence, size & checksum of the data files staged for a subset of tests.')
+    verify.add_argument('--root', required=True, help='Parent folder of the staged datasets (i.e. of develop-<date> & input-data-<date>).')
+    verify.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext), to verify the baseline files.')
+    verify.add_argument('--planner', default=None, help='Per-test bitmaps of the stage subcommand (excluding .npz), to verify the input & baseline files instead.')
+    verify.add_argument('--tests', nargs='*', default=[], help='Regression tests to verify (default verifies all tests).')
+    verify.add_argument('--apps', nargs='*', default=[], help='UFS apps whose tests to verify (e.g. ATM).')
+    verify.add_argument('--combos', nargs='*', default=[], help='App/physics suite builds as APP:SUITE whose tests to verify.')
+    verify.add_argument('--algorithm', default='md5', help='hashlib checksum algorithm (e.g. md5, sha256).')
+    verify.add_argument('--workers', type=int, default=16, help='Threads checking & hashing files (0 for the default pool size).')
+    verify.add_argument('--cache', default=DIGEST_CACHE_FN, help='Digest cache keyed by path, size & mtime (excluding .npz).')
+    verify.add_argument('--reference', default=None, help="Manifest of the expected digests (md5sum format, e.g. the source platform's --manifest).")
+    verify_mode = verify.add_mutually_exclusive_group()
+    verify_mode.add_argument('--report', action='store_true', help='List the missing & corrupt files per test instead.')
+    verify_mode.add_argument('--manifest', action='store_true', help='List the digests of the files in the md5sum format instead.')
+    verify.set_defaults(func=run_verify)
+
+    schedule = subparsers.add_parser('schedule', help='Batch & order tests across nodes to reuse the data files staged to node-local disk.')
+    schedule.add_argument('--map', default=APP2TEST2DATA_FN, help='App-to-test-to-data map (excluding ext), to schedule by the baseline files.')
+    schedule.add_argument('--planner', default=None, help='Per-test bitmaps of the stage subcommand (excluding .npz), to schedule by the input & baseline files instead.')
+    schedule.add_argument('--appsphys2test', default=APPSPHYS2TEST_FN, help='rt_appsphys2test_df table (excluding ext), for the rt.conf order compared against.')
+    schedule.add_argument('--tests', nargs='*', default=[], help='Regression tests to schedule (default schedules all tests).')
+    schedule.add_argument('--apps', nargs='*', default=[], help='UFS apps whose tests to schedule (e.g. ATM).')
+    schedule.add_argument('--combos', nargs='*', default=[], help='App/physics suite builds as APP:SUITE whose tests to schedule.')
+    schedule.add_argument('--nodes', type=int, default=1, help='Number of nodes running the tests.')
+    schedule.add_argument('--capacity-gb', type=float, required=True, help='Node-local cache capacity (GB).')
+    schedule.add_argument('--batches', action='store_true', help='List the batch plan w/ the Bytes staged per batch instead.')
+    schedule.set_defaults(func=run_schedule)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Run a subcommand & write its result to stdout.
+
+    Args:
+        argv (list): Command line arguments. Default reads sys.argv.
+
+    Return (int): Exit status.
+
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'stage' and args.repo is None and (args.planner is None or not os.path.exists(args.planner + '.npz')):
+        parser.error('stage: --repo is required unless --planner names cached per-test bitmaps (<planner>.npz).')
+    if getattr(args, 'workers', 1) == 0:
+        args.workers = None
+
+    # Instrument the pipeline's stages only if a report is requested.
+    args.profiler = None
+    if args.profile is not None or args.cprofile is not None:
+        from stage_profiler import StageProfiler
+        args.profiler = StageProfiler(cprofile=args.cprofile is not None)
+        with args.profiler.stage(args.command):
+            result = args.func(args)
+        if args.profile is not None:
+            args.profiler.save_report(args.profile)
+        if args.cprofile is not None:
+            args.profiler.dump_profile(args.cprofile)
+    else:
+        result = args.func(args)
+    emit(result, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import re
+from collections import defaultdict
+
+# Variable assignments (e.g. 'export FV3_RUN=control_run.IN', 'TPN=40') & shell function
+# headers (e.g. 'export_fv3 ()') w/in 'default_vars.sh'.
+ASSIGN_PATTERN = re.compile(r'^\s*(?:export\s+)?(?P<var>[A-Za-z_]\w*)=(?P<val>.*)$')
+FUNC_PATTERN = re.compile(r'^\s*(?:function\s+)?(?P<func>[A-Za-z_]\w*)\s*\(\)\s*\{?\s*$')
+COMMENT_PATTERN = re.compile(r'\s+#.*$')
+
+# Variables called w/in a path (e.g. '@[INPUTDATA_ROOT]', '${FV3_IC}', '${OCNRES:-025}', '$RFILE').
+VAR_PATTERN = re.compile(r'@\[(?P<bracket>\w+)\]|\$\{(?P<brace>\w+)(?::?-(?P<default>[^}]*))?\}|\$(?P<nobrace>[A-Za-z_]\w*)')
+DUPLICATE_SEP_PATTERN = re.compile(r'/{2,}')
+
+
+class VarExpander():
+    """
+    Expands the variables (e.g. '@[INPUTDATA_ROOT]', '${FV3_IC}') of the data file paths set
+    within the /fv3_conf & /parm files to concrete relative paths per regression test.
+
+    Each test's variables are resolved by layering the top-level defaults of 'default_vars.sh',
+    the 'default_vars.sh' methods called by the test (e.g. 'export_fv3', 'export_cpl'), the
+    test's own exports & the user's overrides (e.g. platform specific 'INPUTDATA_ROOT').
+
+    """
+    def __init__(self, default_vars_fn, overrides=None):
+
+        # The UFS-WM RT framework's 'default_vars.sh' script (e.g. '<ufs-wm-repo>/tests/default_vars.sh').
+        self.default_vars_fn = default_vars_fn
+
+        # Variables overriding all other layers. To expand paths relative to the input &
+        # baseline datasets' inventories, set the root variables to the dataset's root
+        # folder (e.g. {'INPUTDATA_ROOT': 'input-data-20211210'}).
+        self.overrides = dict(overrides or {})
+        self.default_vars, self.default_methods = self.read_default_vars()
+
+        # Memoized layered environments per set of called methods & per test (w/ the test's
+        # parameters they were generated from), resolved variables per environment, referenced
+        # variables per path & expanded paths.
+        self.method_envs = {}
+        self.test_envs = {}
+        self.test_params = {}
+        self.resolved_vars = {}
+        self.path_vars = {}
+        self.expanded_paths = {}
+
+        # Whether a circular reference cut the variable resolution in progress short, leaving
+        # its value partially expanded (& not memoized).
+        self.is_cut = False
+
+    def read_default_vars(self):
+        """
+        Reads the top-level variables & the variables set by each method w/in 'default_vars.sh'.
+
+        Args:
+            None
+
+        Return (tuple): Dictionary of top-level variables to their values & dictionary of
+        each method (e.g. 'export_fv3') to its variables & their values.
+
+        Machine specific top-level variables are set to their last assigned values.
+
+        """
+        default_vars = {}
+        default_methods = {}
+        method_vars = None
+        with open(self.default_vars_fn, 'r') as file:
+            for line in file:
+                stripped = line.strip()
+                if not stripped or stripped.startswith('#'):
+                    continue
+
+                # Track the method whose body is being read.
+                func_match = FUNC_PATTERN.match(stripped)
+                if func_match is not None:
+                    method_vars = default_methods.setdefault(func_match.group('func'), {})
+                    continue
+                if stripped == '}' and method_vars is not None:
+                    method_vars = None
+                    continue
+
+                assign_match = ASSIGN_PATTERN.match(stripped)
+                if assign_match is not None:
+                    val = self.clean_value(assign_match.group('val'))
+                    if method_vars is not None:
+                        method_vars[assign_match.group('var')] = val
+                    else:
+                        default_vars[assign_match.group('var')] = val
+
+        return default_vars, default_methods
+
+    def clean_value(self, val):
+        """
+        Removes trailing comments & surrounding quotes from a variable's value.
+
+        Args:
+            val (str): Raw value of a variable.
+
+        Return (str): Value of the variable.
+
+        """
+        val = COMMENT_PATTERN.sub('', val.strip())
+        if len(val) > 1 and val[0] == val[-1] and val[0] in ('"', "'"):
+            val = val[1:-1]
+
+        return val.replace('"', '')
+
+    def get_method_env(self, methods):
+        """
+        Layers the variables of the called 'default_vars.sh' methods onto the top-level variables.
+
+        Args:
+            methods (tuple): 'default_vars.sh' methods called by a test, in order.
+
+        Return (dict): Variables to their values. Memoized per set of methods, since tests
+        calling the same methods share this layer.
+
+        """
+        if methods not in self.method_envs:
+            env = dict(self.default_vars)
+            for method in methods:
+                env.update(self.default_methods.get(method, {}))
+            self.method_envs[methods] = env
+
+        return self.method_envs[methods]
+
+    def get_test_env(self, test_name, test_params):
+        """
+        Generates the layered variables of a regression test.
+
+        Args:
+            test_name (str): Name of the regression test.
+            test_params (dict): Test's parameters (i.e. input_data_dict['tests'][test_name]).
+
+        Return (dict): Variables to their values for the given test. Memoized per test &
+        regenerated if the test's parameters change (e.g. another input_data_dict).
+
+        """
+        if test_name not in self.test_envs or self.test_params[test_name] != test_params:
+            env = dict(self.get_method_env(tuple(test_params.get('Test Info', []))))
+            for var, val in test_params.items():
+                if var != 'Test Info':
+                    env[var.strip()] = self.clean_value(val)
+            env.update(self.overrides)
+            self.test_envs[test_name] = env
+            # Copied, so that parameters changed in place by the caller also regenerate the env.
+            self.test_params[test_name] = {var: list(val) if isinstance(val, list) else val for var, val in test_params.items()}
+            self.resolved_vars[test_name] = {}
+
+        return self.test_envs[test_name]
+
+    def resolve_var(self, test_name, var, default=None, visiting=()):
+        """
+        Resolves a variable's value for a regression test, recursively expanding the
+        variables it references.
+
+        Args:
+            test_name (str): Name of the regression test. Its environment must have been
+                             generated via 'get_test_env()'.
+            var (str): Name of the variable (e.g. 'INPUTDATA_ROOT').
+            default (str): Value if the variable is not set (e.g. '${OCNRES:-025}').
+            visiting (tuple): Variables being resolved, to break circular references.
+
+        Return (str): The resolved value. None if the variable is not set. Values cut short by
+        a circular reference are not memoized.
+
+        """
+        resolved = self.resolved_vars[test_name]
+        if var in resolved:
+            return resolved[var]
+        env = self.test_envs[test_name]
+        if var in visiting:
+            self.is_cut = True
+            return default
+        if var not in env:
+            return default
+
+        is_cut, self.is_cut = self.is_cut, False
+        val = self.expand_vars(test_name, env[var], visiting + (var,))
+        if not self.is_cut:
+            resolved[var] = val
+        self.is_cut = self.is_cut or is_cut
+
+        return val
+
+    def expand_vars(self, test_name, txt, visiting=()):
+        """
+        Substitutes the variables called w/in a text for a regression test. Unresolved
+        variables are left as is.
+
+        Args:
+            test_name (str): Name of the regression test.
+            txt (str): Text calling variables (e.g. '@[INPUTDATA_ROOT]/FV3_input_data').
+            visiting (tuple): Variables being resolved, to break circular references.
+
+        Return (str): The text w/ its variables substituted.
+
+        """
+        def substitute(match):
+            var = match.group('bracket') or match.group('brace') or match.group('nobrace')
+            val = self.resolve_var(test_name, var, match.group('default'), visiting)
+            return match.group(0) if val is None else val
+
+        return VAR_PATTERN.sub(substitute, txt)
+
+    def expand_path(self, test_name, path):
+        """
+        Expands a data file's path to a concrete relative path for a regression test.
+
+        Args:
+            test_name (str): Name of the regression test. Its environment must have been
+                             generated via 'get_test_env()'.
+            path (str): Path set within a /fv3_conf or /parm file.
+
+        Return (str): The expanded & normalized path.
+
+        Expanded paths are memoized by the path & the resolved values of the variables it
+        calls, so tests sharing those values (e.g. all tests w/ the same 'INPUTDATA_ROOT')
+        share the expansion.
+
+        """
+        if path not in self.path_vars:
+            self.path_vars[path] = tuple((m.group('bracket') or m.group('brace') or m.group('nobrace'), m.group('default'))
+                                         for m in VAR_PATTERN.finditer(path))
+        key = (path,) + tuple(self.resolve_var(test_name, var, default) for var, default in self.path_vars[path])
+        if key not in self.expanded_paths:
+            expanded = DUPLICATE_SEP_PATTERN.sub('/', self.expand_vars(test_name, path))
+            while expanded.startswith('./'):
+                expanded = expanded[2:]
+            self.expanded_paths[key] = expanded
+
+        return self.expanded_paths[key]
+
+    def get_unresolved_vars(self, path):
+        """
+        Extracts the variables remaining within an expanded path.
+
+        Args:
+            path (str): Expanded path.
+
+        Return (set): Names of unresolved variables.
+
+        """
+        return {m.group('bracket') or m.group('brace') or m.group('nobrace') for m in VAR_PATTERN.finditer(path)}
+
+    def expand_tests(self, input_data_dict, test_names=None):
+        """
+        Expands the data file paths of each regression test's /fv3_conf & /parm files.
+
+        Args:
+            input_data_dict (dict): Dictionary for referencing sets of input data files being
+                                    used per test (i.e. 'read_tests_fv3_parms()' output).
+            test_names (list): Regression tests to expand. Default expands all /tests files.
+
+        Return (dict): Map of each regression test to its 'FV3 File', 'Parm File', expanded
+        source-to-destination paths of its /fv3_conf file ('fv3_conf'), expanded data
+        filenames of its /parm file ('parm') & the variables which remain unresolved.
+
+        The /fv3_conf & /parm files are set by the test's 'FV3_RUN' & 'INPUT_NML' variables,
+        which default to the values set by the called 'default_vars.sh' methods.
+
+        """
+        if test_names is None:
+            test_names = list(input_data_dict['tests'].keys())
+
+        test_paths = {}
+        for test_name in test_names:
+            self.get_test_env(test_name, input_data_dict['tests'][test_name])
+            fv3_fn = self.resolve_var(test_name, 'FV3_RUN')
+            parm_fn = self.resolve_var(test_name, 'INPUT_NML')
+
+            # Expand source & destination paths of the test's /fv3_conf file.
+            fv3_paths = defaultdict(list)
+            for source_path, dest_paths in input_data_dict['fv3_conf'].get(fv3_fn, {}).items():
+                fv3_paths[self.expand_path(test_name, source_path)] += [self.expand_path(test_name, dest) for dest in dest_paths]
+
+            # Expand data filenames set within the test's /parm file.
+            parm_paths = [self.expand_path(test_name, fn) for fn in input_data_dict['parm'].get(parm_fn, [])]
+
+            unresolved = set()
+            for path in list(fv3_paths) + parm_paths:
+                unresolved |= self.get_unresolved_vars(path)
+            test_paths[test_name] = {'FV3 File': fv3_fn,
+                                     'Parm File': parm_fn,
+                                     'fv3_conf': fv3_paths,
+                                     'parm': parm_paths,
+                                     'unresolved': unresolved}
+
+        return test_paths